@@ -1,9 +1,12 @@
-%module cxtgeo
+%module("threads"="1") cxtgeo
 %{
 #define SWIG_FILE_WITH_INIT
 #include <libxtg.h>
 %}
 
+// Thread support: keep the Python GIL by default, cf. %thread below
+%nothread;
+
 typedef uint8_t mbool;
 
 %include typemaps.i
@@ -306,4 +309,13 @@ import_array();
     }
     %}
 
+// The GIL is released only for reentrant routines that are used from threads
+%thread grd3d_points_ijk_cells;
+%thread grd3d_calc_dz;
+%thread grd3d_calc_dxdy;
+%thread grd3d_calc_xyz;
+%thread grdcp3d_cellvol;
+%thread grdcp3d_corners_cells;
+%thread grdcp3d_cellvol_cells;
+
 %include <libxtg.h>
@@ -0,0 +1,135 @@
+/*
+ ***************************************************************************************
+ *
+ * NAME:
+ *    grdcp3d_cells.c
+ *
+ * DESCRIPTION:
+ *    Corners, bulk volume and centroid for a list of cells, in one pass. The
+ *    results are written to arrays allocated at client (numpy), so there is no
+ *    per cell call from Python.
+ *
+ *    The corners are ordered as in grdcp3d_corners, i.e. 24 values per cell.
+ *    The centroid is the average of the 8 corners, as in grd3d_midpoint.
+ *
+ * ARGUMENTS:
+ *    ncol,nrow,nlay   i     Grid dimensions nx ny nz
+ *    coordsv          i     Grid Z coord for input
+ *    zcornsv          i     Grid Z corners for input
+ *    cellsv           i     Cell numbers, C order and base 0 (i*nrow*nlay + j*nlay + k)
+ *    corners          o     Array, 24 values per cell (grdcp3d_corners_cells)
+ *    cellvolsv        o     Array, bulk volume per cell (grdcp3d_cellvol_cells)
+ *    centroids        o     Array, x y z of centroid per cell (grdcp3d_cellvol_cells)
+ *    precision        i     Precision for volume, 1, 2 or 4 (as x_hexahedron_volume)
+ *
+ * RETURNS:
+ *    Function: 0 if OK, -1 if a cell number is outside the grid. Arrays are
+ *    updated, _xtgformat=2
+ *
+ * TODO/ISSUES/BUGS:
+ *    None known
+ *
+ * LICENCE:
+ *    cf. XTGeo License
+ ***************************************************************************************
+ */
+
+#include "libxtg.h"
+#include "logger.h"
+
+static int
+_cell_ijk(long cell, long ncol, long nrow, long nlay, long *i, long *j, long *k)
+{
+    if (cell < 0 || cell >= ncol * nrow * nlay)
+        return -1;
+
+    *i = cell / (nrow * nlay);
+    *j = (cell / nlay) % nrow;
+    *k = cell % nlay;
+    return 0;
+}
+
+int
+grdcp3d_corners_cells(long ncol,
+                      long nrow,
+                      long nlay,
+                      double *coordsv,
+                      long ncoord,
+                      float *zcornsv,
+                      long nzcorn,
+                      long *cellsv,
+                      long ncells,
+                      double *corners,
+                      long ncorners)
+
+{
+    logger_info(LI, FI, FU, "Corners for %ld cells...", ncells);
+
+    if (ncorners < 24 * ncells) {
+        logger_error(LI, FI, FU, "Corner array is too short in %s", FU);
+        return -1;
+    }
+
+    long n;
+    for (n = 0; n < ncells; n++) {
+        long i, j, k;
+        if (_cell_ijk(cellsv[n], ncol, nrow, nlay, &i, &j, &k) != 0)
+            return -1;
+
+        grdcp3d_corners(i, j, k, ncol, nrow, nlay, coordsv, ncoord, zcornsv, nzcorn,
+                        &corners[24 * n]);
+    }
+
+    logger_info(LI, FI, FU, "Corners for %ld cells... done", ncells);
+    return 0;
+}
+
+int
+grdcp3d_cellvol_cells(long ncol,
+                      long nrow,
+                      long nlay,
+                      double *coordsv,
+                      long ncoord,
+                      float *zcornsv,
+                      long nzcorn,
+                      long *cellsv,
+                      long ncells,
+                      double *cellvolsv,
+                      long nvol,
+                      double *centroids,
+                      long ncentroids,
+                      int precision)
+
+{
+    logger_info(LI, FI, FU, "Volume and centroid for %ld cells...", ncells);
+
+    if (nvol < ncells || ncentroids < 3 * ncells) {
+        logger_error(LI, FI, FU, "Result arrays are too short in %s", FU);
+        return -1;
+    }
+
+    double corners[24];
+
+    long n;
+    for (n = 0; n < ncells; n++) {
+        long i, j, k;
+        if (_cell_ijk(cellsv[n], ncol, nrow, nlay, &i, &j, &k) != 0)
+            return -1;
+
+        grdcp3d_corners(i, j, k, ncol, nrow, nlay, coordsv, ncoord, zcornsv, nzcorn,
+                        corners);
+
+        cellvolsv[n] = x_hexahedron_volume(corners, 24, precision);
+
+        int c, m;
+        for (c = 0; c < 3; c++) {
+            double sum = 0.0;
+            for (m = 0; m < 8; m++)
+                sum += corners[3 * m + c];
+            centroids[3 * n + c] = 0.125 * sum;
+        }
+    }
+
+    logger_info(LI, FI, FU, "Volume and centroid for %ld cells... done", ncells);
+    return 0;
+}
@@ -2220,6 +2220,35 @@ grdcp3d_cellvol(long ncol,
                 int precision,
                 int option);
 
+int
+grdcp3d_corners_cells(long ncol,
+                      long nrow,
+                      long nlay,
+                      double *swig_np_dbl_inplaceflat_v1,  // coordsv,
+                      long n_swig_np_dbl_inplaceflat_v1,   // ncoordin,
+                      float *swig_np_flt_inplaceflat_v1,   // zcornsv,
+                      long n_swig_np_flt_inplaceflat_v1,   // nzcorn,
+                      long *swig_np_long_inplace_v1,       // cellsv
+                      long n_swig_np_long_inplace_v1,      // ncells
+                      double *swig_np_dbl_inplaceflat_v2,  // corners
+                      long n_swig_np_dbl_inplaceflat_v2);  // ncorners
+
+int
+grdcp3d_cellvol_cells(long ncol,
+                      long nrow,
+                      long nlay,
+                      double *swig_np_dbl_inplaceflat_v1,  // coordsv,
+                      long n_swig_np_dbl_inplaceflat_v1,   // ncoordin,
+                      float *swig_np_flt_inplaceflat_v1,   // zcornsv,
+                      long n_swig_np_flt_inplaceflat_v1,   // nzcorn,
+                      long *swig_np_long_inplace_v1,       // cellsv
+                      long n_swig_np_long_inplace_v1,      // ncells
+                      double *swig_np_dbl_inplaceflat_v2,  // cellvolsv
+                      long n_swig_np_dbl_inplaceflat_v2,   // nvol
+                      double *swig_np_dbl_inplaceflat_v3,  // centroids
+                      long n_swig_np_dbl_inplaceflat_v3,   // ncentroids
+                      int precision);
+
 /*
  *======================================================================================
  * WELL spesific
@@ -99,6 +99,8 @@ from xtgeo.common.exceptions import BlockedWellsNotFoundError
 
 from xtgeo.common.xtgeo_dialog import XTGeoDialog
 from xtgeo.common.sys import _XTGeoFile
+from xtgeo.common.threads import set_num_threads
+from xtgeo.common.threads import get_num_threads
 
 _xprint("Import common... done")
 
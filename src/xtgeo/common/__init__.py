@@ -10,4 +10,7 @@ from xtgeo.common.xtgeo_dialog import XTGShowProgress
 
 from xtgeo.common.sys import _XTGeoFile
 
+from xtgeo.common.threads import set_num_threads
+from xtgeo.common.threads import get_num_threads
+
 from xtgeo.common.exceptions import WellNotFoundError
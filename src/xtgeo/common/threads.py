@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Number of threads for the multithreaded routines in XTGeo.
+
+The default is 1 (no threading), unless the environment variable
+XTG_NUM_THREADS is set. A value of 0 means one thread per CPU.
+
+The threaded routines split the work in blocks (e.g. of grid layers or
+columns), where each block is computed independently by C routines that
+release the Python GIL. The result does not depend on the number of threads.
+"""
+from __future__ import division, absolute_import
+from __future__ import print_function
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .xtgeo_dialog import XTGeoDialog
+
+xtg = XTGeoDialog()
+logger = xtg.functionlogger(__name__)
+
+_NUM_THREADS = None
+
+
+def set_num_threads(nthreads):
+    """Set the number of threads to use in multithreaded routines.
+
+    Args:
+        nthreads (int): Number of threads; 0 means one per CPU. None resets to
+            the value of environment variable XTG_NUM_THREADS, or 1 if not set.
+
+    Example::
+
+        import xtgeo
+        xtgeo.set_num_threads(8)
+        grd = xtgeo.Grid("large.roff")
+        bulk = grd.get_bulk_volume()
+
+    .. versionadded:: 2.14
+    """
+    global _NUM_THREADS  # pylint: disable=global-statement
+
+    _NUM_THREADS = None if nthreads is None else _valid(nthreads)
+
+
+def get_num_threads(nthreads=None):
+    """Return the number of threads to use in multithreaded routines.
+
+    Args:
+        nthreads (int): Value for a single call, which overrides the setting
+            from :func:`set_num_threads` and XTG_NUM_THREADS if not None.
+
+    .. versionadded:: 2.14
+    """
+    if nthreads is not None:
+        return _valid(nthreads)
+
+    if _NUM_THREADS is not None:
+        return _NUM_THREADS
+
+    fromenv = os.environ.get("XTG_NUM_THREADS")
+    if fromenv:
+        try:
+            return _valid(int(fromenv))
+        except ValueError:
+            logger.warning("Invalid XTG_NUM_THREADS value %s, use 1", fromenv)
+
+    return 1
+
+
+def _valid(nthreads):
+    nthreads = int(nthreads)
+    if nthreads < 0:
+        raise ValueError("Number of threads cannot be negative: {}".format(nthreads))
+    if nthreads == 0:
+        nthreads = os.cpu_count() or 1
+    return nthreads
+
+
+def split_range(nitems, nthreads):
+    """Split range(nitems) in at most nthreads (start, stop) blocks of equal size."""
+    nblocks = max(1, min(nthreads, nitems))
+    bounds = [nitems * num // nblocks for num in range(nblocks + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def run_blocks(func, nitems, nthreads=None):
+    """Run func(start, stop) on blocks of range(nitems), in several threads.
+
+    Each call of func shall work on its own block only. Exceptions in a thread
+    are raised here.
+    """
+    blocks = split_range(nitems, get_num_threads(nthreads))
+
+    if len(blocks) == 1:
+        func(*blocks[0])
+        return
+
+    logger.info("Run %s blocks in %s threads", len(blocks), len(blocks))
+    with ThreadPoolExecutor(max_workers=len(blocks)) as executor:
+        futures = [executor.submit(func, start, stop) for start, stop in blocks]
+        for future in futures:
+            future.result()
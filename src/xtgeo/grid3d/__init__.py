@@ -13,3 +13,7 @@ from xtgeo.common.exceptions import (
 from .grid import Grid
 from .grid_property import GridProperty
 from .grid_properties import GridProperties
+from ._grid_eclbin_index import EclKeywordIndex
+from ._grid_cell_locator import GridCellLocator
+from ._grid_active_mask import ActiveMask
+from ._grid_xtgeo_file import XTGeoGridFile
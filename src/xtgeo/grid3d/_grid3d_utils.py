@@ -4,6 +4,9 @@
 from __future__ import division, absolute_import
 from __future__ import print_function
 
+import hashlib
+
+import numpy as np
 import pandas as pd
 
 import xtgeo
@@ -12,6 +15,8 @@ import xtgeo.cxtgeo._cxtgeo as _cxtgeo
 xtg = xtgeo.XTGeoDialog()
 logger = xtg.functionlogger(__name__)
 
+HASHCHUNK = 16 * 1024 * 1024  # number of bytes hashed in one go
+
 
 def scan_keywords(pfile, fformat="xecl", maxkeys=100000, dataframe=False, dates=False):
     """Quick scan of keywords in Eclipse binary restart/init/... file,
@@ -212,3 +217,41 @@ def _scan_roff_keywords(pfile, maxkeys=100000, dataframe=False):
         return df
 
     return result
+
+
+def content_hash(*items):
+    """Return a hex digest (blake2b) of numpy arrays and other, small, items.
+
+    Arrays are hashed from their raw buffers, in chunks, together with dtype and
+    shape. For masked arrays, the mask is hashed and masked cells are hashed as
+    zero, so values hidden by the mask do not matter. Other items are hashed
+    through their repr().
+    """
+    mhash = hashlib.blake2b(digest_size=32)
+
+    for item in items:
+        if isinstance(item, np.ndarray):
+            _hash_array(mhash, item)
+        else:
+            mhash.update(repr(item).encode())
+        mhash.update(b"|")
+
+    return mhash.hexdigest()
+
+
+def _hash_array(mhash, arr):
+    mhash.update("{}{}".format(arr.dtype.str, arr.shape).encode())
+
+    data = np.ma.getdata(arr).reshape(-1)
+    mask = np.ma.getmask(arr)
+    if mask is not np.ma.nomask:
+        mask = mask.reshape(-1)
+
+    step = max(1, HASHCHUNK // max(1, arr.itemsize))
+    for start in range(0, data.size, step):
+        chunk = np.ascontiguousarray(data[start : start + step])
+        if mask is not np.ma.nomask:
+            chunkmask = mask[start : start + step]
+            chunk = np.where(chunkmask, np.zeros(1, dtype=chunk.dtype), chunk)
+            mhash.update(np.packbits(chunkmask).tobytes())
+        mhash.update(chunk.view(np.uint8))
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+"""Immutable mask of inactive grid cells, shared by the grid properties."""
+from __future__ import division, absolute_import
+from __future__ import print_function
+
+import numpy as np
+
+import xtgeo
+from . import _gridprop_lowlevel
+
+xtg = xtgeo.common.XTGeoDialog()
+logger = xtg.functionlogger(__name__)
+
+
+class ActiveMask(object):
+    """Immutable mask of the inactive cells in a grid.
+
+    The mask is owned by the grid, and is shared by the masked values of grid
+    properties that are made or imported for the grid, instead of each property
+    having its own copy. The mask arrays are read only; numpy makes a private
+    copy for a property only if its mask is changed (e.g. by assigning
+    ``numpy.ma.masked``), or when the values are accessed through
+    :attr:`GridProperty.values`, which allows for changes in place.
+
+    Use :meth:`Grid.get_active_mask`, which keeps the mask until the grid is
+    changed, rather than making instances directly.
+
+    Example::
+
+        grd = xtgeo.Grid("REEK.EGRID")
+        amask = grd.get_active_mask()
+        print("Active cells:", amask.nactive)
+
+    .. versionadded:: 2.14
+    """
+
+    def __init__(self, actnum):
+        """Make the mask from an ACTNUM array of shape (ncol, nrow, nlay), C order.
+
+        Args:
+            actnum (ndarray): ACTNUM values, where values less than 1 are inactive
+        """
+        mask = np.ascontiguousarray(actnum) < 1
+        mask.flags.writeable = False
+        self._mask = mask
+        self._indices = None
+
+    def __repr__(self):
+        return "{} (id={}) dimensions={}".format(
+            self.__class__.__name__, id(self), self.dimensions
+        )
+
+    @property
+    def dimensions(self):
+        """3-tuple: The grid dimensions (read only)."""
+        return self._mask.shape
+
+    @property
+    def mask(self):
+        """The 3D boolean array, True for inactive cells (read only)."""
+        return self._mask
+
+    @property
+    def indices(self):
+        """The 1D index of active cells, C order (read only)."""
+        if self._indices is None:
+            indices = np.flatnonzero(~self._mask)
+            indices.flags.writeable = False
+            self._indices = indices
+        return self._indices
+
+    @property
+    def nactive(self):
+        """int: Number of active cells (read only)."""
+        return self.indices.size
+
+    def masked(self, values, undef_limit=None):
+        """Return values as a masked array, sharing this mask.
+
+        Args:
+            values (ndarray): Values of shape (ncol, nrow, nlay), C order. If this
+                is a masked array, the mask is combined with the active mask.
+            undef_limit (float): If given, active cells with values above
+                this limit, or NaN, are masked as well (the mask is then not
+                shared).
+        """
+        if undef_limit is not None:
+            invalid = ~np.isfinite(values) | (np.ma.getdata(values) > undef_limit)
+            invalid &= ~self._mask
+            if invalid.any():
+                return np.ma.array(values, mask=self._mask | invalid)
+
+        return np.ma.array(values, mask=self._mask)
+
+    def shares(self, values):
+        """Return True if the masked values share this mask."""
+        return np.ma.getmask(values) is self._mask
+
+
+def get_active_mask(grid):
+    """Return the active mask for grid, made once and reused until changes."""
+
+    amask = grid._tmp.get("activemask")
+    if amask is None:
+        if grid._xtgformat == 1:
+            actnum = _gridprop_lowlevel.f2c_order(grid, grid._actnumsv)
+        else:
+            actnum = grid._actnumsv
+        amask = ActiveMask(np.reshape(actnum, grid.dimensions))
+        grid._tmp["activemask"] = amask
+    return amask
+
+
+def unshare(values):
+    """Give masked values a private mask, if the mask is shared (read only)."""
+
+    mask = np.ma.getmask(values)
+    if mask is not np.ma.nomask and not mask.flags.writeable:
+        values._sharedmask = True  # pylint: disable=protected-access
+        values.unshare_mask()
+
+
+def copy_values(values):
+    """Copy of masked values, where a shared (read only) mask is kept shared."""
+
+    mask = np.ma.getmask(values)
+    if mask is not np.ma.nomask and not mask.flags.writeable:
+        return np.ma.array(np.ma.getdata(values).copy(), mask=mask)
+    return values.copy()
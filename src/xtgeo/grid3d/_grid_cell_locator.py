@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""Spatial index for finding the grid cells that contain XYZ points."""
+from __future__ import division, absolute_import
+from __future__ import print_function
+
+import numpy as np
+
+import xtgeo
+import xtgeo.cxtgeo._cxtgeo as _cxtgeo
+from xtgeo.surface import _regsurf_lowlevel as rl
+
+xtg = xtgeo.common.XTGeoDialog()
+logger = xtg.functionlogger(__name__)
+
+
+class GridCellLocator(object):
+    """Index for fast lookup of the grid cells that contain XYZ points.
+
+    The locator holds a one layer version of the grid, and maps of the I and J
+    columns at top and base of the grid, which work as a bucket index for the
+    grid columns. The cell is then found by a point in hexahedron search in
+    the candidate columns.
+
+    Making the locator is the costly part, so it should be made once for a grid
+    geometry and reused. Use :meth:`Grid.get_cell_locator`, which keeps the
+    locator until the grid is changed, rather than making instances directly.
+
+    Example::
+
+        grd = xtgeo.Grid("REEK.EGRID")
+        locator = grd.get_cell_locator()
+        iarr, jarr, karr = locator.get_ijk(xarr, yarr, zarr)
+
+    .. versionadded:: 2.14
+    """
+
+    def __init__(self, grid, rfactor=4):
+        """Make the locator for a grid.
+
+        Args:
+            grid (Grid): The grid
+            rfactor (int): Resolution of the column maps relative to the grid
+        """
+        logger.info("Make a cell locator for grid...")
+
+        # a token kept in grid._tmp, which is reset whenever the grid is changed
+        self._gridtoken = grid._tmp.setdefault("locatortoken", object())
+
+        grid._xtgformat1()
+        self._dimensions = tuple(grid.dimensions)
+        self._coordsv = grid._coordsv
+        self._zcornsv = grid._zcornsv
+        self._actnumsv = grid._actnumsv
+
+        # one layer version of grid, without copying properties etc
+        one = grid.__class__()
+        one._ncol, one._nrow, one._nlay = grid.dimensions
+        one._coordsv = grid._coordsv.copy()
+        one._zcornsv = grid._zcornsv
+        one._actnumsv = grid._actnumsv
+        one._xtgformat = 1
+        one.reduce_to_one_layer()
+
+        self._top = xtgeo.RegularSurface()
+        topi, topj = self._top.from_grid3d(one, where="top", rfactor=rfactor)
+        self._base = xtgeo.RegularSurface()
+        basi, basj = self._base.from_grid3d(one, where="base", rfactor=rfactor)
+
+        maps = (topi, topj, basi, basj)
+        for surf in maps:
+            surf.fill()
+        self._carrs = tuple(rl.get_carr_double(surf) for surf in maps)
+
+        one._xtgformat1()
+        self._onegrid = one
+
+        logger.info("Make a cell locator for grid... DONE")
+
+    def __repr__(self):
+        return "{} (id={}) dimensions={}".format(
+            self.__class__.__name__, id(self), self._dimensions
+        )
+
+    @property
+    def dimensions(self):
+        """3-tuple: The grid dimensions (ncol, nrow, nlay) (read only)."""
+        return self._dimensions
+
+    @property
+    def top(self):
+        """RegularSurface: Depth of grid top, as used by the locator (read only)."""
+        return self._top
+
+    @property
+    def base(self):
+        """RegularSurface: Depth of grid base, as used by the locator (read only)."""
+        return self._base
+
+    @property
+    def onelayer_grid(self):
+        """Grid: The grid reduced to one layer (read only)."""
+        return self._onegrid
+
+    def is_valid_for(self, grid):
+        """Return True if the locator is made for the current geometry of grid."""
+        return grid._tmp.get("locatortoken") is self._gridtoken
+
+    def get_ijk(self, xvalues, yvalues, zvalues, activeonly=True):
+        """Find the cell for each point.
+
+        Args:
+            xvalues (array-like): X coordinates of points
+            yvalues (array-like): Y coordinates of points
+            zvalues (array-like): Z coordinates of points
+            activeonly (bool): If True, only active cells are returned
+
+        Returns:
+            Three numpy int arrays I, J and K, with cell indices starting from 1.
+            Points outside the grid (or in inactive cells when activeonly) have
+            the value xtgeo.UNDEF_INT.
+        """
+        xvalues, yvalues, zvalues = (
+            np.ascontiguousarray(val, dtype=np.float64).ravel()
+            for val in (xvalues, yvalues, zvalues)
+        )
+        nval = xvalues.size
+
+        args = (
+            (xvalues, yvalues, zvalues)
+            + self._search_args()
+            + self._grid_args()
+            + (self._onegrid._zcornsv, 1 if activeonly else 0, nval, nval, nval)
+        )
+        _ier, iarr, jarr, karr = _cxtgeo.grd3d_points_ijk_cells(*args)
+        return iarr, jarr, karr
+
+    def _search_args(self):
+        """The column map arguments for the C routines, as a tuple."""
+        top = self._top
+        return (
+            top.ncol,
+            top.nrow,
+            top.xori,
+            top.yori,
+            top.xinc,
+            top.yinc,
+            top.rotation,
+            top.yflip,
+        ) + self._carrs
+
+    def _grid_args(self):
+        """The grid dimensions and (xtgformat 1) arrays for the C routines."""
+        return self._dimensions + (self._coordsv, self._zcornsv, self._actnumsv)
+
+
+def get_locator(grid):
+    """Return the cell locator for grid, made once and reused until changes."""
+
+    locator = grid._tmp.get("locator")
+    if locator is None or not locator.is_valid_for(grid):
+        locator = GridCellLocator(grid)
+        grid._tmp["locator"] = locator
+    else:
+        logger.info("Re-use existing cell locator")
+
+    # a locator works on xtgformat 1 arrays; use the same as the locator
+    grid._xtgformat1()
+    return locator
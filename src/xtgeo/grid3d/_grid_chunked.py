@@ -0,0 +1,296 @@
+"""Chunked (out-of-core) storage and computation of grid geometry.
+
+In chunked mode the zcorn and actnum arrays are kept in xtgformat 1, where all
+corners for one layer are contiguous, and optionally in memory mapped files.
+Geometry computations are then done for a range of layers at a time, so only
+the geometry for one chunk needs to be in memory.
+"""
+
+from __future__ import print_function, absolute_import
+
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+
+import xtgeo
+import xtgeo.cxtgeo._cxtgeo as _cxtgeo
+from .grid_property import GridProperty
+
+xtg = xtgeo.common.XTGeoDialog()
+
+logger = xtg.functionlogger(__name__)
+
+
+def set_chunked(self, layers, folder=None, memmap=True):
+    """Turn on (or off with layers=None) chunked geometry for a grid."""
+
+    if layers is None:
+        if self._geomchunks is not None:
+            if self._zcornsv is not None:
+                logger.info("Load chunked geometry into memory")
+                self._zcornsv = np.array(self._zcornsv)
+                self._actnumsv = np.array(self._actnumsv)
+            _remove_files(self._geomchunks["files"].values())
+        self._geomchunks = None
+        return
+
+    layers = int(layers)
+    if layers < 1:
+        raise ValueError("Number of layers per chunk must be at least 1")
+
+    cleanup = None
+    if memmap and folder is None:
+        folder = tempfile.mkdtemp(prefix="xtgeo_grid_")
+        cleanup = weakref.finalize(self, shutil.rmtree, folder, ignore_errors=True)
+
+    self._geomchunks = {
+        "layers": layers,
+        "folder": str(folder) if memmap else None,
+        "cleanup": cleanup,
+        "files": {},
+    }
+    _prepare(self)
+
+
+def layer_ranges(self):
+    """Yield (k0, k1) as zero based, half open layer ranges for each chunk."""
+    step = self._geomchunks["layers"]
+    for k0 in range(0, self._nlay, step):
+        yield k0, min(k0 + step, self._nlay)
+
+
+def _prepare(self):
+    """Ensure xtgformat 1 and, if requested, memory mapped zcorn and actnum."""
+
+    self._xtgformat1()
+
+    if self._geomchunks["folder"] is None or self._zcornsv is None:
+        return
+
+    if not isinstance(self._zcornsv, np.memmap):
+        self._zcornsv = _to_memmap(self, self._zcornsv, "zcorn", np.float64)
+    if not isinstance(self._actnumsv, np.memmap):
+        self._actnumsv = _to_memmap(self, self._actnumsv, "actnum", np.int32)
+
+
+def _to_memmap(self, values, name, dtype):
+    """Copy values to a new memory mapped file, return the memmap.
+
+    The file replaces any earlier file for the same array, which is removed.
+    """
+    chunks = self._geomchunks
+    fdesc, fname = tempfile.mkstemp(
+        prefix=name + "_", suffix=".dat", dir=chunks["folder"]
+    )
+    os.close(fdesc)
+    logger.info("Store %s in memory mapped file %s", name, fname)
+
+    mapped = np.memmap(fname, dtype=dtype, mode="w+", shape=(values.size,))
+    mapped[:] = values.ravel()
+    mapped.flush()
+
+    oldfile = chunks["files"].get(name)
+    chunks["files"][name] = fname
+    if oldfile is not None:
+        _remove_files([oldfile])
+    return mapped
+
+
+def _remove_files(fnames):
+    """Remove memory mapped files no longer in use."""
+    for fname in fnames:
+        try:
+            os.remove(fname)
+        except OSError:
+            pass  # e.g. still mapped on Windows; removed with a temporary folder
+
+
+def _chunk(self, k0, k1):
+    """Return in-memory zcorn and actnum (xtgformat 1) for layers k0 to k1."""
+    nxy = self._ncol * self._nrow
+    zcornsv = np.array(self._zcornsv[4 * nxy * k0 : 4 * nxy * (k1 + 1)], np.float64)
+    actnumsv = np.array(self._actnumsv[nxy * k0 : nxy * k1], np.int32)
+    return zcornsv, actnumsv
+
+
+def get_layers(self, k0, k1):
+    """Return in-memory zcorn and actnum (xtgformat 1) for layers k0 to k1."""
+    _prepare(self)
+    return _chunk(self, k0, k1)
+
+
+def _gridprop(self, name, values):
+    """Return a property where undefined values are masked, using values as is."""
+    masked = np.ma.array(values, mask=values > xtgeo.UNDEF_LIMIT, copy=False)
+    return GridProperty(
+        ncol=self._ncol,
+        nrow=self._nrow,
+        nlay=self._nlay,
+        name=name,
+        discrete=False,
+        values=masked,
+    )
+
+
+def get_dz(self, name="dZ", flip=True, asmasked=True):
+    """Get dZ as property, computed chunk by chunk"""
+
+    _prepare(self)
+
+    dz = np.zeros((self._ncol, self._nrow, self._nlay), dtype=np.float64)
+
+    for k0, k1 in layer_ranges(self):
+        zcornsv, actnumsv = _chunk(self, k0, k1)
+        dzchunk = np.zeros(self._ncol * self._nrow * (k1 - k0), dtype=np.float64)
+
+        _cxtgeo.grd3d_calc_dz(
+            self._ncol,
+            self._nrow,
+            k1 - k0,
+            zcornsv,
+            actnumsv,
+            dzchunk,
+            1 if flip else -1,
+            1 if asmasked else 0,
+        )
+        dz[:, :, k0:k1] = dzchunk.reshape(self._ncol, self._nrow, k1 - k0)
+
+    return _gridprop(self, name, dz)
+
+
+def get_xyz(self, names=("X_UTME", "Y_UTMN", "Z_TVDSS"), asmasked=True):
+    """Get X Y Z as properties, computed chunk by chunk"""
+
+    _prepare(self)
+
+    dims = (self._ncol, self._nrow, self._nlay)
+    xyz = [np.zeros(dims, dtype=np.float64) for _ in range(3)]
+
+    for k0, k1 in layer_ranges(self):
+        zcornsv, actnumsv = _chunk(self, k0, k1)
+        nchunk = self._ncol * self._nrow * (k1 - k0)
+        xv, yv, zv = (np.zeros(nchunk, dtype=np.float64) for _ in range(3))
+
+        _cxtgeo.grd3d_calc_xyz(
+            self._ncol,
+            self._nrow,
+            k1 - k0,
+            self._coordsv,
+            zcornsv,
+            actnumsv,
+            xv,
+            yv,
+            zv,
+            1 if asmasked else 0,
+        )
+        for full, part in zip(xyz, (xv, yv, zv)):
+            full[:, :, k0:k1] = part.reshape(self._ncol, self._nrow, k1 - k0)
+
+    return tuple(_gridprop(self, name, values) for name, values in zip(names, xyz))
+
+
+def _chunk_xtgformat2(self, k0, k1):
+    """Return coordsv, zcornsv and actnumsv in xtgformat 2 for layers k0 to k1."""
+    ncol, nrow, nlay = self._ncol, self._nrow, k1 - k0
+    zcornsv, actnumsv = _chunk(self, k0, k1)
+
+    coordsv = np.zeros((ncol + 1, nrow + 1, 6), dtype=np.float64)
+    zcorn2 = np.zeros((ncol + 1, nrow + 1, nlay + 1, 4), dtype=np.float32)
+    actnum2 = np.zeros((ncol, nrow, nlay), dtype=np.int32)
+    _cxtgeo.grd3cp3d_xtgformat1to2_geom(
+        ncol, nrow, nlay, self._coordsv, coordsv, zcornsv, zcorn2, actnumsv, actnum2,
+    )
+    return coordsv, zcorn2, actnum2
+
+
+def get_bulk_volume(self, name="bulkvol", asmasked=True, precision=2):
+    """Get cell bulk volume as a GridProperty() instance, chunk by chunk"""
+
+    if precision not in (1, 2, 4):
+        raise ValueError("The precision key has an invalid entry, use 1, 2, or 4")
+
+    _prepare(self)
+
+    ncol, nrow = self._ncol, self._nrow
+    bval = np.zeros((ncol, nrow, self._nlay), dtype=np.float64)
+
+    # the volume routine works on xtgformat 2, so each chunk is converted
+    for k0, k1 in layer_ranges(self):
+        coordsv, zcorn2, actnum2 = _chunk_xtgformat2(self, k0, k1)
+        nlay = k1 - k0
+
+        bchunk = np.zeros((ncol, nrow, nlay), dtype=np.float64)
+        _cxtgeo.grdcp3d_cellvol(
+            ncol,
+            nrow,
+            nlay,
+            coordsv,
+            zcorn2,
+            actnum2,
+            bchunk,
+            precision,
+            0 if asmasked else 1,
+        )
+        bval[:, :, k0:k1] = bchunk
+
+    return _gridprop(self, name, bval)
+
+
+def cell_chunks(self, cells):
+    """Split cell numbers (C order) by chunk, for routines working on xtgformat 2.
+
+    Yields (selection, chunkcells, nlay, coordsv, zcornsv), where selection is the
+    position of the cells in the input, and chunkcells are the cell numbers within
+    the chunk, which has nlay layers.
+    """
+
+    _prepare(self)
+
+    layer = cells % self._nlay
+    column = cells // self._nlay
+
+    for k0, k1 in layer_ranges(self):
+        selection = np.flatnonzero((layer >= k0) & (layer < k1))
+        if selection.size == 0:
+            continue
+
+        nlay = k1 - k0
+        chunkcells = column[selection] * nlay + (layer[selection] - k0)
+        coordsv, zcorn2, _ = _chunk_xtgformat2(self, k0, k1)
+        yield selection, chunkcells, nlay, coordsv, zcorn2
+
+
+def get_layer_slice(self, layer, top=True, activeonly=True):
+    """Get X Y cell corners for one layer, reading only that layer"""
+
+    if layer < 1 or layer > self._nlay:
+        raise ValueError("Layer {} is outside range 1..{}".format(layer, self._nlay))
+
+    _prepare(self)
+
+    nxy = self._ncol * self._nrow
+    zcornsv, actnumsv = _chunk(self, layer - 1, layer)
+
+    icn, lay_array, ic_array = _cxtgeo.grd3d_get_lay_slice(
+        self._ncol,
+        self._nrow,
+        1,
+        self._coordsv,
+        zcornsv,
+        actnumsv,
+        1,
+        0 if top else 1,
+        1 if activeonly else 0,
+        10 * nxy,
+        nxy,
+    )
+
+    lay_array = lay_array[: 10 * icn].reshape((icn, 5, 2))
+
+    # cell numbers (C order) in the one layer chunk to cell numbers in the grid
+    ic_array = ic_array[:icn] * self._nlay + (layer - 1)
+
+    return lay_array, ic_array
@@ -0,0 +1,296 @@
+"""Keyword index for Eclipse binary output files (INIT, UNRST, ...).
+
+Scanning a large UNRST file for keywords and dates is costly, so the result of a
+scan is kept as an EclKeywordIndex, which is reused within the process and also
+stored in a small sidecar file next to the Eclipse file. The sidecar is keyed on
+file size and modification time, so it is rebuilt whenever the file changes.
+"""
+
+from __future__ import print_function, absolute_import
+
+import os
+import json
+
+import pandas as pd
+
+import xtgeo
+
+from . import _grid3d_utils as utils
+
+xtg = xtgeo.common.XTGeoDialog()
+
+logger = xtg.functionlogger(__name__)
+
+SIDECAR_VERSION = 1
+SIDECAR_SUFFIX = ".xtgidx"
+
+_COLUMNS = ["KEYWORD", "TYPE", "NITEMS", "BYTESTART", "DATE"]
+
+# in-process cache: absolute file name -> EclKeywordIndex
+_INDEXCACHE = {}
+
+
+class EclKeywordIndex(object):
+    """Index of keywords, dates and byte positions in an Eclipse binary file.
+
+    The index is normally made through :meth:`from_file`, which reuses an earlier
+    scan of the same (unchanged) file if present in memory or in a sidecar file.
+
+    Example::
+
+        idx = EclKeywordIndex.from_file("ECL.UNRST")
+        print(idx.dates)
+        kwname, kwlen, kwtype, kwbyte = idx.find("PRESSURE", date=20010101)
+
+    .. versionadded:: 2.14
+    """
+
+    def __init__(self, records, filesrc=None, filesize=None, mtime=None):
+        """Make an index from a list of records.
+
+        Args:
+            records (list): List of tuples (keyword, type, nitems, bytestart, date)
+            filesrc (str): Absolute file name, if any
+            filesize (int): Size of file in bytes, used for validating a sidecar
+            mtime (int): Modification time of file in ns, used for validating
+        """
+        self._records = [
+            (str(kw), str(kwtype), int(nitems), int(bytestart), int(date))
+            for kw, kwtype, nitems, bytestart, date in records
+        ]
+        self._filesrc = filesrc
+        self._filesize = filesize
+        self._mtime = mtime
+        self._dataframe = None
+
+        # first occurrence of (keyword, date) and of keyword -> record number
+        self._lookup = {}
+        self._first = {}
+        self._dates = []
+        self._dateset = set()
+        for inum, (kw, _, _, _, date) in enumerate(self._records):
+            self._lookup.setdefault((kw, date), inum)
+            self._first.setdefault(kw, inum)
+            if date not in self._dateset:
+                self._dateset.add(date)
+                self._dates.append(date)
+        self._keywords = set(self._first)
+
+    def __repr__(self):
+        return "{} (id={}) filesrc={!r}, nrecords={}".format(
+            self.__class__.__name__, id(self), self._filesrc, len(self._records)
+        )
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, keyword):
+        return keyword in self._keywords
+
+    # ----------------------------------------------------------------------------------
+    # Properties
+    # ----------------------------------------------------------------------------------
+
+    @property
+    def filesrc(self):
+        """str: The file the index is made from (read only)."""
+        return self._filesrc
+
+    @property
+    def records(self):
+        """list: The records as (keyword, type, nitems, bytestart, date) (read only)."""
+        return self._records
+
+    @property
+    def keywords(self):
+        """set: All keyword names in the file (read only)."""
+        return self._keywords
+
+    @property
+    def dates(self):
+        """list: All dates in file order, as int YYYYMMDD (read only).
+
+        For files without dates (e.g. INIT), this is [0].
+        """
+        return self._dates
+
+    @property
+    def dataframe(self):
+        """Return the index as a Pandas dataframe, same layout as scan_keywords.
+
+        Columns are KEYWORD, TYPE, NITEMS, BYTESTART and DATE.
+        """
+        if self._dataframe is None:
+            self._dataframe = pd.DataFrame.from_records(self._records, columns=_COLUMNS)
+        return self._dataframe
+
+    # ----------------------------------------------------------------------------------
+    # Queries
+    # ----------------------------------------------------------------------------------
+
+    def has(self, keyword, date=0):
+        """Return True if keyword exists for the given date (0 if no dates).
+
+        The date may be given as int or str on form YYYYMMDD.
+        """
+        return (keyword, _dateint(date)) in self._lookup
+
+    def has_date(self, date):
+        """Return True if date (int or str YYYYMMDD) exists in the file."""
+        return _dateint(date) in self._dateset
+
+    def find(self, keyword, date=0):
+        """Return (kwname, kwlen, kwtype, kwbyte) for a keyword and date, or None.
+
+        The returned tuple can be given directly to ``eclbin_record``.
+        """
+        return self._entry(self._lookup.get((keyword, _dateint(date))))
+
+    def find_first(self, keyword):
+        """As :meth:`find`, but for the first occurrence of keyword, at any date."""
+        return self._entry(self._first.get(keyword))
+
+    def _entry(self, inum):
+        if inum is None:
+            return None
+        kw, kwtype, nitems, bytestart, _ = self._records[inum]
+        return kw, nitems, kwtype, bytestart
+
+    # ----------------------------------------------------------------------------------
+    # Making and storing the index
+    # ----------------------------------------------------------------------------------
+
+    @classmethod
+    def from_file(cls, pfile, sidecar=True, maxkeys=100000):
+        """Get the keyword index for an Eclipse binary file.
+
+        An index already made for the same, unchanged file is reused, either from
+        memory or from the sidecar file. Otherwise the file is scanned.
+
+        Args:
+            pfile (str, Path or _XTGeoFile): Eclipse binary file
+            sidecar (bool): If True (default), read and write a sidecar index file
+                named ``.<filename>.xtgidx`` in the same folder as the file.
+            maxkeys (int): Maximum number of keywords when scanning.
+        """
+        if not isinstance(pfile, xtgeo._XTGeoFile):
+            pfile = xtgeo._XTGeoFile(pfile)
+
+        if pfile.memstream:
+            return cls._from_scan(pfile, maxkeys)
+
+        fname = pfile.name
+        stat = os.stat(fname)
+        size, mtime = stat.st_size, stat.st_mtime_ns
+
+        idx = _INDEXCACHE.get(fname)
+        if idx is not None and idx.is_valid_for(size, mtime):
+            logger.info("Reuse keyword index from memory for %s", fname)
+            return idx
+
+        idx = None
+        if sidecar:
+            idx = cls._from_sidecar(fname, size, mtime)
+
+        if idx is None:
+            idx = cls._from_scan(pfile, maxkeys)
+            idx._filesize, idx._mtime = size, mtime
+            if sidecar:
+                idx.to_sidecar()
+
+        _INDEXCACHE[fname] = idx
+        return idx
+
+    @classmethod
+    def _from_scan(cls, pfile, maxkeys):
+        logger.info("Scan keywords and dates for index...")
+        records = utils.scan_keywords(
+            pfile, fformat="xecl", maxkeys=maxkeys, dataframe=False, dates=True
+        )
+        filesrc = None if pfile.memstream else pfile.name
+        return cls(records, filesrc=filesrc)
+
+    @classmethod
+    def _from_sidecar(cls, fname, size, mtime):
+        sfile = sidecar_name(fname)
+        if not os.path.isfile(sfile):
+            return None
+
+        try:
+            with open(sfile, "r") as stream:
+                meta = json.load(stream)
+        except (OSError, ValueError) as err:
+            logger.warning("Cannot read index file %s: %s", sfile, err)
+            return None
+
+        if (
+            meta.get("version") != SIDECAR_VERSION
+            or meta.get("filesize") != size
+            or meta.get("mtime") != mtime
+        ):
+            logger.info("Index file %s is outdated, will rescan", sfile)
+            return None
+
+        logger.info("Reuse keyword index from %s", sfile)
+        return cls(meta["records"], filesrc=fname, filesize=size, mtime=mtime)
+
+    def is_valid_for(self, size, mtime):
+        """Return True if index is made for a file with given size and mtime."""
+        return self._filesize == size and self._mtime == mtime
+
+    def to_sidecar(self):
+        """Store index in sidecar file; return True if success.
+
+        Failing to write (e.g. a read only folder) is not an error, the index
+        will then just be rebuilt next time.
+        """
+        if self._filesrc is None:
+            return False
+
+        meta = {
+            "version": SIDECAR_VERSION,
+            "filesize": self._filesize,
+            "mtime": self._mtime,
+            "records": self._records,
+        }
+        sfile = sidecar_name(self._filesrc)
+        tmpfile = sfile + ".tmp{}".format(os.getpid())
+        try:
+            with open(tmpfile, "w") as stream:
+                json.dump(meta, stream)
+            os.replace(tmpfile, sfile)  # atomic, so parallel processes are safe
+        except OSError as err:
+            logger.info("Could not write index file %s: %s", sfile, err)
+            if os.path.exists(tmpfile):
+                os.remove(tmpfile)
+            return False
+
+        return True
+
+
+def _dateint(date):
+    """Date as int YYYYMMDD for lookups; None if not a valid date."""
+    try:
+        return int(date)
+    except (TypeError, ValueError):
+        return None
+
+
+def sidecar_name(fname):
+    """Return the sidecar index file name for a file."""
+    folder, name = os.path.split(fname)
+    return os.path.join(folder, "." + name + SIDECAR_SUFFIX)
+
+
+def get_index(kwlist):
+    """Return an EclKeywordIndex from an index, a record list or a dataframe.
+
+    Args:
+        kwlist: EclKeywordIndex, a list of (keyword, type, nitems, bytestart, date)
+            tuples, or a dataframe as from scan_keywords with dates.
+    """
+    if isinstance(kwlist, EclKeywordIndex):
+        return kwlist
+    if isinstance(kwlist, pd.DataFrame):
+        kwlist = kwlist[_COLUMNS].itertuples(index=False, name=None)
+    return EclKeywordIndex(kwlist)
@@ -12,8 +12,176 @@ xtg = xtgeo.common.XTGeoDialog()
 
 logger = xtg.functionlogger(__name__)
 
+# Eclipse binary files are big endian; LOGI is stored as int (0 False, -1 True)
+_ECLDTYPES = {"INTE": ">i4", "REAL": ">f4", "DOUB": ">f8", "LOGI": ">i4"}
+_NATIVEDTYPES = {
+    "INTE": np.int32,
+    "REAL": np.float32,
+    "DOUB": np.float64,
+    "LOGI": np.int32,
+}
 
-def eclbin_record(gfile, kwname, kwlen, kwtype, kwbyte):
+_ECLHEADERLEN = 24  # record header: 4 + 8 (keyword) + 4 (nitems) + 4 (type) + 4
+
+
+def eclbin_record(gfile, kwname, kwlen, kwtype, kwbyte, engine="mmap"):
+    """Read a single binary Eclipse record, return a numpy array.
+
+    Args:
+        gfile (_XTGeoFile): The file
+        kwname (str): Name of keyword (for messages)
+        kwlen (int): Number of items in record
+        kwtype (str): INTE, REAL, DOUB or LOGI
+        kwbyte (int): Byte position of record start (the keyword header)
+        engine (str): "mmap" (default) for numpy memory mapped reading, or
+            "cxtgeo" for the C reader.
+    """
+
+    if engine == "cxtgeo":
+        return _eclbin_record_cxtgeo(gfile, kwname, kwlen, kwtype, kwbyte)
+
+    return EclRecordView(gfile, kwname, kwlen, kwtype, kwbyte).to_numpy()
+
+
+class EclRecordView(object):
+    """Zero copy view of the payload of an Eclipse binary record.
+
+    The record is memory mapped, and the data is exposed as big endian strided
+    views that skip the Fortran block markers. Byteswap and casting is done only
+    when data are copied out, either as a whole (``to_numpy()``) or scattered
+    directly into a target array (``scatter()``).
+    """
+
+    def __init__(self, gfile, kwname, kwlen, kwtype, kwbyte):
+        if kwtype not in _ECLDTYPES:
+            raise ValueError(
+                "Wrong type of kwtype {} for {}, must be INTE, REAL "
+                "or DOUB".format(kwtype, kwname)
+            )
+
+        self.name = kwname
+        self.nitems = int(kwlen)
+        self.kwtype = kwtype
+        self._ecldtype = np.dtype(_ECLDTYPES[kwtype])
+
+        if gfile.memstream:
+            buf = np.frombuffer(gfile.file.getbuffer(), dtype=np.uint8)
+        else:
+            buf = np.memmap(gfile.name, dtype=np.uint8, mode="r")
+
+        self._chunks = _record_chunks(buf, int(kwbyte), self.nitems, self._ecldtype)
+
+    @property
+    def dtype(self):
+        """The native numpy dtype of the record values."""
+        return np.dtype(_NATIVEDTYPES[self.kwtype])
+
+    @property
+    def chunks(self):
+        """List of (first_index, view), where views are 1D or 2D (blocks, items)."""
+        return self._chunks
+
+    def to_numpy(self, dtype=None):
+        """Return record values as a contiguous native array (one copy)."""
+        dtype = self.dtype if dtype is None else dtype
+        result = np.empty(self.nitems, dtype=dtype)
+        for first, view in self._chunks:
+            result[first : first + view.size].reshape(view.shape)[...] = view
+
+        if self.kwtype == "LOGI":
+            np.negative(result, out=result)  # store True as 1
+        return result
+
+    def scatter(self, target, index):
+        """Assign values into target[index], where index has length nitems.
+
+        This is the same as ``target[index] = self.to_numpy()`` but without
+        making an intermediate array.
+        """
+        if index.size != self.nitems:
+            raise ValueError(
+                "Index length {} does not match record length {} for {}".format(
+                    index.size, self.nitems, self.name
+                )
+            )
+
+        for first, view in self._chunks:
+            target[index[first : first + view.size].reshape(view.shape)] = view
+
+        if self.kwtype == "LOGI":
+            target[index] *= -1
+
+
+def _record_chunks(buf, kwbyte, nitems, ecldtype):
+    """Return list of (first_index, strided view) for the record payload.
+
+    Eclipse writes numeric data in Fortran blocks, normally of 1000 items, each
+    enclosed by a 4 byte length marker before and after. If all blocks but the
+    last have the same size (the normal case), the full blocks are exposed as one
+    2D strided view; otherwise the blocks are walked one by one.
+    """
+    isz = ecldtype.itemsize
+    pos = kwbyte + _ECLHEADERLEN
+
+    if nitems == 0:
+        return []
+
+    blockbytes = int(buf[pos : pos + 4].view(">i4")[0])
+    blocklen = blockbytes // isz
+    stride = blockbytes + 8
+    nfull = nitems // blocklen
+    nrest = nitems - nfull * blocklen
+
+    chunks = []
+    if nfull > 0:
+        mpos = (pos, pos + 4 + blockbytes)
+        markers1, markers2 = (
+            np.ndarray((nfull,), ">i4", buffer=buf, offset=mps, strides=(stride,))
+            for mps in mpos
+        )
+        if not (np.all(markers1 == blockbytes) and np.all(markers2 == blockbytes)):
+            logger.info("Irregular Fortran blocks, walk the blocks one by one")
+            return _record_chunks_walk(buf, pos, nitems, ecldtype)
+
+        view = np.ndarray(
+            (nfull, blocklen),
+            ecldtype,
+            buffer=buf,
+            offset=pos + 4,
+            strides=(stride, isz),
+        )
+        chunks.append((0, view))
+
+    if nrest > 0:
+        rpos = pos + nfull * stride
+        rbytes = int(buf[rpos : rpos + 4].view(">i4")[0])
+        if rbytes != nrest * isz:
+            return _record_chunks_walk(buf, pos, nitems, ecldtype)
+        view = np.ndarray((nrest,), ecldtype, buffer=buf, offset=rpos + 4)
+        chunks.append((nfull * blocklen, view))
+
+    return chunks
+
+
+def _record_chunks_walk(buf, pos, nitems, ecldtype):
+    """Fallback for _record_chunks, walking the Fortran blocks one by one."""
+    isz = ecldtype.itemsize
+    chunks = []
+    first = 0
+    while first < nitems:
+        blockbytes = int(buf[pos : pos + 4].view(">i4")[0])
+        nblk = min(blockbytes // isz, nitems - first)
+        endmarker = int(buf[pos + 4 + blockbytes : pos + 8 + blockbytes].view(">i4")[0])
+        if blockbytes <= 0 or endmarker != blockbytes:
+            raise RuntimeError("Corrupt Fortran record at byte position {}".format(pos))
+        view = np.ndarray((nblk,), ecldtype, buffer=buf, offset=pos + 4)
+        chunks.append((first, view))
+        first += nblk
+        pos += blockbytes + 8
+    return chunks
+
+
+def _eclbin_record_cxtgeo(gfile, kwname, kwlen, kwtype, kwbyte):
     # generic: read a single binary Eclipse record via cxtgeo
 
     ilen = flen = dlen = 1
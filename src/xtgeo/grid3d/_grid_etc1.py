@@ -16,11 +16,14 @@ import xtgeo
 import xtgeo.cxtgeo._cxtgeo as _cxtgeo
 from xtgeo.common import XTGeoDialog
 from xtgeo.common.calc import find_flip
+from xtgeo.common import threads
 from xtgeo.xyz.polygons import Polygons
 from xtgeo.well import Well
 from . import _gridprop_lowlevel
+from . import _grid_chunked
+from . import _grid3d_utils
+from . import _grid_cell_locator
 from .grid_property import GridProperty
-from ._grid3d_fence import _update_tmpvars
 
 xtg = XTGeoDialog()
 
@@ -81,9 +84,12 @@ def create_box(
     self._xtgformat = 1
 
 
-def get_dz(self, name="dZ", flip=True, asmasked=True):
+def get_dz(self, name="dZ", flip=True, asmasked=True, nthreads=None):
     """Get dZ as property"""
 
+    if self._geomchunks is not None:
+        return _grid_chunked.get_dz(self, name=name, flip=flip, asmasked=asmasked)
+
     self._xtgformat1()
 
     ntot = (self._ncol, self._nrow, self._nlay)
@@ -97,7 +103,7 @@ def get_dz(self, name="dZ", flip=True, asmasked=True):
         discrete=False,
     )
 
-    dz = np.zeros(self.ntotal, dtype=np.float64)
+    dz = np.zeros(ntot, dtype=np.float64)
 
     nflip = 1
     if not flip:
@@ -107,16 +113,15 @@ def get_dz(self, name="dZ", flip=True, asmasked=True):
     if asmasked:
         option = 1
 
-    _cxtgeo.grd3d_calc_dz(
-        self._ncol,
-        self._nrow,
-        self._nlay,
-        self._zcornsv,
-        self._actnumsv,
-        dz,
-        nflip,
-        option,
-    )
+    def _dz_layers(k0, k1):
+        zcornsv, actnumsv = _layers_xtgformat1(self, k0, k1)
+        dzpart = np.zeros(self._ncol * self._nrow * (k1 - k0), dtype=np.float64)
+        _cxtgeo.grd3d_calc_dz(
+            self._ncol, self._nrow, k1 - k0, zcornsv, actnumsv, dzpart, nflip, option,
+        )
+        dz[:, :, k0:k1] = dzpart.reshape(self._ncol, self._nrow, k1 - k0)
+
+    threads.run_blocks(_dz_layers, self._nlay, nthreads)
 
     dzv.values = np.ma.masked_greater(dz, xtgeo.UNDEF_LIMIT)
     # return the property object
@@ -125,11 +130,19 @@ def get_dz(self, name="dZ", flip=True, asmasked=True):
     return dzv
 
 
-def get_dxdy(self, names=("dX", "dY"), asmasked=False):
+def _layers_xtgformat1(self, k0, k1):
+    """Return views of zcornsv and actnumsv (xtgformat 1) for layers k0 to k1."""
+    nxy = self._ncol * self._nrow
+    zcornsv = self._zcornsv[4 * nxy * k0 : 4 * nxy * (k1 + 1)]
+    actnumsv = self._actnumsv[nxy * k0 : nxy * k1]
+    return zcornsv, actnumsv
+
+
+def get_dxdy(self, names=("dX", "dY"), asmasked=False, nthreads=None):
     """Get dX, dY as properties"""
 
     self._xtgformat1()
-    ntot = self._ncol * self._nrow * self._nlay
+    ntot = (self._ncol, self._nrow, self._nlay)
 
     dxval = np.zeros(ntot, dtype=np.float64)
     dyval = np.zeros(ntot, dtype=np.float64)
@@ -155,18 +168,27 @@ def get_dxdy(self, names=("dX", "dY"), asmasked=False):
     if asmasked:
         option1 = 1
 
-    _cxtgeo.grd3d_calc_dxdy(
-        self._ncol,
-        self._nrow,
-        self._nlay,
-        self._coordsv,
-        self._zcornsv,
-        self._actnumsv,
-        dxval,
-        dyval,
-        option1,
-        option2,
-    )
+    def _dxdy_layers(k0, k1):
+        zcornsv, actnumsv = _layers_xtgformat1(self, k0, k1)
+        npart = self._ncol * self._nrow * (k1 - k0)
+        dxpart = np.zeros(npart, dtype=np.float64)
+        dypart = np.zeros(npart, dtype=np.float64)
+        _cxtgeo.grd3d_calc_dxdy(
+            self._ncol,
+            self._nrow,
+            k1 - k0,
+            self._coordsv,
+            zcornsv,
+            actnumsv,
+            dxpart,
+            dypart,
+            option1,
+            option2,
+        )
+        for full, part in ((dxval, dxpart), (dyval, dypart)):
+            full[:, :, k0:k1] = part.reshape(self._ncol, self._nrow, k1 - k0)
+
+    threads.run_blocks(_dxdy_layers, self._nlay, nthreads)
 
     dx.values = np.ma.masked_greater(dxval, xtgeo.UNDEF_LIMIT)
     dy.values = np.ma.masked_greater(dyval, xtgeo.UNDEF_LIMIT)
@@ -175,9 +197,14 @@ def get_dxdy(self, names=("dX", "dY"), asmasked=False):
     return dx, dy
 
 
-def get_bulk_volume(self, name="bulkvol", asmasked=True, precision=2):
+def get_bulk_volume(self, name="bulkvol", asmasked=True, precision=2, nthreads=None):
     """Get cell bulk volume as a GridProperty() instance"""
 
+    if self._geomchunks is not None:
+        return _grid_chunked.get_bulk_volume(
+            self, name=name, asmasked=asmasked, precision=precision
+        )
+
     self._xtgformat2()
 
     bulk = GridProperty(
@@ -189,17 +216,21 @@ def get_bulk_volume(self, name="bulkvol", asmasked=True, precision=2):
     if precision not in (1, 2, 4):
         raise ValueError("The precision key has an invalid entry, use 1, 2, or 4")
 
-    _cxtgeo.grdcp3d_cellvol(
-        self._ncol,
-        self._nrow,
-        self._nlay,
-        self._coordsv,
-        self._zcornsv,
-        self._actnumsv,
-        bval,
-        precision,
-        0 if asmasked else 1,
-    )
+    def _bulk_columns(i0, i1):
+        # a block of I columns is contiguous in xtgformat 2, so views are used
+        _cxtgeo.grdcp3d_cellvol(
+            i1 - i0,
+            self._nrow,
+            self._nlay,
+            self._coordsv[i0 : i1 + 1],
+            self._zcornsv[i0 : i1 + 1],
+            self._actnumsv[i0:i1],
+            bval[i0:i1],
+            precision,
+            0 if asmasked else 1,
+        )
+
+    threads.run_blocks(_bulk_columns, self._ncol, nthreads)
 
     if asmasked:
         bval = np.ma.masked_greater(bval, xtgeo.UNDEF_LIMIT)
@@ -275,53 +306,19 @@ def get_ijk_from_points(
     """Get I J K indices as a list of tuples or a dataframe
 
     It is here tried to get fast execution. This requires a preprosessing
-    of the grid to store a onlayer version, and maps with IJ positions
+    of the grid to store a onlayer version, and maps with IJ positions, which is
+    kept as a cell locator (GridCellLocator) until the grid is changed.
     """
-    self._xtgformat1()
     logger.info("Getting IJK indices from Points...")
 
-    actnumoption = 1
-    if not activeonly:
-        actnumoption = 0
-
-    _update_tmpvars(self, force=True)
-
-    arrsize = points.dataframe[points.xname].values.size
-
-    useflip = 1
-    if self.ijk_handedness == "left":
-        useflip = -1
-
-    logger.info("Grid FLIP for C code is %s", useflip)
+    locator = _grid_cell_locator.get_locator(self)
 
     logger.info("Running C routine...")
-    _ier, iarr, jarr, karr = _cxtgeo.grd3d_points_ijk_cells(
+    iarr, jarr, karr = locator.get_ijk(
         points.dataframe[points.xname].values,
         points.dataframe[points.yname].values,
         points.dataframe[points.zname].values,
-        self._tmp["topd"].ncol,
-        self._tmp["topd"].nrow,
-        self._tmp["topd"].xori,
-        self._tmp["topd"].yori,
-        self._tmp["topd"].xinc,
-        self._tmp["topd"].yinc,
-        self._tmp["topd"].rotation,
-        self._tmp["topd"].yflip,
-        self._tmp["topi_carr"],
-        self._tmp["topj_carr"],
-        self._tmp["basi_carr"],
-        self._tmp["basj_carr"],
-        self.ncol,
-        self.nrow,
-        self.nlay,
-        self._coordsv,
-        self._zcornsv,
-        self._actnumsv,
-        self._tmp["onegrid"]._zcornsv,
-        actnumoption,
-        arrsize,
-        arrsize,
-        arrsize,
+        activeonly=activeonly,
     )
     logger.info("Running C routine... DONE")
 
@@ -361,31 +358,25 @@ def get_ijk_from_points(
     return result
 
 
-def get_xyz(self, names=("X_UTME", "Y_UTMN", "Z_TVDSS"), asmasked=True):
+def get_xyz(self, names=("X_UTME", "Y_UTMN", "Z_TVDSS"), asmasked=True, nthreads=None):
     """Get X Y Z as properties... May be issues with asmasked vs activeonly here"""
 
+    if self._geomchunks is not None:
+        return _grid_chunked.get_xyz(self, names=names, asmasked=asmasked)
+
     self._xtgformat1()
 
-    xv = np.zeros(self.ntotal, dtype=np.float64)
-    yv = np.zeros(self.ntotal, dtype=np.float64)
-    zv = np.zeros(self.ntotal, dtype=np.float64)
+    dims = (self._ncol, self._nrow, self._nlay)
+    xv = np.zeros(dims, dtype=np.float64)
+    yv = np.zeros(dims, dtype=np.float64)
+    zv = np.zeros(dims, dtype=np.float64)
 
-    option = 0
-    if asmasked:
-        option = 1
+    def _xyz_layers(k0, k1):
+        parts = get_xyz_layers(self, k0, k1, asmasked=asmasked)
+        for full, part in zip((xv, yv, zv), parts):
+            full[:, :, k0:k1] = part
 
-    _cxtgeo.grd3d_calc_xyz(
-        self._ncol,
-        self._nrow,
-        self._nlay,
-        self._coordsv,
-        self._zcornsv,
-        self._actnumsv,
-        xv,
-        yv,
-        zv,
-        option,
-    )
+    threads.run_blocks(_xyz_layers, self._nlay, nthreads)
 
     xv = np.ma.masked_greater(xv, xtgeo.UNDEF_LIMIT)
     yv = np.ma.masked_greater(yv, xtgeo.UNDEF_LIMIT)
@@ -421,6 +412,38 @@ def get_xyz(self, names=("X_UTME", "Y_UTMN", "Z_TVDSS"), asmasked=True):
     return xo, yo, zo
 
 
+def get_xyz_layers(self, k0, k1, asmasked=True):
+    """Get X Y Z of cell centers for layers k0 to k1 (zero based, half open).
+
+    Returns three numpy arrays of shape (ncol, nrow, k1 - k0), where inactive cells
+    are UNDEF if asmasked. Also for chunked geometry, where only the zcorn and
+    actnum for these layers are read into memory.
+    """
+    if self._geomchunks is not None:
+        zcornsv, actnumsv = _grid_chunked.get_layers(self, k0, k1)
+    else:
+        self._xtgformat1()
+        zcornsv, actnumsv = _layers_xtgformat1(self, k0, k1)
+
+    shape = (self._ncol, self._nrow, k1 - k0)
+    xv, yv, zv = (np.zeros(shape, dtype=np.float64) for _ in range(3))
+
+    # C order arrays, hence the 1D views are filled in place
+    _cxtgeo.grd3d_calc_xyz(
+        self._ncol,
+        self._nrow,
+        k1 - k0,
+        self._coordsv,
+        zcornsv,
+        actnumsv,
+        xv.reshape(-1),
+        yv.reshape(-1),
+        zv.reshape(-1),
+        1 if asmasked else 0,
+    )
+    return xv, yv, zv
+
+
 def get_xyz_cell_corners(self, ijk=(1, 1, 1), activeonly=True, zerobased=False):
     """Get X Y Z cell corners for one cell."""
 
@@ -608,8 +631,128 @@ def get_cell_volume(self, ijk=(1, 1, 1), activeonly=True, zerobased=False, preci
     return cellvol
 
 
+def get_cell_corners(self, indices=None, activeonly=False, nthreads=None):
+    """Get X Y Z corners for many cells, as a (ncells, 8, 3) numpy array."""
+
+    cells = _cell_numbers(self, indices, activeonly)
+    corners = np.zeros((cells.size, 8, 3), dtype=np.float64)
+
+    for selection, chunkcells, nlay, coordsv, zcornsv in _cell_parts(self, cells):
+        result = np.zeros((chunkcells.size, 8, 3), dtype=np.float64)
+
+        def _corners_block(n0, n1):
+            ier = _cxtgeo.grdcp3d_corners_cells(
+                self._ncol,
+                self._nrow,
+                nlay,
+                coordsv,
+                zcornsv,
+                chunkcells[n0:n1],
+                result[n0:n1],
+            )
+            if ier != 0:
+                raise RuntimeError("Error code {} from C routine".format(ier))
+
+        threads.run_blocks(_corners_block, chunkcells.size, nthreads)
+        corners[selection] = result
+
+    return corners
+
+
+def get_cell_volumes(
+    self, indices=None, activeonly=False, precision=2, centroids=False, nthreads=None
+):
+    """Get bulk volume and optionally centroid for many cells, as numpy arrays."""
+
+    if precision not in (1, 2, 4):
+        raise ValueError("The precision key has an invalid entry, use 1, 2, or 4")
+
+    cells = _cell_numbers(self, indices, activeonly)
+    volumes = np.zeros(cells.size, dtype=np.float64)
+    centers = np.zeros((cells.size, 3), dtype=np.float64)
+
+    for selection, chunkcells, nlay, coordsv, zcornsv in _cell_parts(self, cells):
+        vol = np.zeros(chunkcells.size, dtype=np.float64)
+        cen = np.zeros((chunkcells.size, 3), dtype=np.float64)
+
+        def _volumes_block(n0, n1):
+            ier = _cxtgeo.grdcp3d_cellvol_cells(
+                self._ncol,
+                self._nrow,
+                nlay,
+                coordsv,
+                zcornsv,
+                chunkcells[n0:n1],
+                vol[n0:n1],
+                cen[n0:n1],
+                precision,
+            )
+            if ier != 0:
+                raise RuntimeError("Error code {} from C routine".format(ier))
+
+        threads.run_blocks(_volumes_block, chunkcells.size, nthreads)
+        volumes[selection] = vol
+        centers[selection] = cen
+
+    if centroids:
+        return volumes, centers
+    return volumes
+
+
+def _cell_numbers(self, indices, activeonly):
+    """Return cell numbers (C order, base 0) as int64 array from a cell selection.
+
+    The selection is None (all cells), a boolean array with one entry per cell,
+    or an array of cell numbers.
+    """
+
+    ntotal = self._ncol * self._nrow * self._nlay
+
+    if indices is None:
+        cells = np.arange(ntotal, dtype=np.int64)
+    else:
+        indices = np.asanyarray(indices)
+        if indices.dtype == np.bool_:
+            if indices.size != ntotal:
+                raise ValueError(
+                    "Boolean cell selection has size {}, grid has {} cells".format(
+                        indices.size, ntotal
+                    )
+                )
+            cells = np.flatnonzero(np.ma.filled(indices, False)).astype(np.int64)
+        else:
+            cells = np.ascontiguousarray(indices, dtype=np.int64).ravel()
+            if cells.size > 0 and (cells.min() < 0 or cells.max() >= ntotal):
+                raise ValueError(
+                    "Cell numbers must be in range 0..{}".format(ntotal - 1)
+                )
+
+    if activeonly:
+        active = np.ravel(self.get_actnum().values) > 0
+        cells = cells[active[cells]]
+
+    return cells
+
+
+def _cell_parts(self, cells):
+    """Yield cells with geometry (xtgformat 2), in chunks if the grid is chunked."""
+
+    if self._geomchunks is not None:
+        for part in _grid_chunked.cell_chunks(self, cells):
+            yield part
+        return
+
+    self._xtgformat2()
+    yield slice(None), cells, self._nlay, self._coordsv, self._zcornsv
+
+
 def get_layer_slice(self, layer, top=True, activeonly=True):
     """Get X Y cell corners (XY per cell; 5 per cell) as array"""
+    if self._geomchunks is not None:
+        return _grid_chunked.get_layer_slice(
+            self, layer, top=top, activeonly=activeonly
+        )
+
     self._xtgformat1()
     ntot = self._ncol * self._nrow * self._nlay
 
@@ -1393,7 +1536,12 @@ def _convert_xtgformat2to1(self):
         logger.info("No conversion, format is already xtgformat == 1 or unset")
         return
 
+    if _xtgformat_from_cache(self, 1):
+        return
+
     logger.info("Convert grid from new xtgformat to legacy format...")
+    t0 = xtg.timer()
+    oldarrays = (self._coordsv, self._zcornsv, self._actnumsv)
 
     newcoordsv = np.zeros(((self._ncol + 1) * (self._nrow + 1) * 6), dtype=np.float64)
     newzcornsv = np.zeros(
@@ -1418,6 +1566,7 @@ def _convert_xtgformat2to1(self):
     self._actnumsv = newactnumsv
     self._xtgformat = 1
 
+    _xtgformat_to_cache(self, 2, oldarrays, xtg.timer(t0))
     logger.info("Convert grid from new xtgformat to legacy format... done")
 
 
@@ -1428,7 +1577,12 @@ def _convert_xtgformat1to2(self):
         logger.info("No conversion, format is already xtgformat == 2 or unset")
         return
 
+    if _xtgformat_from_cache(self, 2):
+        return
+
     logger.info("Convert grid from legacy xtgformat to new format...")
+    t0 = xtg.timer()
+    oldarrays = (self._coordsv, self._zcornsv, self._actnumsv)
 
     newcoordsv = np.zeros((self._ncol + 1, self._nrow + 1, 6), dtype=np.float64)
     newzcornsv = np.zeros(
@@ -1453,7 +1607,80 @@ def _convert_xtgformat1to2(self):
     self._actnumsv = newactnumsv
     self._xtgformat = 2
 
-    logger.info("Convert grid from new xtgformat to legacy format... done")
+    _xtgformat_to_cache(self, 1, oldarrays, xtg.timer(t0))
+    logger.info("Convert grid from legacy xtgformat to new format... done")
+
+
+def generate_hash(self):
+    """Content hash of grid geometry, kept in self._tmp until the grid is changed"""
+
+    self._xtgformat2()  # hash is for the xtgformat 2 arrays, so format does not matter
+
+    arrays = (self._coordsv, self._zcornsv, self._actnumsv)
+    cache = self._tmp.get("hash")
+    if cache is not None and all(arr is old for arr, old in zip(arrays, cache[0])):
+        return cache[1]
+
+    ghash = _grid3d_utils.content_hash(self._ncol, self._nrow, self._nlay, *arrays)
+    self._tmp["hash"] = (arrays, ghash)
+    return ghash
+
+
+# The arrays in the other xtgformat are kept in self._tmp, which is reset whenever
+# the grid is changed. In addition the cache is only used if the current arrays
+# are the very same objects as when the cache was made.
+_XTGFORMAT_CACHE = "xtgformat_cache"
+
+# Largest size in MB of arrays kept as cache; 0 will switch off the cache
+XTGFORMAT_CACHE_MAXMB = 2048
+
+
+def _xtgformat_to_cache(self, xtgformat, arrays, seconds):
+    """Keep arrays for xtgformat as cache, and update conversion statistics.
+
+    Arrays for chunked geometry, memory mapped arrays and arrays larger than
+    XTGFORMAT_CACHE_MAXMB are not kept, as the point is then to limit memory use.
+    """
+
+    nbytes = sum(arr.nbytes for arr in arrays)
+    if (
+        self._geomchunks is not None
+        or any(isinstance(arr, np.memmap) for arr in arrays)
+        or nbytes > XTGFORMAT_CACHE_MAXMB * 1024 * 1024
+    ):
+        self._tmp.pop(_XTGFORMAT_CACHE, None)
+    else:
+        self._tmp[_XTGFORMAT_CACHE] = {
+            "xtgformat": xtgformat,
+            "arrays": arrays,
+            "current": (self._coordsv, self._zcornsv, self._actnumsv),
+        }
+
+    stats = self._xtgformat_stats
+    stats["to_xtgformat{}".format(self._xtgformat)] += 1
+    stats["seconds"] += seconds
+
+
+def _xtgformat_from_cache(self, xtgformat):
+    """Swap to cached arrays for xtgformat if valid; return True if done."""
+
+    cache = self._tmp.get(_XTGFORMAT_CACHE)
+    if cache is None or cache["xtgformat"] != xtgformat:
+        return False
+
+    current = (self._coordsv, self._zcornsv, self._actnumsv)
+    if any(arr is not cached for arr, cached in zip(current, cache["current"])):
+        del self._tmp[_XTGFORMAT_CACHE]
+        return False
+
+    logger.info("Use cached arrays for xtgformat %s", xtgformat)
+    self._coordsv, self._zcornsv, self._actnumsv = cache["arrays"]
+    cache["xtgformat"] = self._xtgformat
+    cache["arrays"] = current
+    cache["current"] = (self._coordsv, self._zcornsv, self._actnumsv)
+    self._xtgformat = xtgformat
+    self._xtgformat_stats["cache_hits"] += 1
+    return True
 
 
 def get_gridquality_properties(self):
@@ -1,11 +1,11 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function, absolute_import
 
-import json
 import numpy as np
 import xtgeo
 from xtgeo.common import XTGeoDialog
 import xtgeo.cxtgeo._cxtgeo as _cxtgeo
+from xtgeo.grid3d import _grid_xtgeo_file
 
 xtg = XTGeoDialog()
 
@@ -156,33 +156,17 @@ def export_egrid(self, gfile):
 
 
 def export_xtgeo(self, gfile):
-    """Export grid to binary XTGeo format (in prep).
+    """Export grid, with its properties if any, to the native binary xtgeo format.
 
     Args:
         gfile(str): Name of output file
     """
 
-    self._xtgformat2()
-
     gfile = xtgeo._XTGeoFile(gfile, mode="wb")
 
     logger.debug("Export to binary XTGEO...")
 
-    # TODO: Improve metadata
-    meta = {"subgrids": self.get_subgrids()}
-    jmeta = json.dumps(meta)
-
-    _cxtgeo.grdcp3d_export_xtgeo_grid(
-        self._ncol,
-        self._nrow,
-        self._nlay,
-        self._coordsv,
-        self._zcornsv,
-        self._actnumsv,
-        jmeta,
-        gfile.get_cfhandle(),
-    )
-
-    gfile.cfclose()
+    props = self._props.props if self._props is not None else None
+    _grid_xtgeo_file.export_xtgeo(gfile, grid=self, props=props)
 
     logger.debug("Export to binary XTGEO... done")
@@ -0,0 +1,146 @@
+"""Cache for properties derived from grid geometry (dz, xyz, bulk volume, ...).
+
+The cache is opt-in per grid, see Grid.set_geometry_cache(). Results are kept
+until the grid geometry or actnum is changed, which is detected by a version
+token in ``grid._tmp``; that dictionary is replaced by all methods that change
+the grid. Results are evicted least recently used first if the memory budget is
+exceeded.
+
+The cached results are never given to the client directly; a copy is returned,
+so the client may modify it freely.
+"""
+
+from __future__ import print_function, absolute_import
+
+import copy
+from collections import OrderedDict
+
+import xtgeo
+
+xtg = xtgeo.common.XTGeoDialog()
+
+logger = xtg.functionlogger(__name__)
+
+DEFAULT_MAXBYTES = 1024 ** 3
+
+_VERSION = "geomversion"
+
+
+class GeometryCache(object):
+    """LRU cache with a memory budget, for results derived from grid geometry."""
+
+    def __init__(self, maxbytes=DEFAULT_MAXBYTES):
+        self._maxbytes = int(maxbytes)
+        self._entries = OrderedDict()  # key -> (result, nbytes)
+        self._nbytes = 0
+        self._version = None
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def __repr__(self):
+        return "{} (id={}) entries={}, nbytes={}, maxbytes={}".format(
+            self.__class__.__name__,
+            id(self),
+            len(self._entries),
+            self._nbytes,
+            self._maxbytes,
+        )
+
+    @property
+    def maxbytes(self):
+        """int: Memory budget in bytes (read only)."""
+        return self._maxbytes
+
+    @property
+    def stats(self):
+        """dict: Number of hits, misses, evictions and invalidations, and the
+        current number of entries and bytes in use (read only)."""
+        stats = dict(self._stats)
+        stats["entries"] = len(self._entries)
+        stats["nbytes"] = self._nbytes
+        stats["maxbytes"] = self._maxbytes
+        return stats
+
+    def clear(self):
+        """Remove all entries (statistics are kept)."""
+        self._entries.clear()
+        self._nbytes = 0
+
+    def get(self, key, version, compute):
+        """Return (a copy of) the result for key, made by compute() if needed.
+
+        Args:
+            key: Hashable key for the computation and its arguments
+            version: Token for the current geometry; all entries are discarded
+                if this differs from the version the entries were made for.
+            compute: Function without arguments, making the result.
+        """
+        if version is not self._version:
+            if self._entries:
+                logger.info("Grid is changed, invalidate geometry cache")
+                self._stats["invalidations"] += 1
+            self.clear()
+            self._version = version
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return _copy(self._entries[key][0])
+
+        self._stats["misses"] += 1
+        result = compute()
+
+        nbytes = _nbytes(result)
+        if nbytes <= self._maxbytes:
+            self._entries[key] = (result, nbytes)
+            self._nbytes += nbytes
+            self._evict()
+            return _copy(result)
+
+        logger.info("Result of %s bytes is larger than cache budget", nbytes)
+        return result
+
+    def _evict(self):
+        while self._nbytes > self._maxbytes and self._entries:
+            key, (_, nbytes) = self._entries.popitem(last=False)
+            logger.info("Evict %s from geometry cache", key)
+            self._nbytes -= nbytes
+            self._stats["evictions"] += 1
+
+
+def cached(self, func, **kwargs):
+    """Return func(self, **kwargs), using the geometry cache of the grid if any.
+
+    The number of threads (nthreads) does not change the result, and is not
+    part of the cache key.
+    """
+    if self._geomcache is None:
+        return func(self, **kwargs)
+
+    key = (
+        func.__name__,
+        repr(sorted(item for item in kwargs.items() if item[0] != "nthreads")),
+    )
+    version = self._tmp.setdefault(_VERSION, object())
+    return self._geomcache.get(key, version, lambda: func(self, **kwargs))
+
+
+def _nbytes(result):
+    """Approximate memory use of a result, in bytes."""
+    if isinstance(result, xtgeo.GridProperty):
+        return _nbytes(result.values)
+    if isinstance(result, xtgeo.GridProperties):
+        return sum(_nbytes(prop) for prop in result.props)
+    if isinstance(result, (tuple, list)):
+        return sum(_nbytes(item) for item in result)
+    nbytes = getattr(result, "nbytes", 0)
+    mask = getattr(result, "mask", None)
+    return nbytes + getattr(mask, "nbytes", 0)
+
+
+def _copy(result):
+    """Copy of a result, so the cached result cannot be changed by the client."""
+    if isinstance(result, (xtgeo.GridProperty, xtgeo.GridProperties)):
+        return result.copy()
+    if isinstance(result, tuple):
+        return tuple(_copy(item) for item in result)
+    return copy.deepcopy(result)
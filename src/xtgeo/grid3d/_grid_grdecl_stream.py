@@ -0,0 +1,157 @@
+"""Streaming reader for keywords in Eclipse GRDECL (ASCII) files.
+
+The file is memory mapped and traversed once. For each requested keyword the
+data (up to the terminating slash) is parsed in chunks of whole lines, where
+comments (``--``) are removed and repeat counts (``n*value``) are expanded, and
+the numbers are converted directly to numpy arrays.
+"""
+
+from __future__ import print_function, absolute_import
+
+import re
+import mmap
+
+import numpy as np
+
+import xtgeo
+
+xtg = xtgeo.common.XTGeoDialog()
+
+logger = xtg.functionlogger(__name__)
+
+CHUNKSIZE = 16 * 1024 * 1024  # approximate number of bytes parsed in one go
+
+_COMMENT = re.compile(rb"--[^\n]*")
+
+
+def read_grdecl_keywords(pfile, names, dtypes=None, chunksize=CHUNKSIZE):
+    """Read one or more keywords from a GRDECL ASCII file in one pass.
+
+    Args:
+        pfile (_XTGeoFile): Input file (or memory stream).
+        names (list): Keyword names to read. Only the first occurrence of each
+            keyword is read.
+        dtypes (dict): Numpy dtype per keyword name; default is float64. A dtype
+            of None returns the raw tokens as a list of str (no repeat expansion),
+            which is useful for e.g. SPECGRID.
+        chunksize (int): Approximate size in bytes of each parsed chunk.
+
+    Returns:
+        A dictionary with name -> 1D numpy array (values in file order) for the
+        keywords found. Keywords not found are not present in the dictionary.
+    """
+    dtypes = {} if dtypes is None else dtypes
+    wanted = list(dict.fromkeys(names))
+    if not wanted:
+        return {}
+
+    # keywords start a line (possibly after blanks), and shall match exactly; data
+    # may follow on the same line, e.g. "PORO 0.1 0.2 /"
+    pattern = re.compile(
+        rb"^[ \t]*("
+        + b"|".join(re.escape(name.encode()) for name in wanted)
+        + rb")(?=[ \t\r/]|--|$)",
+        re.M,
+    )
+
+    if pfile.memstream:
+        return _read_keywords(pfile.file.getvalue(), pattern, wanted, dtypes, chunksize)
+
+    with open(pfile.name, "rb") as fhandle:
+        try:
+            buf = mmap.mmap(fhandle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return {}
+        try:
+            return _read_keywords(buf, pattern, wanted, dtypes, chunksize)
+        finally:
+            buf.close()
+
+
+def _read_keywords(buf, pattern, wanted, dtypes, chunksize):
+    result = {}
+    pos = 0
+    while len(result) < len(wanted):
+        match = pattern.search(buf, pos)
+        if match is None:
+            break
+
+        name = match.group(1).decode()
+        start = match.end()
+        end = _find_terminator(buf, start)
+        pos = end + 1
+        if name in result:
+            continue
+
+        logger.info("Reading GRDECL keyword %s, bytes %s to %s", name, start, end)
+        dtype = dtypes.get(name, np.float64)
+        result[name] = _parse_data(buf, start, end, dtype, chunksize)
+
+    return result
+
+
+def _find_terminator(buf, pos):
+    """Return position of the slash ending the data record, ignoring comments."""
+    while True:
+        slash = buf.find(b"/", pos)
+        if slash == -1:
+            raise ValueError("GRDECL record is not terminated by a slash")
+        linestart = buf.rfind(b"\n", 0, slash) + 1
+        if buf.find(b"--", linestart, slash) == -1:
+            return slash
+        # the slash is inside a comment; continue on next line
+        pos = buf.find(b"\n", slash)
+        if pos == -1:
+            raise ValueError("GRDECL record is not terminated by a slash")
+
+
+def _parse_data(buf, start, end, dtype, chunksize):
+    """Parse the data between start and end, in chunks of whole lines."""
+
+    parts = []
+    tokens = []
+    pos = start
+    while pos < end:
+        stop = end
+        if pos + chunksize < end:
+            newline = buf.find(b"\n", pos + chunksize, end)
+            if newline != -1:
+                stop = newline + 1
+        chunk = buf[pos:stop]
+        pos = stop
+
+        if b"--" in chunk:
+            chunk = _COMMENT.sub(b"", chunk)
+
+        if dtype is None:
+            tokens.extend(token.decode() for token in chunk.split())
+        else:
+            parts.append(_parse_chunk(chunk, dtype))
+
+    if dtype is None:
+        return tokens
+
+    if not parts:
+        return np.zeros(0, dtype=dtype)
+    return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+def _parse_chunk(chunk, dtype):
+    """Convert a chunk of text to numbers, expanding repeat counts (n*value)."""
+
+    if b"*" not in chunk:
+        return np.array(chunk.split(), dtype=np.float64).astype(dtype, copy=False)
+
+    tokens = np.array(chunk.split())
+    counts, stars, values = np.char.partition(tokens, b"*").T
+
+    isrepeat = stars == b"*"
+    counts = np.where(isrepeat, counts, b"1").astype(np.int64)
+    values = np.where(isrepeat, values, tokens)
+
+    if np.any(values == b""):
+        # "n*" without a value means default values, which are not known here
+        raise ValueError("GRDECL repeat count without value (n*) is not supported")
+
+    values = values.astype(np.float64).astype(dtype, copy=False)
+    return np.repeat(values, counts)
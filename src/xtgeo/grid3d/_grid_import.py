@@ -18,7 +18,13 @@ logger = xtg.functionlogger(__name__)
 
 
 def from_file(
-    self, gfile, fformat=None, initprops=None, restartprops=None, restartdates=None,
+    self,
+    gfile,
+    fformat=None,
+    initprops=None,
+    restartprops=None,
+    restartdates=None,
+    workers=1,
 ):
     """Import grid geometry from file, and makes an instance of this class."""
 
@@ -44,7 +50,7 @@ def from_file(
 
     if fformat == "guess":
         logger.info("Format is <guess>")
-        fflist = ["egrid", "grdecl", "bgrdecl", "roff", "eclipserun"]
+        fflist = ["egrid", "grdecl", "bgrdecl", "roff", "eclipserun", "xtgeo"]
         if fext and fext in fflist:
             fformat = fext
         elif fext and fext not in fflist:
@@ -74,13 +80,13 @@ def from_file(
             initprops=initprops,
             restartprops=restartprops,
             restartdates=restartdates,
+            workers=workers,
         )
     elif fformat == "grdecl":
         _grid_import_ecl.import_ecl_grdecl(self, gfile)
     elif fformat == "bgrdecl":
         _grid_import_ecl.import_ecl_bgrdecl(self, gfile)
     elif fformat == "xtgeo":
-        # experimental
         _grid_import_xtgeo.import_xtgeo(self, gfile)
     else:
         raise SystemExit("Invalid file format")
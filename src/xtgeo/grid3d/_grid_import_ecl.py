@@ -4,9 +4,6 @@
 
 from __future__ import print_function, absolute_import
 
-import re
-import os
-from tempfile import mkstemp
 import numpy as np
 
 import xtgeo
@@ -15,6 +12,7 @@ import xtgeo.cxtgeo._cxtgeo as _cxtgeo
 from xtgeo.grid3d._grid_eclbin_record import eclbin_record
 
 from . import _grid3d_utils as utils
+from . import _grid_grdecl_stream as _grdecl
 
 xtg = xtgeo.XTGeoDialog()
 
@@ -119,7 +117,9 @@ def import_ecl_egrid(self, gfile):
 # Import eclipse run suite: EGRID + properties from INIT and UNRST
 # For the INIT and UNRST, props dates shall be selected
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def import_ecl_run(self, groot, initprops=None, restartprops=None, restartdates=None):
+def import_ecl_run(
+    self, groot, initprops=None, restartprops=None, restartdates=None, workers=1
+):
 
     ecl_grid = groot + ".EGRID"
     ecl_init = groot + ".INIT"
@@ -137,7 +137,12 @@ def import_ecl_run(self, groot, initprops=None, restartprops=None, restartdates=
     # import the init properties unless list is empty
     if initprops:
         grdprops.from_file(
-            ecl_init.name, names=initprops, fformat="init", dates=None, grid=self
+            ecl_init.name,
+            names=initprops,
+            fformat="init",
+            dates=None,
+            grid=self,
+            workers=workers,
         )
 
     # import the restart properties for dates unless lists are empty
@@ -148,6 +153,7 @@ def import_ecl_run(self, groot, initprops=None, restartprops=None, restartdates=
             fformat="unrst",
             dates=restartdates,
             grid=self,
+            workers=workers,
         )
 
     self.gridprops = grdprops
@@ -155,75 +161,91 @@ def import_ecl_run(self, groot, initprops=None, restartprops=None, restartdates=
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Import eclipse input .GRDECL
-# Uses a tmp file so not very efficient
+# Streams the keywords from a memory map in one pass, then converts to XTGeo format
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 def import_ecl_grdecl(self, gfile):
 
-    # make a temporary file
-    fds, tmpfile = mkstemp(prefix="tmpxtgeo")
-    os.close(fds)
-
-    with open(gfile.name) as oldfile, open(tmpfile, "w") as newfile:
-        for line in oldfile:
-            if not (re.search(r"^--", line) or re.search(r"^\s+$", line)):
-                newfile.write(line)
-
-    newfile.close()
-    oldfile.close()
-
-    # find ncol nrow nz
-    mylist = []
-    found = False
-    with open(tmpfile) as xfile:
-        for line in xfile:
-            if found:
-                logger.info(line)
-                mylist = line.split()
-                break
-            if re.search(r"^SPECGRID", line):
-                found = True
-
-    if not found:
+    dtypes = {"SPECGRID": None, "ACTNUM": np.int32}
+    records = _grdecl.read_grdecl_keywords(
+        gfile, ["SPECGRID", "MAPAXES", "COORD", "ZCORN", "ACTNUM"], dtypes=dtypes
+    )
+
+    if "SPECGRID" not in records:
         logger.error("SPECGRID not found. Nothing imported!")
         return
-    xfile.close()
 
-    self._ncol, self._nrow, self._nlay = int(mylist[0]), int(mylist[1]), int(mylist[2])
+    specgrid = records["SPECGRID"]
+    self._ncol, self._nrow, self._nlay = [int(val) for val in specgrid[0:3]]
 
     logger.info("NX NY NZ in grdecl file: %s %s %s", self._ncol, self._nrow, self._nlay)
 
-    ncoord, nzcorn, ntot = self.vectordimensions
+    for name in ("COORD", "ZCORN"):
+        if name not in records:
+            raise xtgeo.KeywordNotFoundError(
+                "Cannot find {} in file {}".format(name, gfile.name)
+            )
 
-    logger.info("Reading...")
+    ncoord, nzcorn, ntot = self.vectordimensions
+    ncol, nrow, nlay = self._ncol, self._nrow, self._nlay
+
+    logger.info("Converting...")
+
+    # COORD is the same in Eclipse and XTGeo format 1, except undefined values
+    coordsv = records["COORD"]
+    if coordsv.size != ncoord:
+        raise ValueError("Wrong length of COORD: {} vs {}".format(coordsv.size, ncoord))
+    coordsv[coordsv == 9999900.0] = -9999.99
+    if "MAPAXES" in records:
+        _apply_mapaxes(coordsv, records["MAPAXES"])
+    self._coordsv = coordsv
+
+    # ZCORN has 8 corners per cell, where XTGeo format 1 has 4 corners at top of each
+    # cell layer and at the base of the last layer (ignoring gaps between layers)
+    zcorn = records["ZCORN"]
+    if zcorn.size != 8 * ntot:
+        raise ValueError("Wrong length of ZCORN: {} vs {}".format(zcorn.size, 8 * ntot))
+    zcorn = zcorn.reshape(2 * nlay, nrow, 2, ncol, 2)
+    zcorn = zcorn[list(range(0, 2 * nlay, 2)) + [2 * nlay - 1]]
+    self._zcornsv = np.ascontiguousarray(zcorn.transpose(0, 1, 3, 2, 4)).ravel()
+    if self._zcornsv.size != nzcorn:
+        raise RuntimeError("Bug, wrong ZCORN length in conversion")
+
+    # ACTNUM has the same layout, and is all active if missing
+    actnumsv = records.get("ACTNUM", np.ones(ntot, dtype=np.int32))
+    if actnumsv.size != ntot:
+        raise ValueError("Wrong length of ACTNUM: {} vs {}".format(actnumsv.size, ntot))
+    self._actnumsv = actnumsv
+
+    logger.info("Number of active cells: %s", np.count_nonzero(actnumsv == 1))
+    self._subgrids = None
+    self._xtgformat = 1
 
-    self._coordsv = np.zeros(ncoord, dtype=np.float64)
-    self._zcornsv = np.zeros(nzcorn, dtype=np.float64)
-    self._actnumsv = np.zeros(ntot, dtype=np.int32)
 
-    ptr_num_act = _cxtgeo.new_intpointer()
+def _apply_mapaxes(coordsv, mapaxes):
+    """Transform COORD x, y in place from MAPAXES (cf. x_mapaxes in cxtgeo)."""
 
-    cfhandle = gfile.get_cfhandle()
+    x1, y1, x2, y2, x3, y3 = mapaxes[0:6].tolist()
 
-    _cxtgeo.grd3d_import_grdecl(
-        cfhandle,
-        self._ncol,
-        self._nrow,
-        self._nlay,
-        self._coordsv,
-        self._zcornsv,
-        self._actnumsv,
-        ptr_num_act,
-    )
+    if np.allclose(mapaxes[0:6], 0.0, atol=1.0e-05, rtol=0.0):
+        logger.warning("All MAPAXES numbers ~zero; dubious settings")
+        return
 
-    # close and remove tmpfile
-    gfile.cfclose()
-    os.remove(tmpfile)
+    xx1, yy1 = x1 - x2, y1 - y2
+    xx3, yy3 = x3 - x2, y3 - y2
+    div1 = np.hypot(xx3, yy3)
+    div2 = np.hypot(xx1, yy1)
+    if div1 < 1.0e-05 or div2 < 1.0e-05:
+        logger.warning("Divisor wrt MAPAXES is ~zero")
+        return
 
-    nact = _cxtgeo.intpointer_value(ptr_num_act)
+    xx3, yy3 = xx3 / div1, yy3 / div1
+    xx1, yy1 = xx1 / div2, yy1 / div2
 
-    logger.info("Number of active cells: %s", nact)
-    self._subgrids = None
-    self._xtgformat = 1
+    xyz = coordsv.reshape(-1, 3)
+    xval = xyz[:, 0].copy()
+    yval = xyz[:, 1].copy()
+    xyz[:, 0] = x2 + xval * xx3 + yval * xx1
+    xyz[:, 1] = y2 + xval * yy3 + yval * yy1
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -1,5 +1,5 @@
 # coding: utf-8
-"""Private module, Grid Import private functions for ROFF format"""
+"""Private module, Grid Import private functions for the native xtgeo format"""
 
 from __future__ import print_function, absolute_import
 
@@ -10,6 +10,7 @@ import numpy as np
 
 import xtgeo.cxtgeo._cxtgeo as _cxtgeo
 import xtgeo
+from xtgeo.grid3d import _grid_xtgeo_file
 
 xtg = xtgeo.common.XTGeoDialog()
 
@@ -17,7 +18,16 @@ logger = xtg.functionlogger(__name__)
 
 
 def import_xtgeo(self, gfile):
-    """Import xtgeo format (in prep)"""
+    """Import native xtgeo format, the geometry only."""
+
+    if _grid_xtgeo_file.is_xtgeo_file(gfile):
+        _grid_xtgeo_file.XTGeoGridFile(gfile.file).load_grid(self)
+    else:
+        _import_xtgeo_v1(self, gfile)
+
+
+def _import_xtgeo_v1(self, gfile):
+    """Import the first (C based) version of the xtgeo format."""
 
     fhandle = gfile.get_cfhandle()
 
@@ -0,0 +1,293 @@
+"""Streaming writer for ROFF binary files, with a grid and/or grid properties.
+
+All records are written through one open file handle with a large buffer. The
+big arrays (corner lines, z values, active cells and property values) are
+converted to the ROFF layout (layers counted from the bottom, 32 bit values) for
+a range of grid columns at a time and written directly from numpy, so the
+memory use does not grow with the grid size, and no C arrays or conversion of
+property values to xtgeo format 1 are needed.
+
+Properties may be appended to an existing ROFF binary file. Then only the
+header (for the dimensions) and the final eof tag are read; the file is not
+scanned.
+"""
+
+from __future__ import print_function, absolute_import
+
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+import xtgeo
+from . import _gridprop_compressed
+
+xtg = xtgeo.common.XTGeoDialog()
+
+logger = xtg.functionlogger(__name__)
+
+BUFFERSIZE = 16 * 1024 * 1024  # bytes, the file buffer
+CHUNKCELLS = 4 * 1024 * 1024  # approximate number of cells (or nodes) per write
+
+UNDEF = -999  # undefined (masked) values, as for the C based export
+FLOATEPS = 1.0e-05  # z values for a node are not split if within this limit
+SCALE = (1.0, 1.0, -1.0)
+
+_EOF = b"tag\0eof\0endtag\0"
+_HEADERSIZE = 1024  # the header with dimensions is well within this size
+
+_DTYPES = {"int": np.int32, "float": np.float32, "bool": np.int8, "byte": np.uint8}
+
+
+def export_roff(
+    pfile, grid=None, props=None, names=None, append=False, buffersize=BUFFERSIZE
+):
+    """Write a grid and/or grid properties to one ROFF binary file.
+
+    Args:
+        pfile (_XTGeoFile): Output file (or memory stream).
+        grid (Grid): The grid geometry, or None to write properties only.
+        props (list): GridProperty instances to write, may be empty.
+        names (list): Names to use for the properties, default is their names.
+        append (bool): If True, the properties are appended to an existing ROFF
+            binary file, which must have the same dimensions.
+        buffersize (int): Size of the file buffer, in bytes.
+    """
+    props = list(props) if props else []
+    names = list(names) if names else [prop.name for prop in props]
+
+    if grid is not None:
+        dims = grid.dimensions
+    elif props:
+        dims = props[0].dimensions
+    else:
+        raise ValueError("Nothing to export, give a grid and/or properties")
+
+    for prop in props:
+        if prop.dimensions != dims:
+            raise ValueError(
+                "Property {} has other dimensions than {}".format(prop.name, dims)
+            )
+
+    if append and grid is not None:
+        raise ValueError("Cannot append a grid to a ROFF file, only properties")
+
+    with _open(pfile, append, dims, buffersize) as fhandle:
+        if not append:
+            _write_header(fhandle, "grid" if grid is not None else "parameter", dims)
+        if grid is not None:
+            _write_grid(fhandle, grid)
+        for prop, name in zip(props, names):
+            logger.info("Write property %s", name)
+            _write_property(fhandle, prop, name)
+        fhandle.write(_EOF)
+
+
+@contextmanager
+def _open(pfile, append, dims, buffersize):
+    """Open (or position) the file; for append at the eof tag, which is replaced."""
+
+    if pfile.memstream:
+        fhandle = pfile.file
+        if append:
+            _seek_eof(fhandle, dims)
+        yield fhandle
+        return
+
+    with open(pfile.name, "r+b" if append else "wb", buffering=buffersize) as fhandle:
+        if append:
+            _seek_eof(fhandle, dims)
+        yield fhandle
+        if append:
+            fhandle.truncate()
+
+
+def _seek_eof(fhandle, dims):
+    """Check the header and the end of a ROFF binary file, and go to the eof tag."""
+
+    fhandle.seek(0)
+    header = fhandle.read(_HEADERSIZE)
+    if not header.startswith(b"roff-bin\0"):
+        raise ValueError("Can only append to a ROFF binary file")
+
+    if _header_value(header, b"int\0byteswaptest\0") != 1:
+        raise ValueError("Cannot append to a ROFF file with other byte order")
+
+    fdims = tuple(
+        _header_value(header, b"int\0" + name + b"\0") for name in (b"nX", b"nY", b"nZ")
+    )
+    if fdims != tuple(dims):
+        raise ValueError(
+            "ROFF file dimensions {} differ from {}".format(fdims, tuple(dims))
+        )
+
+    fhandle.seek(-len(_EOF), os.SEEK_END)
+    if fhandle.read(len(_EOF)) != _EOF:
+        raise ValueError("The ROFF file does not end with an eof tag")
+    fhandle.seek(-len(_EOF), os.SEEK_END)
+
+
+def _header_value(header, key):
+    pos = header.find(key)
+    if pos < 0:
+        raise ValueError("Cannot find {} in ROFF header".format(key))
+    value = np.frombuffer(header, dtype=np.int32, count=1, offset=pos + len(key))
+    return int(value[0])
+
+
+def _words(*words):
+    """Return words as zero terminated strings."""
+    return b"".join(str(word).encode() + b"\0" for word in words)
+
+
+def _write_value(fhandle, kind, name, value):
+    fhandle.write(_words(kind, name))
+    fhandle.write(np.array(value, dtype=_DTYPES[kind]).tobytes())
+
+
+def _write_array(fhandle, kind, name, count):
+    """Write the start of an array, the data must follow."""
+    fhandle.write(_words("array", kind, name))
+    fhandle.write(np.int32(count).tobytes())
+
+
+def _write_data(fhandle, values):
+    fhandle.write(np.ascontiguousarray(values).reshape(-1).data)
+
+
+def _column_ranges(ncol, percolumn):
+    """Yield (i0, i1) column ranges with about CHUNKCELLS values each."""
+    step = max(1, CHUNKCELLS // max(1, percolumn))
+    for i0 in range(0, ncol, step):
+        yield i0, min(i0 + step, ncol)
+
+
+def _write_header(fhandle, filetype, dims):
+    info = "#" + xtg.get_xtgeo_info() + "#"
+    fhandle.write(_words("roff-bin", "#ROFF file#", info, "tag", "filedata"))
+    _write_value(fhandle, "int", "byteswaptest", 1)
+    fhandle.write(_words("char", "filetype", filetype))
+    fhandle.write(_words("char", "creationDate", time.ctime()))
+    fhandle.write(_words("endtag", "tag", "version"))
+    _write_value(fhandle, "int", "major", 2)
+    _write_value(fhandle, "int", "minor", 0)
+    fhandle.write(_words("endtag", "tag", "dimensions"))
+    for name, value in zip(("nX", "nY", "nZ"), dims):
+        _write_value(fhandle, "int", name, value)
+    fhandle.write(_words("endtag"))
+
+
+def _write_grid(fhandle, grid):
+    """Write the grid geometry, as grdcp3d_export_roff_grid() in C."""
+
+    grid._xtgformat2()
+    ncol, nrow, nlay = grid.dimensions
+    coordsv = grid._coordsv
+    zcornsv = grid._zcornsv
+
+    midi, midj, midk = (ncol // 2, nrow // 2, nlay // 2)
+    offset = (
+        float(coordsv[midi, midj, 0]),
+        float(coordsv[midi, midj, 1]),
+        float(zcornsv[midi, midj, midk, 0]),
+    )
+
+    fhandle.write(_words("tag", "translate"))
+    for name, value in zip(("xoffset", "yoffset", "zoffset"), offset):
+        _write_value(fhandle, "float", name, value)
+    fhandle.write(_words("endtag", "tag", "scale"))
+    for name, value in zip(("xscale", "yscale", "zscale"), SCALE):
+        _write_value(fhandle, "float", name, value)
+    fhandle.write(_words("endtag"))
+
+    subs = grid.get_subgrids()
+    if subs and len(subs) > 1:
+        fhandle.write(_words("tag", "subgrids"))
+        _write_array(fhandle, "int", "nLayers", len(subs))
+        _write_data(fhandle, np.array(list(subs.values()), dtype=np.int32))
+        fhandle.write(_words("endtag"))
+
+    # corner lines; bottom then top point for each pillar
+    fhandle.write(_words("tag", "cornerLines"))
+    _write_array(fhandle, "float", "data", (ncol + 1) * (nrow + 1) * 6)
+    for i0, i1 in _column_ranges(ncol + 1, (nrow + 1) * 6):
+        pillars = coordsv[i0:i1].reshape(i1 - i0, nrow + 1, 2, 3)[:, :, ::-1, :]
+        values = pillars / np.array(SCALE) - np.array(offset)
+        _write_data(fhandle, values.astype(np.float32))
+    fhandle.write(_words("endtag"))
+
+    # z values; one value for nodes where the 4 corners are equal, else 4
+    fhandle.write(_words("tag", "zvalues"))
+    _write_array(fhandle, "byte", "splitEnz", (ncol + 1) * (nrow + 1) * (nlay + 1))
+    splits = []
+    nzvalues = 0
+    for i0, i1 in _column_ranges(ncol + 1, (nrow + 1) * (nlay + 1) * 4):
+        split = _split_nodes(zcornsv[i0:i1, :, ::-1], i0 == 0, i1 == ncol + 1)
+        nzvalues += split.size + 3 * int(np.count_nonzero(split == 4))
+        _write_data(fhandle, split)
+        splits.append(split)
+
+    _write_array(fhandle, "float", "data", nzvalues)
+    i0 = 0
+    for split in splits:
+        i1 = i0 + split.shape[0]
+        znodes = zcornsv[i0:i1, :, ::-1] / np.float32(SCALE[2])
+        keep = np.ones(znodes.shape, dtype=bool)
+        keep[..., 1:] = (split == 4)[..., np.newaxis]
+        _write_data(fhandle, (znodes[keep] - np.float64(offset[2])).astype(np.float32))
+        i0 = i1
+    del splits
+    fhandle.write(_words("endtag"))
+
+    fhandle.write(_words("tag", "active"))
+    _write_array(fhandle, "bool", "data", ncol * nrow * nlay)
+    for i0, i1 in _column_ranges(ncol, nrow * nlay):
+        _write_data(fhandle, grid._actnumsv[i0:i1, :, ::-1].astype(np.int8))
+    fhandle.write(_words("endtag"))
+
+
+def _split_nodes(znodes, first, last):
+    """Return the split (1 or 4) for the nodes in a range of columns.
+
+    The nodes on the grid edges are always split (first and last tell if the range
+    includes the first and last column of nodes).
+    """
+    zavg = 0.25 * znodes[..., 0]
+    for inode in range(1, 4):
+        zavg += 0.25 * znodes[..., inode]
+
+    diff = np.abs(znodes - zavg[..., np.newaxis]) > FLOATEPS
+    split = np.where(diff.any(axis=-1), 4, 1).astype(np.uint8)
+
+    if first:
+        split[0] = 4
+    if last:
+        split[-1] = 4
+    split[:, 0] = 4
+    split[:, -1] = 4
+    return split
+
+
+def _write_property(fhandle, prop, name):
+    """Write a property, as grd3d_export_roff_prop() in C."""
+
+    ncol, nrow, nlay = prop.dimensions
+    fhandle.write(_words("tag", "parameter", "char", "name", name))
+
+    if prop.isdiscrete:
+        codes = sorted(code for code in prop.codes if code is not None)
+        if codes:
+            _write_array(fhandle, "char", "codeNames", len(codes))
+            fhandle.write(_words(*[prop.codes[code] for code in codes]))
+            _write_array(fhandle, "int", "codeValues", len(codes))
+            _write_data(fhandle, np.array(codes, dtype=np.int32))
+        kind = "int"
+    else:
+        kind = "float"
+
+    _write_array(fhandle, kind, "data", ncol * nrow * nlay)
+    for i0, i1 in _column_ranges(ncol, nrow * nlay):
+        values = _gridprop_compressed.column_values(prop, i0, i1, UNDEF, _DTYPES[kind])
+        _write_data(fhandle, values[:, :, ::-1])
+    fhandle.write(_words("endtag"))
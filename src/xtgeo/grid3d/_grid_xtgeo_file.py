@@ -0,0 +1,602 @@
+"""Native binary xtgeo container for a grid with properties.
+
+File layout (all numbers are little endian)::
+
+    preamble   64 bytes: magic, format version, flags, index offset, index
+               size and index CRC32
+    chunks     the array data, each chunk starting on a 64 byte boundary
+    index      JSON with dimensions, subgrids, property metadata (name, date,
+               codes, ...) and, for each array, dtype, shape and the list of
+               chunks with offset, size, layer range, compression and CRC32
+
+Arrays with a layer axis (ZCORN, ACTNUM and the properties) are split in chunks
+of whole layers, so a range of layers (or one property) is read from a memory
+map without touching the rest of the file. Each chunk is optionally compressed
+(zlib); a chunk is stored uncompressed if compression does not make it smaller.
+The CRC32 is for the uncompressed data.
+
+The geometry is kept in xtgformat 2, as stored in the Grid, and the properties
+with their own dtype, where masked cells have the UNDEF values. Hence a full
+model is read with a plain copy (or decompression) per chunk.
+"""
+
+from __future__ import print_function, absolute_import
+
+import json
+import mmap
+import struct
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+import xtgeo
+from . import _gridprop_compressed
+
+xtg = xtgeo.common.XTGeoDialog()
+
+logger = xtg.functionlogger(__name__)
+
+MAGIC = b"XTGEOGRD"
+VERSION = 2  # version 1 was the C based format; readers refuse newer versions
+FORMATNAME = "xtgeo-grid"
+
+BUFFERSIZE = 16 * 1024 * 1024  # bytes, the file buffer when writing
+CHUNKBYTES = 64 * 1024 * 1024  # approximate (uncompressed) size of each chunk
+
+COMPRESSIONS = (None, "zlib")
+
+_PREAMBLE = struct.Struct("<8sIIQQI")
+_ALIGN = 64
+
+
+# ======================================================================================
+# Export
+# ======================================================================================
+
+
+def export_xtgeo(pfile, grid=None, props=None, compression=None, chunkbytes=CHUNKBYTES):
+    """Write a grid and/or grid properties to a native xtgeo file.
+
+    Args:
+        pfile (_XTGeoFile): Output file (or memory stream).
+        grid (Grid): The grid geometry, or None to write properties only.
+        props (list): GridProperty instances to write, may be empty.
+        compression (str): None or "zlib", used per chunk.
+        chunkbytes (int): Approximate size of each chunk, in bytes.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            "Invalid compression {}, use one of {}".format(compression, COMPRESSIONS)
+        )
+
+    props = list(props) if props else []
+    if grid is not None:
+        dims = grid.dimensions
+    elif props:
+        dims = props[0].dimensions
+    else:
+        raise ValueError("Nothing to export, give a grid and/or properties")
+
+    for prop in props:
+        if prop.dimensions != dims:
+            raise ValueError(
+                "Property {} has other dimensions than {}".format(prop.name, dims)
+            )
+
+    index = OrderedDict()
+    index["format"] = FORMATNAME
+    index["version"] = VERSION
+    index["creator"] = xtg.get_xtgeo_info()
+    index["dimensions"] = list(dims)
+    index["grid"] = None
+    index["properties"] = []
+    index["arrays"] = OrderedDict()
+
+    with _open_write(pfile) as fhandle:
+        writer = _ChunkWriter(fhandle, index["arrays"], compression, chunkbytes)
+
+        if grid is not None:
+            index["grid"] = _write_grid(writer, grid)
+
+        for num, prop in enumerate(props):
+            logger.info("Write property %s", prop.name)
+            index["properties"].append(_write_property(writer, prop, num))
+
+        jindex = json.dumps(index).encode()
+        offset = writer.align()
+        fhandle.write(jindex)
+
+        fhandle.seek(0)
+        fhandle.write(
+            _PREAMBLE.pack(MAGIC, VERSION, 0, offset, len(jindex), zlib.crc32(jindex))
+        )
+
+
+@contextmanager
+def _open_write(pfile):
+    if pfile.memstream:
+        fhandle = pfile.file
+        fhandle.seek(0)
+        fhandle.truncate()
+        fhandle.write(bytes(_ALIGN))
+        yield fhandle
+        fhandle.seek(0, 2)
+        return
+
+    with open(pfile.name, "wb", buffering=BUFFERSIZE) as fhandle:
+        fhandle.write(bytes(_ALIGN))
+        yield fhandle
+
+
+class _ChunkWriter(object):
+    """Write arrays as chunks of layers, and record them in the index."""
+
+    def __init__(self, fhandle, arrays, compression, chunkbytes):
+        self._fhandle = fhandle
+        self._pos = _ALIGN
+        self._arrays = arrays
+        self._compression = compression
+        self._chunkbytes = chunkbytes
+
+    def align(self):
+        """Pad to the next aligned position and return it."""
+        npad = -self._pos % _ALIGN
+        if npad:
+            self._fhandle.write(bytes(npad))
+            self._pos += npad
+        return self._pos
+
+    def write(self, name, shape, dtype, getchunk, axis=None):
+        """Write an array; getchunk(k0, k1) returns the data for layers k0 to k1.
+
+        If axis is None the array is written as one chunk.
+        """
+        dtype = np.dtype(dtype).newbyteorder("<")
+        entry = OrderedDict()
+        entry["dtype"] = dtype.str
+        entry["shape"] = list(shape)
+        entry["axis"] = axis
+        entry["chunks"] = []
+
+        if axis is None:
+            ranges = [(0, shape[0])]
+        else:
+            layerbytes = dtype.itemsize * int(np.prod(shape)) // max(1, shape[axis])
+            step = max(1, self._chunkbytes // max(1, layerbytes))
+            ranges = [
+                (k0, min(k0 + step, shape[axis])) for k0 in range(0, shape[axis], step)
+            ]
+
+        for k0, k1 in ranges:
+            data = np.ascontiguousarray(getchunk(k0, k1), dtype=dtype)
+            raw = data.reshape(-1).data.cast("B")
+            crc = zlib.crc32(raw)
+            codec = None
+            if self._compression == "zlib":
+                compressed = zlib.compress(raw, 1)
+                if len(compressed) < raw.nbytes:
+                    raw = compressed
+                    codec = "zlib"
+
+            offset = self.align()
+            self._fhandle.write(raw)
+            nbytes = len(raw) if codec else raw.nbytes
+            self._pos += nbytes
+            entry["chunks"].append([offset, nbytes, k0, k1, codec, crc])
+
+        self._arrays[name] = entry
+
+
+def _write_grid(writer, grid):
+    """Write the grid geometry, return the grid metadata."""
+
+    grid._xtgformat2()
+    ncol, nrow, nlay = grid.dimensions
+    coordsv = grid._coordsv
+    zcornsv = grid._zcornsv
+    actnumsv = grid._actnumsv
+
+    writer.write("coordsv", coordsv.shape, np.float64, lambda k0, k1: coordsv[k0:k1])
+    writer.write(
+        "zcornsv",
+        (ncol + 1, nrow + 1, nlay + 1, 4),
+        np.float32,
+        lambda k0, k1: zcornsv[:, :, k0:k1, :],
+        axis=2,
+    )
+    writer.write(
+        "actnumsv",
+        (ncol, nrow, nlay),
+        np.int32,
+        lambda k0, k1: actnumsv[:, :, k0:k1],
+        axis=2,
+    )
+
+    meta = OrderedDict()
+    meta["name"] = grid.name
+    meta["subgrids"] = grid.get_subgrids()
+    meta["dualporo"] = bool(grid.dualporo)
+    meta["dualperm"] = bool(grid.dualperm)
+    return meta
+
+
+def _write_property(writer, prop, num):
+    """Write a property, return the property metadata."""
+
+    dtype = prop.dtype
+    if prop.isdiscrete:
+        dtype = np.result_type(dtype, np.int32)  # room for UNDEF_INT
+        undef = xtgeo.UNDEF_INT
+    else:
+        undef = xtgeo.UNDEF
+
+    cache = {}
+
+    def _layers(k0, k1):
+        values = _gridprop_compressed.layer_values(prop, k0, k1, cache)
+        return np.ma.filled(values.astype(dtype), undef)
+
+    arrayname = "property_{}".format(num)
+    writer.write(arrayname, prop.dimensions, dtype, _layers, axis=2)
+
+    meta = OrderedDict()
+    meta["name"] = prop.name
+    meta["array"] = arrayname
+    meta["discrete"] = bool(prop.isdiscrete)
+    meta["date"] = int(prop.date) if prop.date else None
+    meta["codes"] = (
+        [[int(code), str(cname)] for code, cname in prop.codes.items()]
+        if prop.isdiscrete
+        else None
+    )
+    return meta
+
+
+# ======================================================================================
+# Import
+# ======================================================================================
+
+
+def is_xtgeo_file(pfile):
+    """Return True if the file (_XTGeoFile) is a native xtgeo container."""
+    if pfile.memstream:
+        return pfile.file.getvalue()[: len(MAGIC)] == MAGIC
+    with open(pfile.name, "rb") as fhandle:
+        return fhandle.read(len(MAGIC)) == MAGIC
+
+
+class XTGeoGridFile(object):
+    """Reader for the native xtgeo grid container (``fformat="xtgeo"``).
+
+    The file holds a grid geometry and/or grid properties (with dates and codes),
+    stored in chunks of layers. The index is read when the instance is made, while
+    the data are read from a memory map on request, so a single property or a
+    range of layers is read without reading the rest of the file.
+
+    The files are written by :meth:`Grid.to_file` or
+    :meth:`GridProperties.to_file` with ``fformat="xtgeo"``.
+
+    Example::
+
+        grd.to_file("reek.xtgeo", fformat="xtgeo")  # incl. grd.gridprops
+        xfile = XTGeoGridFile("reek.xtgeo")
+        print(xfile.names)
+        top = xfile.get_grid(layers=(0, 5))
+        poro = xfile.get_property("PORO", layers=(0, 5))
+
+    .. versionadded:: 2.14
+    """
+
+    def __init__(self, pfile):
+        """Open the file and read the index.
+
+        Args:
+            pfile (str or Path or BytesIO): The xtgeo file.
+
+        Raises:
+            ValueError: Not a valid xtgeo file, or made by a newer version.
+        """
+        self._pfile = xtgeo._XTGeoFile(pfile, mode="rb")
+        if not self._pfile.memstream:
+            self._pfile.check_file(raiseerror=OSError)
+
+        with self._buffer() as buf:
+            self._index = _read_index(buf)
+
+        self._props = OrderedDict(
+            (meta["name"], meta) for meta in self._index["properties"]
+        )
+
+    def __repr__(self):
+        return "{} (id={}) file={}, dimensions={}".format(
+            self.__class__.__name__, id(self), self._pfile.name, self.dimensions
+        )
+
+    @property
+    def version(self):
+        """int: The version of the container format (read only)."""
+        return self._index["version"]
+
+    @property
+    def dimensions(self):
+        """3-tuple: The grid dimensions (read only)."""
+        return tuple(self._index["dimensions"])
+
+    @property
+    def has_grid(self):
+        """bool: True if the file has a grid geometry (read only)."""
+        return self._index["grid"] is not None
+
+    @property
+    def names(self):
+        """list: Names of the properties in the file (read only)."""
+        return list(self._props)
+
+    @property
+    def dates(self):
+        """list: Sorted unique dates of the properties, if any (read only)."""
+        return sorted(
+            set(meta["date"] for meta in self._props.values() if meta["date"])
+        )
+
+    @contextmanager
+    def _buffer(self):
+        """Yield a memoryview of the file (memory map) or memory stream."""
+        if self._pfile.memstream:
+            buf = self._pfile.file.getbuffer()
+            try:
+                yield buf
+            finally:
+                buf.release()
+            return
+
+        with open(self._pfile.name, "rb") as fhandle:
+            mapped = mmap.mmap(fhandle.fileno(), 0, access=mmap.ACCESS_READ)
+            buf = memoryview(mapped)
+            try:
+                yield buf
+            finally:
+                buf.release()
+                mapped.close()
+
+    def _layers(self, layers):
+        nlay = self.dimensions[2]
+        if layers is None:
+            return 0, nlay
+        k0, k1 = int(layers[0]), int(layers[1])
+        if not 0 <= k0 < k1 <= nlay:
+            raise ValueError("Invalid layer range {} for nlay {}".format(layers, nlay))
+        return k0, k1
+
+    def _read(self, buf, name, start=None, stop=None, verify=False):
+        """Read an array, or the range start to stop along the chunk axis."""
+
+        entry = self._index["arrays"][name]
+        dtype = np.dtype(entry["dtype"])
+        shape = list(entry["shape"])
+        axis = entry["axis"]
+
+        if axis is None:
+            start, stop = 0, shape[0]
+            axis = 0
+        else:
+            start = 0 if start is None else start
+            stop = shape[axis] if stop is None else stop
+
+        outshape = list(shape)
+        outshape[axis] = stop - start
+        result = np.empty(outshape, dtype=dtype.newbyteorder("="))
+
+        for offset, nbytes, k0, k1, codec, crc in entry["chunks"]:
+            if k1 <= start or k0 >= stop:
+                continue
+            raw = chunk = None
+            try:
+                raw = buf[offset : offset + nbytes]
+                if codec == "zlib":
+                    raw = zlib.decompress(raw)
+                elif codec is not None:
+                    raise ValueError("Unknown compression {}".format(codec))
+                if verify and zlib.crc32(raw) != crc:
+                    raise ValueError("Checksum error in layers {}-{}".format(k0, k1))
+
+                chunkshape = list(shape)
+                chunkshape[axis] = k1 - k0
+                chunk = np.frombuffer(raw, dtype=dtype).reshape(chunkshape)
+
+                c0, c1 = max(k0, start), min(k1, stop)
+                source = [slice(None)] * len(shape)
+                source[axis] = slice(c0 - k0, c1 - k0)
+                target = [slice(None)] * len(shape)
+                target[axis] = slice(c0 - start, c1 - start)
+                result[tuple(target)] = chunk[tuple(source)]
+            except (ValueError, zlib.error) as err:
+                raw = chunk = None  # no views of the buffer kept by the traceback
+                raise ValueError("Cannot read {}: {}".format(name, err))
+            raw = chunk = None
+
+        return result
+
+    def verify(self):
+        """Check the checksums of all chunks, raise ValueError on errors."""
+        with self._buffer() as buf:
+            for name in self._index["arrays"]:
+                self._read(buf, name, verify=True)
+
+    def load_grid(self, grid, layers=None, verify=False):
+        """Read the geometry into an existing Grid instance.
+
+        Args:
+            grid (Grid): The grid instance to update.
+            layers (tuple): Zero based, half open, range of layers, default all.
+            verify (bool): If True, the checksums are verified.
+        """
+        if not self.has_grid:
+            raise ValueError("No grid geometry in {}".format(self._pfile.name))
+
+        k0, k1 = self._layers(layers)
+        ncol, nrow, _ = self.dimensions
+        with self._buffer() as buf:
+            coordsv = self._read(buf, "coordsv", verify=verify)
+            zcornsv = self._read(buf, "zcornsv", k0, k1 + 1, verify=verify)
+            actnumsv = self._read(buf, "actnumsv", k0, k1, verify=verify)
+
+        meta = self._index["grid"]
+        grid._ncol, grid._nrow, grid._nlay = ncol, nrow, k1 - k0
+        grid._xtgformat = 2
+        grid._coordsv = coordsv
+        grid._zcornsv = zcornsv
+        grid._actnumsv = actnumsv
+        grid._subgrids = None
+        grid._dualporo = meta["dualporo"]
+        grid._dualperm = meta["dualperm"]
+        grid._tmp = {}
+        if meta["subgrids"] and (k0, k1) == (0, self.dimensions[2]):
+            grid.set_subgrids(OrderedDict(meta["subgrids"]))
+        return grid
+
+    def get_grid(self, layers=None, verify=False):
+        """Return the grid geometry, optionally for a range of layers.
+
+        Args:
+            layers (tuple): Zero based, half open, range of layers, default all.
+            verify (bool): If True, the checksums are verified.
+        """
+        grid = xtgeo.Grid()
+        self.load_grid(grid, layers=layers, verify=verify)
+        grid.name = self._index["grid"]["name"]
+        return grid
+
+    def _find(self, name, date=None):
+        for meta in self._props.values():
+            if meta["name"] == name and (date is None or meta["date"] == date):
+                return meta
+        raise xtgeo.KeywordNotFoundError(
+            "Cannot find property {} (date {}) in {}".format(
+                name, date, self._pfile.name
+            )
+        )
+
+    def load_property(
+        self, prop, name, date=None, layers=None, values=True, verify=False
+    ):
+        """Read a property into an existing GridProperty instance.
+
+        Args:
+            prop (GridProperty): The property instance to update.
+            name (str): Name of property.
+            date (int): Date of property, if several properties have the name.
+            layers (tuple): Zero based, half open, range of layers, default all.
+            values (bool): If False, only metadata are read, and the values are
+                read on first access.
+            verify (bool): If True, the checksums are verified.
+        """
+        meta = self._find(name, date=date)
+        k0, k1 = self._layers(layers)
+        ncol, nrow, _ = self.dimensions
+
+        prop._ncol, prop._nrow, prop._nlay = ncol, nrow, k1 - k0
+        prop._name = meta["name"]
+        prop._date = meta["date"]
+        prop._isdiscrete = meta["discrete"]
+        if meta["discrete"]:
+            prop._codes = OrderedDict((code, cname) for code, cname in meta["codes"])
+        else:
+            prop._codes = {}
+        prop._ncodes = len(prop._codes)
+        prop._dtype = np.dtype(self._index["arrays"][meta["array"]]["dtype"]).name
+        prop._valuesource = {
+            "fformat": "xtgeo",
+            "file": self._pfile.file,
+            "name": meta["name"],
+            "date": meta["date"],
+            "layers": (k0, k1),
+        }
+
+        if not values:
+            prop._valuesv = None
+            prop._isloaded = False
+            return prop
+
+        prop._values = self.get_values(name, date=date, layers=layers, verify=verify)
+        prop._isloaded = True
+        return prop
+
+    def get_values(self, name, date=None, layers=None, verify=False):
+        """Return the values of a property as a masked 3D array, without metadata.
+
+        Args:
+            name (str): Name of property.
+            date (int): Date of property, if several properties have the name.
+            layers (tuple): Zero based, half open, range of layers, default all.
+            verify (bool): If True, the checksums are verified.
+        """
+        meta = self._find(name, date=date)
+        k0, k1 = self._layers(layers)
+
+        with self._buffer() as buf:
+            raw = self._read(buf, meta["array"], k0, k1, verify=verify)
+
+        limit = xtgeo.UNDEF_INT_LIMIT if meta["discrete"] else xtgeo.UNDEF_LIMIT
+        return np.ma.masked_greater(raw, limit)
+
+    def get_property(self, name, date=None, layers=None, verify=False):
+        """Return a property as a GridProperty, optionally for a range of layers.
+
+        Args:
+            name (str): Name of property.
+            date (int): Date of property, if several properties have the name.
+            layers (tuple): Zero based, half open, range of layers, default all.
+            verify (bool): If True, the checksums are verified.
+        """
+        prop = xtgeo.GridProperty()
+        return self.load_property(prop, name, date=date, layers=layers, verify=verify)
+
+    def select(self, names=None, dates=None):
+        """Return (name, date) for properties matching names and dates.
+
+        Args:
+            names (list or str): Property names, None or "all" for all.
+            dates (list or str): Dates, None or "all" for all.
+        """
+        names = None if names in (None, "all") else set(names)
+        dates = None if dates in (None, "all") else set(int(dt) for dt in dates)
+        return [
+            (meta["name"], meta["date"])
+            for meta in self._props.values()
+            if (names is None or meta["name"] in names)
+            and (dates is None or meta["date"] in dates)
+        ]
+
+
+def _read_index(buf):
+    """Return the index (dict) from the file buffer."""
+    if len(buf) < _PREAMBLE.size or bytes(buf[: len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a native xtgeo grid file")
+
+    _, version, _, offset, nbytes, crc = _PREAMBLE.unpack(bytes(buf[: _PREAMBLE.size]))
+    if version > VERSION:
+        raise ValueError(
+            "The xtgeo file version {} is newer than supported ({}), please "
+            "upgrade xtgeo".format(version, VERSION)
+        )
+
+    jindex = bytes(buf[offset : offset + nbytes])
+    if len(jindex) != nbytes or zlib.crc32(jindex) != crc:
+        raise ValueError("The xtgeo file index is damaged or incomplete")
+
+    index = json.loads(jindex.decode(), object_pairs_hook=OrderedDict)
+    if index.get("format") != FORMATNAME:
+        raise ValueError("Not a native xtgeo grid file")
+    return index
+
+
+def load_xtgeo_values(self, source):
+    """Read values for a property from a recorded xtgeo source (deferred import)."""
+
+    # values only; name, codes etc. may have been changed since the import
+    self._values = XTGeoGridFile(source["file"]).get_values(
+        source["name"], date=source["date"], layers=source["layers"]
+    )
@@ -0,0 +1,177 @@
+"""GridProperty values stored for active cells only ("compressed" storage).
+
+A compressed property holds a 1D array with the values of the active cells, in C
+order, and a read only array with the C order (1D) index of these cells. The
+index is the one of the grid's ActiveMask, shared with all other compressed
+properties of the same grid, if the property is active for the same cells as the
+grid.
+
+The full 3D masked array is made on first access of ``values``, and the property
+is then no longer compressed. Functions in this module let export, dataframes,
+hashing etc. work on the compressed values without expanding the property.
+"""
+
+from __future__ import print_function, absolute_import
+
+import numpy as np
+
+import xtgeo
+
+xtg = xtgeo.common.XTGeoDialog()
+
+logger = xtg.functionlogger(__name__)
+
+
+def set_compressed(self, activev, index):
+    """Set values for the active cells only; index is the C order active index."""
+    if activev.shape != index.shape:
+        raise ValueError(
+            "Number of values {} does not match number of active cells {}".format(
+                activev.size, index.size
+            )
+        )
+    self._valuesv = None
+    self._activev = activev
+    self._activeindex = index
+    self._hash = None
+
+
+def compress(self, grid=None):
+    """Store the values of active (unmasked) cells only.
+
+    The index of active cells is taken from the grid if the property is active for
+    the same cells as the grid, otherwise it is made from the property mask.
+    """
+    self.load_values()  # before testing, as a lazy load may give compressed
+    if self._activev is not None:
+        return
+
+    grid = grid if grid is not None else self._geometry
+    if grid is not None and grid.dimensions != self.dimensions:
+        raise ValueError("Grid and property dimensions differ")
+
+    values = self._values
+    mask = np.ma.getmaskarray(values).reshape(-1)
+
+    index = None
+    if grid is not None:
+        amask = grid.get_active_mask()
+        gindex = amask.indices
+        if amask.shares(values) or (
+            gindex.size == mask.size - mask.sum() and not mask[gindex].any()
+        ):
+            index = gindex
+
+    if index is None:
+        logger.info("Property %s has own active cells", self.name)
+        index = np.flatnonzero(~mask)
+        index.flags.writeable = False
+
+    set_compressed(self, np.ma.getdata(values).reshape(-1)[index], index)
+
+
+def compress_when_loaded(self, grid=None):
+    """Compress now if values are loaded, otherwise when values are loaded."""
+    if self._isloaded:
+        compress(self, grid)
+    else:
+        self._valuesource["compressed"] = True
+        self._valuesource["grid"] = grid
+
+
+def expand(self):
+    """Return the full 3D masked array for a compressed property."""
+    activev = self._activev
+
+    values = np.zeros(self.ntotal, dtype=activev.dtype)
+    if values.dtype.itemsize >= 4:
+        values.fill(self.undef)  # masked cells have undef values, as when imported
+    values[self._activeindex] = activev
+
+    mask = np.ones(self.ntotal, dtype=bool)
+    mask[self._activeindex] = False
+
+    return np.ma.array(
+        values.reshape(self.dimensions), mask=mask.reshape(self.dimensions)
+    )
+
+
+def masked_values(self):
+    """Return the 3D masked values, made on the fly (not kept) if compressed."""
+    self.load_values()
+    if self._activev is None:
+        return self._values
+    return expand(self)
+
+
+def filled_values(self, fill_value, dtype):
+    """Return a 3D numpy array of dtype, with fill_value in masked cells."""
+    self.load_values()
+    if self._activev is None:
+        return np.ma.filled(self._values.astype(dtype), fill_value)
+
+    values = np.full(self.ntotal, fill_value, dtype=dtype)
+    values[self._activeindex] = self._activev
+    return values.reshape(self.dimensions)
+
+
+def astype(self, dtype):
+    """Change the dtype of values, keeping compressed storage if any."""
+    self.load_values()
+    if self._activev is None:
+        self.values = self.values.astype(dtype)
+    else:
+        self._activev = self._activev.astype(dtype)
+        self._hash = None
+
+
+def layer_values(self, k0, k1, cache=None):
+    """Return masked values for layers k0 to k1 (zero based, half open).
+
+    For a compressed property, the values are made from the compressed values
+    for these layers only. The cache (dict) may be given to reuse the selection
+    of cells for properties with the same active index.
+    """
+    self.load_values()
+    if self._activev is None:
+        return self._values[:, :, k0:k1]
+
+    sel, target = _layer_selection(self._activeindex, self._nlay, k0, k1, cache)
+
+    shape = (self._ncol, self._nrow, k1 - k0)
+    values = np.zeros(shape, dtype=self._activev.dtype)
+    mask = np.ones(shape, dtype=bool)
+    values.reshape(-1)[target] = self._activev[sel]
+    mask.reshape(-1)[target] = False
+    return np.ma.array(values, mask=mask)
+
+
+def _layer_selection(index, nlay, k0, k1, cache=None):
+    """Return positions in index of cells in layers k0 to k1, and their C order
+    positions in an array for these layers."""
+    key = (id(index), nlay, k0, k1)
+    if cache is not None and key in cache:
+        return cache[key]
+
+    klay = index % nlay
+    sel = np.flatnonzero((klay >= k0) & (klay < k1))
+    target = (index[sel] // nlay) * (k1 - k0) + klay[sel] - k0
+
+    if cache is not None:
+        cache[key] = (sel, target)
+    return sel, target
+
+
+def column_values(self, i0, i1, fill_value, dtype):
+    """Return an array of dtype for columns i0 to i1 (zero based, half open), with
+    fill_value in masked cells, made without expanding a compressed property."""
+    self.load_values()
+    if self._activev is None:
+        return np.ma.filled(self._values[i0:i1].astype(dtype), fill_value)
+
+    ncell = self._nrow * self._nlay
+    start, stop = np.searchsorted(self._activeindex, (i0 * ncell, i1 * ncell))
+
+    values = np.full((i1 - i0) * ncell, fill_value, dtype=dtype)
+    values[self._activeindex[start:stop] - i0 * ncell] = self._activev[start:stop]
+    return values.reshape(i1 - i0, self._nrow, self._nlay)
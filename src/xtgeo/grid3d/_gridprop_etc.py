@@ -63,11 +63,8 @@ def gridproperty_fromgrid(self, grid, linkgeometry=False):
 
     if isinstance(grid, xtgeo.grid3d.Grid):
 
-        act = grid.get_actnum(asmasked=True)
-
-        self._values = np.ma.array(vals, mask=np.ma.getmaskarray(act.values))
-
-        del act
+        # the mask is shared with the grid and other properties
+        self._values = grid.get_active_mask().masked(vals)
 
         if linkgeometry:
             # assosiate this grid property with grid instance. This is not default
@@ -100,6 +97,8 @@ def gridproperty_fromfile(self, pfile, **kwargs):
         gridlink=kwargs.get("gridlink"),
         date=self._date,
         fracture=self._fracture,
+        values=kwargs.get("values", True),
+        compressed=kwargs.get("compressed", False),
     )
 
 
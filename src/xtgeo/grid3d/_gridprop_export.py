@@ -6,6 +6,7 @@ import xtgeo
 import xtgeo.cxtgeo._cxtgeo as _cxtgeo
 from xtgeo.common import XTGeoDialog
 from xtgeo.grid3d import _gridprop_lowlevel
+from xtgeo.grid3d import _grid_roff_stream
 
 xtg = XTGeoDialog()
 
@@ -28,11 +29,13 @@ def to_file(self, pfile, fformat="roff", name=None, append=False, dtype=None, fm
         if "asc" in fformat:
             binary = False
 
-        # for later usage
-        append = False
-        last = True
-
-        export_roff(self, fobj.name, name, append=append, last=last, binary=binary)
+        if binary:
+            append = append and fobj.exists()
+            _grid_roff_stream.export_roff(
+                fobj, props=[self], names=[name], append=append
+            )
+        else:
+            export_roff(self, fobj.name, name, append=False, last=True, binary=False)
 
     elif fformat == "grdecl":
         export_grdecl(
@@ -14,8 +14,11 @@ import os
 
 import xtgeo
 from ._gridprop_import_eclrun import import_eclbinary as impeclbin
+from ._gridprop_import_eclrun import load_eclbinary_values
 from ._gridprop_import_grdecl import import_grdecl_prop, import_bgrdecl_prop
-from ._gridprop_import_roff import import_roff
+from ._gridprop_import_roff import import_roff, import_roff_many, load_roff_values
+from ._grid_xtgeo_file import XTGeoGridFile, load_xtgeo_values
+from . import _gridprop_compressed
 
 xtg = xtgeo.common.XTGeoDialog()
 
@@ -30,6 +33,8 @@ def from_file(
     grid=None,
     date=None,
     fracture=False,
+    values=True,
+    compressed=False,
     _roffapiv=1,
 ):  # _roffapiv for devel.
     """Import grid property from file, and makes an instance of this."""
@@ -43,11 +48,22 @@ def from_file(
 
     if fformat == "roff":
         logger.info("Importing ROFF...")
-        import_roff(self, pfile, name, grid=grid, _roffapiv=_roffapiv)
+        if values and grid is None:
+            import_roff(self, pfile, name, grid=grid, _roffapiv=_roffapiv)
+        else:
+            import_roff_many([self], pfile, [name], values=values, grid=grid)
 
     elif fformat.lower() == "init":
         impeclbin(
-            self, pfile, name=name, etype=1, date=None, grid=grid, fracture=fracture
+            self,
+            pfile,
+            name=name,
+            etype=1,
+            date=None,
+            grid=grid,
+            fracture=fracture,
+            values=values,
+            compressed=compressed,
         )
 
     elif fformat.lower() == "unrst":
@@ -68,7 +84,15 @@ def from_file(
             raise RuntimeError("Date is not int format")
 
         impeclbin(
-            self, pfile, name=name, etype=5, date=date, grid=grid, fracture=fracture
+            self,
+            pfile,
+            name=name,
+            etype=5,
+            date=date,
+            grid=grid,
+            fracture=fracture,
+            values=values,
+            compressed=compressed,
         )
 
     elif fformat.lower() == "grdecl":
@@ -76,10 +100,20 @@ def from_file(
 
     elif fformat.lower() == "bgrdecl":
         import_bgrdecl_prop(self, pfile, name=name, grid=grid)
+
+    elif fformat.lower() == "xtgeo":
+        if isinstance(date, str):
+            date = int(date.replace("-", ""))
+        XTGeoGridFile(pfile.file).load_property(self, name, date=date, values=values)
     else:
         logger.warning("Invalid file format")
         raise ValueError("Invalid file format")
 
+    # Eclipse records are read as compressed directly, other formats are compressed
+    # here, or when values are loaded if values are not read
+    if compressed:
+        _gridprop_compressed.compress_when_loaded(self, grid)
+
     # if grid, then append this gridprop to the current grid object
 
     # ###################################TMP skipped""
@@ -89,6 +123,20 @@ def from_file(
     return self
 
 
+def load_values(self, source):
+    """Read values that were deferred at import, from the recorded source."""
+
+    logger.info("Load values for %s from %s", self.name, source["file"])
+    if source["fformat"] == "roff":
+        load_roff_values(self, source)
+    elif source["fformat"] == "eclbinary":
+        load_eclbinary_values(self, source)
+    elif source["fformat"] == "xtgeo":
+        load_xtgeo_values(self, source)
+    else:
+        raise ValueError("Cannot load values from {}".format(source["fformat"]))
+
+
 def _chk_file(self, pfile, fformat):
 
     self._filesrc = pfile
@@ -8,7 +8,8 @@ import numpy.ma as ma
 import xtgeo
 
 from . import _grid_eclbin_record as _eclbin
-from . import _grid3d_utils as utils
+from . import _grid_eclbin_index
+from . import _gridprop_compressed
 
 xtg = xtgeo.common.XTGeoDialog()
 
@@ -55,7 +56,16 @@ def _get_phase_key(inkey):
 
 
 def import_eclbinary(
-    self, pfile, name=None, etype=1, date=None, grid=None, fracture=False, _kwlist=None
+    self,
+    pfile,
+    name=None,
+    etype=1,
+    date=None,
+    grid=None,
+    fracture=False,
+    values=True,
+    compressed=False,
+    _kwlist=None,
 ):
 
     # if pfile is a file, then the file is opened/closed here; otherwise, the
@@ -67,14 +77,13 @@ def import_eclbinary(
 
     logger.info("Import ECL binary, name requested is %s", name)
 
-    # scan file for properties byte positions etc
+    # scan file for properties byte positions etc; kwlist is a keyword index with
+    # hashed lookups, made from a given dataframe/index or from the file
     if _kwlist is None:
-        logger.info("Make kwlist, scan keywords")
-        kwlist = utils.scan_keywords(
-            pfile, fformat="xecl", maxkeys=100000, dataframe=True, dates=True
-        )
+        logger.info("Make kwlist, scan keywords or reuse keyword index")
+        kwlist = _grid_eclbin_index.EclKeywordIndex.from_file(pfile)
     else:
-        kwlist = _kwlist
+        kwlist = _grid_eclbin_index.get_index(_kwlist)
 
     metadata = _import_eclbinary_meta(self, pfile, kwlist, etype, date, grid)
     date = metadata["DATE"]
@@ -119,19 +128,27 @@ def import_eclbinary(
             )
         else:
             _import_eclbinary_prop(
-                self, grid, pfile, kwname, kwlen, kwtype, kwbyte, name, date, etype
+                self,
+                grid,
+                pfile,
+                kwname,
+                kwlen,
+                kwtype,
+                kwbyte,
+                name,
+                date,
+                etype,
+                values=values,
+                compressed=compressed,
             )
 
     pfile.cfclose()
 
 
-def _chk_kw_date(df, keyword, date):
+def _chk_kw_date(kwlist, keyword, date):
     """Check if a keyword exists for a given date"""
 
-    for ir in range(len(df)):
-        if df.loc[ir, "KEYWORD"] == keyword and str(df.loc[ir, "DATE"]) == str(date):
-            return True
-    return False
+    return kwlist.has(keyword, date)
 
 
 def _import_swat(self, pfile, kwlist, metadata, grid, date, fracture):
@@ -176,8 +193,7 @@ def _import_swat(self, pfile, kwlist, metadata, grid, date, fracture):
                 self.name = "SWATM" + "_" + str(date)
                 self._values[grid._dualactnum.values == 2] = 0.0
 
-    gactnum = grid.get_actnum().values
-    self._values = ma.masked_where(gactnum < 1, self._values)
+    self._values = grid.get_active_mask().masked(self._values)
     return 3
 
 
@@ -248,8 +264,7 @@ def _import_sgas(self, pfile, kwlist, metadata, grid, date, fracture):
             self.name = "SGASM" + "_" + str(date)
             self._values[grid._dualactnum.values == 2] = 0.0
 
-    gactnum = grid.get_actnum().values
-    self._values = ma.masked_where(gactnum < 1, self._values)
+    self._values = grid.get_active_mask().masked(self._values)
     return 1
 
 
@@ -355,8 +370,7 @@ def _import_soil(self, pfile, kwlist, metadata, grid, date, fracture):
             self.name = "SOILM" + "_" + str(date)
             self._values[grid._dualactnum.values == 2] = 0.0
 
-    gactnum = grid.get_actnum().values
-    self._values = ma.masked_where(gactnum < 1, self._values)
+    self._values = grid.get_active_mask().masked(self._values)
 
     return 2
 
@@ -368,7 +382,6 @@ def _import_eclbinary_meta(self, pfile, kwlist, etype, date, grid):
         A dictionary of metadata
 
     """
-    nentry = 0
     metadata = {}
 
     datefound = True
@@ -376,8 +389,8 @@ def _import_eclbinary_meta(self, pfile, kwlist, etype, date, grid):
         datefound = False
         logger.info("Look for date %s", date)
 
-        # scan for date and find SEQNUM entry number; also potentially update date!
-        dtlist = kwlist["DATE"].values.tolist()
+        # scan for date; also potentially update date!
+        dtlist = kwlist.dates
         if date == 0:
             date = dtlist[0]
         elif date == 9:
@@ -385,27 +398,20 @@ def _import_eclbinary_meta(self, pfile, kwlist, etype, date, grid):
 
         logger.info("Redefined date is %s", date)
 
-        for ientry, dtentry in enumerate(dtlist):
-            if str(dtentry) == str(date):
-                datefound = True
-                nentry = ientry
-                break
+        datefound = kwlist.has_date(date)
 
         if not datefound:
-            msg = "Date {} not found, nentry={}".format(date, nentry)
+            msg = "Date {} not found".format(date)
             xtg.warn(msg)
             raise xtgeo.DateNotFoundError(msg)
 
-    kwxlist = list(kwlist.itertuples(index=False, name=None))
     kwname = "unset"
     kwlen = 0
     kwtype = "unset"
     kwbyte = 0
     # INTEHEAD is needed to verify grid dimensions:
-    for kwitem in kwxlist:
-        if kwitem[0] == "INTEHEAD":
-            kwname, kwtype, kwlen, kwbyte, _ = kwitem
-            break
+    if "INTEHEAD" in kwlist:
+        kwname, kwlen, kwtype, kwbyte = kwlist.find_first("INTEHEAD")
 
     # read INTEHEAD record:
     intehead = _eclbin.eclbin_record(pfile, kwname, kwlen, kwtype, kwbyte).tolist()
@@ -424,10 +430,8 @@ def _import_eclbinary_meta(self, pfile, kwlist, etype, date, grid):
 
     # LOGIHEAD item [14] in restart should be True, if dualporo model...
     # LOGIHEAD item [15] in restart should be True, if dualperm (+ dualporo) model.
-    for kwitem in kwxlist:
-        if kwitem[0] == "LOGIHEAD":
-            kwname, kwtype, kwlen, kwbyte, _kwdate = kwitem
-            break
+    if "LOGIHEAD" in kwlist:
+        kwname, kwlen, kwtype, kwbyte = kwlist.find_first("LOGIHEAD")
 
     # read INTEHEAD record:
     logihead = _eclbin.eclbin_record(pfile, kwname, kwlen, kwtype, kwbyte).tolist()
@@ -526,18 +530,12 @@ def _import_eclbinary_checks2(kwlist, name, etype, date):
         usedate = str(date)
         restart = True
 
-    kwxlist = list(kwlist.itertuples(index=False, name=None))
-    for kwitem in kwxlist:
-        kwname, kwtype, kwlen, kwbyte, kwdate = kwitem
-        logger.debug("Keyword %s -  date: %s usedate: %s", kwname, kwdate, usedate)
-        if name == kwname:
-            kwfound = True
-
-        if name == kwname and usedate == str(kwdate):
-            logger.info("Keyword %s ok at date %s", name, usedate)
-            kwname, kwtype, kwlen, kwbyte, kwdate = kwitem
-            datefoundhere = True
-            break
+    kwfound = name in kwlist
+    kwitem = kwlist.find(name, usedate)
+    if kwitem is not None:
+        logger.info("Keyword %s ok at date %s", name, usedate)
+        kwname, kwlen, kwtype, kwbyte = kwitem
+        datefoundhere = True
 
     if restart:
         if datefound and not kwfound:
@@ -559,74 +557,167 @@ def _import_eclbinary_checks2(kwlist, name, etype, date):
 
 
 def _import_eclbinary_prop(
-    self, grid, pfile, kwname, kwlen, kwtype, kwbyte, name, date, etype
+    self,
+    grid,
+    pfile,
+    kwname,
+    kwlen,
+    kwtype,
+    kwbyte,
+    name,
+    date,
+    etype,
+    values=True,
+    compressed=False,
 ):
-    """Import the actual record"""
+    """Import the actual record, or just record where it is if values is False.
 
-    values = _eclbin.eclbin_record(pfile, kwname, kwlen, kwtype, kwbyte)
+    If compressed, the values are stored for active cells only.
+    """
 
-    self._isdiscrete = False
-    use_undef = xtgeo.UNDEF
-    self.codes = {}
+    self._isdiscrete = kwtype == "INTE"
+    self._dtype = "int32" if self._isdiscrete else "float64"  # as loaded
 
-    if kwtype == "INTE":
-        self._isdiscrete = True
-        use_undef = xtgeo.UNDEF_INT
+    # codes for discrete properties are made from the values when loaded
+    self._codes = None if self._isdiscrete else {}
 
-        # make the code list
-        uniq = np.unique(values).tolist()
-        codes = dict(zip(uniq, uniq))
-        codes = {key: str(val) for key, val in codes.items()}  # val: strings
-        self.codes = codes
+    self._valuesource = {
+        "fformat": "eclbinary",
+        "file": pfile.file,
+        "bytepos": kwbyte,
+        "dtype": kwtype,
+        "kwname": kwname,
+        "kwlen": kwlen,
+        "grid": grid,
+        "compressed": compressed,
+    }
+
+    if etype == 1:
+        self._name = name
+    else:
+        self._name = name + "_" + str(date)
+        self._date = date
 
+    if values:
+        load_eclbinary_values(self, self._valuesource)
+        self._isloaded = True
     else:
-        values = values.astype(np.float64)  # cast REAL (float32) to float64
+        self._valuesv = None
+        self._isloaded = False
 
-    # arrays from Eclipse INIT or UNRST are usually for inactive values only.
-    # Use the ACTNUM index array for vectorized numpy remapping (need both C
-    # and F order)
-    gactnum = grid.get_actnum().values
-    gactindc = grid.actnum_indices
-    gactindf = grid.get_actnum_indices(order="F")
 
-    allvalues = (
-        np.zeros((self._ncol * self._nrow * self._nlay), dtype=values.dtype) + use_undef
+def load_eclbinary_values(self, source):
+    """Read values for a property from a recorded Eclipse record source.
+
+    The record is memory mapped and scattered directly from the file (big endian,
+    Eclipse F order, often active cells only) into the final C ordered array, so
+    only the final values array is allocated. If source["compressed"] is True, the
+    final array holds the active cells only.
+    """
+
+    grid = source["grid"]
+    kwtype = source["dtype"]
+    pfile = xtgeo._XTGeoFile(source["file"])
+
+    record = _eclbin.EclRecordView(
+        pfile, source["kwname"], source["kwlen"], kwtype, source["bytepos"]
     )
 
+    use_undef = xtgeo.UNDEF
+    dtype = np.float64  # cast REAL (float32) to float64
+
+    if kwtype == "INTE":
+        use_undef = xtgeo.UNDEF_INT
+        dtype = np.int32
+
+    ntot = self._ncol * self._nrow * self._nlay
+    shape = (self._ncol, self._nrow, self._nlay)
+
+    # arrays from Eclipse INIT or UNRST are usually for active cells only. Map the
+    # Eclipse (F order) position of each value to the position in the C order array
+    amask = grid.get_active_mask()
+    ctarget, cactive = _active_targets(grid)
+
     msg = "...\n"
-    msg = msg + "grid.actnum_indices.shape[0] = {}\n".format(
-        grid.actnum_indices.shape[0]
-    )
-    msg = msg + "values.shape[0] = {}\n".format(values.shape[0])
+    msg = msg + "grid active cells = {}\n".format(ctarget.shape[0])
+    msg = msg + "record length = {}\n".format(record.nitems)
     msg = msg + "ncol nrow nlay {} {} {}, nrow*nrow*nlay = {}\n".format(
-        self._ncol, self._nrow, self._nlay, self._ncol * self._nrow * self._nlay
+        self._ncol, self._nrow, self._nlay, ntot
     )
 
     logger.info(msg)
 
-    if gactindc.shape[0] == values.shape[0]:
-        allvalues[gactindf] = values
-    elif values.shape[0] == self._ncol * self._nrow * self._nlay:  # often case for PORV
-        allvalues = values.copy()
-    else:
+    compressed = source.get("compressed", False)
+
+    if compressed and ctarget.shape[0] == record.nitems:
+        allvalues = np.empty(ctarget.shape[0], dtype=dtype)
+        record.scatter(allvalues, cactive)
+
+    elif compressed and record.nitems == ntot:
+        allvalues = record.to_numpy(dtype=dtype).reshape(shape, order="F")
+        allvalues = allvalues.ravel()[amask.indices]
+
+    elif ctarget.shape[0] == record.nitems:
+        allvalues = np.full(ntot, use_undef, dtype=dtype)
+        record.scatter(allvalues, ctarget)
+        allvalues = allvalues.reshape(shape)
 
+    elif record.nitems == ntot:  # often case for PORV
+        allvalues = record.to_numpy(dtype=dtype).reshape(shape, order="F")
+        allvalues = np.ascontiguousarray(allvalues)
+
+    else:
         msg = (
             "BUG somehow... Is the file corrupt? If not contact "
             "the library developer(s)!\n" + msg
         )
         raise SystemExit(msg)
 
-    allvalues = allvalues.reshape((self._ncol, self._nrow, self._nlay), order="F")
-    allvalues = np.asanyarray(allvalues, order="C")
-    allvalues = ma.masked_where(gactnum < 1, allvalues)
+    del record
 
-    self._values = allvalues
+    if compressed:
+        activevalues = allvalues
+    else:
+        activevalues = allvalues.ravel()[amask.indices]
 
-    if etype == 1:
-        self._name = name
+    if self._isdiscrete and self._codes is None:
+        # make the code list
+        uniq = np.unique(activevalues).tolist()
+        codes = dict(zip(uniq, uniq))
+        codes = {key: str(val) for key, val in codes.items()}  # val: strings
+        self.codes = codes
+
+    if compressed:
+        _gridprop_compressed.set_compressed(self, allvalues, amask.indices)
     else:
-        self._name = name + "_" + str(date)
-        self._date = date
+        # the mask is shared with the grid and other properties
+        self._values = amask.masked(allvalues)
+
+
+def _active_targets(grid):
+    """Return the C order position, and the position among active cells in C order,
+    for each active cell in Eclipse (F) order.
+
+    These are the same for all records, and are kept in ``grid._tmp``, which is
+    renewed when the grid is changed.
+    """
+    targets = grid._tmp.get("ecltargets")
+    if targets is None:
+        ncol, nrow, nlay = grid.dimensions
+        gactindf = grid.get_actnum_indices(order="F")
+
+        icol = gactindf % ncol
+        jrow = (gactindf // ncol) % nrow
+        klay = gactindf // (ncol * nrow)
+        ctarget = (icol * nrow + jrow) * nlay + klay
+        del icol, jrow, klay
+
+        # the C order active index is sorted, so the position is found by bisection
+        cactive = np.searchsorted(grid.get_active_mask().indices, ctarget)
+
+        targets = (ctarget, cactive)
+        grid._tmp["ecltargets"] = targets
+    return targets
 
 
 def _import_eclbinary_dualporo(
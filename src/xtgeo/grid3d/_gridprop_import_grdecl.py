@@ -2,17 +2,12 @@
 
 from __future__ import print_function, absolute_import
 
-import re
-import os
-from tempfile import mkstemp
-
 import numpy as np
-import numpy.ma as ma
 
 import xtgeo
-import xtgeo.cxtgeo._cxtgeo as _cxtgeo
 
 from . import _grid_eclbin_record as _eclbin
+from . import _grid_grdecl_stream as _grdecl
 from . import _grid3d_utils as utils
 
 xtg = xtgeo.common.XTGeoDialog()
@@ -74,11 +69,9 @@ def import_bgrdecl_prop(self, pfile, name="unknown", grid=None):
     # property arrays from binary GRDECL will be for all cells, but they
     # are in Fortran order, so need to convert...
 
-    actnum = grid.get_actnum().values
     allvalues = values.reshape(self.dimensions, order="F")
     allvalues = np.asanyarray(allvalues, order="C")
-    allvalues = ma.masked_where(actnum < 1, allvalues)
-    self.values = allvalues
+    self._values = grid.get_active_mask().masked(allvalues, self.undef_limit)
     self._name = name
 
     pfile.cfclose()
@@ -87,38 +80,54 @@ def import_bgrdecl_prop(self, pfile, name="unknown", grid=None):
 def import_grdecl_prop(self, pfile, name="unknown", grid=None):
     """Read a GRDECL ASCII property record"""
 
-    if grid is None:
-        raise ValueError("A grid instance is required as argument")
+    import_grdecl_props([self], pfile, [name], grid=grid)
 
-    self._ncol = grid.ncol
-    self._nrow = grid.nrow
-    self._nlay = grid.nlay
-    self._name = name
-    self._filesrc = pfile
-    actnumv = grid.get_actnum().values
-
-    # This requires that the Python part clean up comments
-    # etc, and make a tmp file.
-    fds, tmpfile = mkstemp(prefix="tmpxtgeo")
-    os.close(fds)
-
-    with open(pfile.name, "r") as oldfile, open(tmpfile, "w") as newfile:
-        for line in oldfile:
-            if not (re.search(r"^--", line) or re.search(r"^\s+$", line)):
-                newfile.write(line)
-
-    # now read the property
-    nlen = self._ncol * self._nrow * self._nlay
-    ier, values = _cxtgeo.grd3d_import_grdecl_prop(
-        tmpfile, self._ncol, self._nrow, self._nlay, name, nlen, 0,
-    )
 
-    os.remove(tmpfile)
+def import_grdecl_props(props, pfile, names, grid=None, records=None):
+    """Read several GRDECL ASCII property records, in one pass over the file.
 
-    if ier != 0:
-        raise xtgeo.KeywordNotFoundError(
-            "Cannot import {}, not present in file {}?".format(name, pfile)
-        )
+    Args:
+        props (list): List of GridProperty instances to be filled, same length as
+            names.
+        pfile (_XTGeoFile): Input file.
+        names (list): Property names to read.
+        grid (Grid): XTGeo Grid instance (required).
+        records (dict): Keyword data already read from file (optional).
+
+    Raises:
+        xtgeo.KeywordNotFoundError: Cannot find property...
+    """
+
+    if grid is None:
+        raise ValueError("A grid instance is required as argument")
 
-    self.values = values.reshape(self.dimensions)
-    self.values = ma.masked_equal(self.values, actnumv == 0)
+    if records is None:
+        records = _grdecl.read_grdecl_keywords(pfile, names)
+
+    amask = grid.get_active_mask()
+    dimensions = (grid.ncol, grid.nrow, grid.nlay)
+    for prop, name in zip(props, names):
+        if name not in records:
+            raise xtgeo.KeywordNotFoundError(
+                "Cannot import {}, not present in file {}?".format(name, pfile.name)
+            )
+
+        values = records[name]
+        if values.size != grid.ntotal:
+            raise ValueError(
+                "Wrong length of {} in {}: {} vs {}".format(
+                    name, pfile.name, values.size, grid.ntotal
+                )
+            )
+
+        prop._ncol, prop._nrow, prop._nlay = dimensions
+        prop._name = name
+        prop._filesrc = pfile.name
+
+        # GRDECL values run I fastest (F order), XTGeo use C order
+        values = np.ascontiguousarray(values.reshape(dimensions, order="F"))
+        if prop.isdiscrete:
+            values = values.astype(np.int32)
+
+        # the mask is shared with the grid and other properties
+        prop._values = amask.masked(values, prop.undef_limit)
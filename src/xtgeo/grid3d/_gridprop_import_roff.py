@@ -175,3 +175,249 @@ def _import_roff_v2(self, pfile, name):
     #     subs = _rkwxlist(pfile, kwords, "subgrids!nLayers", byteswap, strict=False)
 
     pfile.cfclose()
+
+
+# ======================================================================================
+# Bulk import of several properties from one ROFF binary file (GridProperties)
+# ======================================================================================
+
+# ROFF keyword type -> numpy type (byte order is added from the byteswaptest)
+_ROFFDTYPES = {
+    "int": "i4",
+    "float": "f4",
+    "double": "f8",
+    "bool": "u1",
+    "byte": "u1",
+}
+
+# undefined values as stored in ROFF (cf. UNDEF_ROFF* in libxtg.h)
+_ROFFUNDEF = {"int": -999, "float": -999.0, "double": -999.0, "byte": 255, "bool": 255}
+
+
+def import_roff_many(props, pfile, names, kwords=None, values=True, grid=None):
+    """Import several properties from ROFF binary in one pass.
+
+    The keyword table is scanned once (or reused if ``kwords`` is given), and
+    then only the relevant byte ranges are read, in file order, into
+    preallocated numpy arrays.
+
+    Args:
+        props (list): List of GridProperty instances to be filled, same length as
+            names.
+        pfile (_XTGeoFile): Input file.
+        names (list): Property names to read.
+        kwords (list): Result of a previous roff keyword scan (optional).
+        values (bool): If False, read metadata only and defer reading of values
+            until first access.
+        grid (Grid): If given, the values share the active mask of the grid,
+            see :meth:`Grid.get_active_mask`.
+    """
+
+    if kwords is None:
+        kwords = utils.scan_keywords(pfile, fformat="roff")
+
+    params = _roff_parameter_table(kwords)
+
+    for name in names:
+        if name not in params or "data" not in params[name]:
+            raise xtgeo.KeywordNotFoundError(
+                "Cannot find property <{}> in file {}".format(name, pfile.name)
+            )
+
+    if pfile.memstream:
+        fhandle = pfile.file
+        fhandle.seek(0)
+        _read_roff_many(props, fhandle, names, kwords, params, pfile, values, grid)
+    else:
+        with open(pfile.name, "rb") as fhandle:
+            _read_roff_many(props, fhandle, names, kwords, params, pfile, values, grid)
+
+    for prop in props:
+        prop._filesrc = pfile.name
+
+
+def roff_parameter_names(kwords):
+    """Return all parameter names in a ROFF keyword list, in file order."""
+    return list(_roff_parameter_table(kwords).keys())
+
+
+def _roff_parameter_table(kwords):
+    """Make a dictionary of parameter name -> {subkey: (type, nitems, bytepos)}.
+
+    In ROFF files the keywords for one parameter come in sequence, e.g.::
+
+        parameter!name!FACIES  char     1   310
+        parameter!codeNames    char     3   335
+        parameter!codeValues   int      3   370
+        parameter!data         int  35840   400
+    """
+    params = {}
+    current = None
+    for kwd, kwtype, nitems, bytepos in kwords:
+        if kwd.startswith("parameter!name!"):
+            current = kwd[len("parameter!name!") :]
+            params[current] = {}
+        elif kwd.startswith("parameter!") and current is not None:
+            params[current][kwd.split("!")[1]] = (kwtype, nitems, bytepos)
+        else:
+            current = None
+    return params
+
+
+def _roff_single_value(kwords, name):
+    """Return (type, bytepos) for a single value roff keyword."""
+    for kwd, kwtype, _, bytepos in kwords:
+        if kwd == name:
+            return kwtype, bytepos
+    raise xtgeo.KeywordNotFoundError("Cannot find <{}> in ROFF file".format(name))
+
+
+def _read_roff_many(props, fhandle, names, kwords, params, pfile, values, grid):
+    """Read data for all requested parameters with one open file handle."""
+
+    _, bpos = _roff_single_value(kwords, "filedata!byteswaptest")
+    fhandle.seek(bpos)
+    byteorder = "<" if np.frombuffer(fhandle.read(4), dtype="<i4")[0] == 1 else ">"
+
+    dims = []
+    for dname in ("dimensions!nX", "dimensions!nY", "dimensions!nZ"):
+        _, bpos = _roff_single_value(kwords, dname)
+        fhandle.seek(bpos)
+        dims.append(int(np.frombuffer(fhandle.read(4), dtype=byteorder + "i4")[0]))
+    ncol, nrow, nlay = dims
+    ntot = ncol * nrow * nlay
+    logger.info("Dimensions in ROFF file %s %s %s", ncol, nrow, nlay)
+
+    if grid is not None and grid.dimensions != (ncol, nrow, nlay):
+        raise ValueError("Grid and property dimensions differ")
+
+    # read requests sorted on byte position, so the file is traversed forward once
+    requests = []
+    for prop, name in zip(props, names):
+        for subkey in ("codeNames", "codeValues", "data"):
+            if subkey in params[name]:
+                requests.append((params[name][subkey][2], prop, name, subkey))
+    requests.sort(key=lambda req: req[0])
+
+    rawbuffers = {}  # raw read buffers reused across parameters of same type
+    codenames = {}
+    codevalues = {}
+
+    for bytepos, prop, name, subkey in requests:
+        kwtype, nitems, _ = params[name][subkey]
+        fhandle.seek(bytepos)
+
+        if subkey == "codeNames":
+            codenames[name] = _read_roff_strings(fhandle, nitems)
+            continue
+
+        if subkey == "codeValues":
+            codevalues[name] = np.frombuffer(
+                fhandle.read(4 * nitems), dtype=byteorder + "i4"
+            ).tolist()
+            continue
+
+        if kwtype not in _ROFFDTYPES:
+            raise ValueError("Unhandled ROFF data type for {}: {}".format(name, kwtype))
+
+        if nitems != ntot:
+            raise ValueError(
+                "Wrong length of ROFF data for {}: {} vs {}".format(name, nitems, ntot)
+            )
+
+        rawtype = np.dtype(byteorder + _ROFFDTYPES[kwtype])
+
+        prop._ncol = ncol
+        prop._nrow = nrow
+        prop._nlay = nlay
+        prop._isdiscrete = kwtype in ("int", "byte", "bool")
+        prop._dtype = "int32" if prop._isdiscrete else "float64"
+        prop._name = name
+        prop._valuesource = {
+            "fformat": "roff",
+            "file": pfile.file,
+            "bytepos": bytepos,
+            "dtype": rawtype.str,
+            "kwtype": kwtype,
+            "grid": grid,
+        }
+
+        if not values:
+            prop._valuesv = None
+            prop._isloaded = False
+            continue
+
+        if rawtype not in rawbuffers:
+            rawbuffers[rawtype] = np.empty(ntot, dtype=rawtype)
+        raw = rawbuffers[rawtype]
+        nbytes = fhandle.readinto(memoryview(raw).cast("B"))
+        if nbytes != raw.nbytes:
+            raise EOFError("Unexpected end of ROFF file when reading " + name)
+
+        prop._values = _roff_values(raw, kwtype, ncol, nrow, nlay, grid)
+        prop._isloaded = True
+
+    for prop, name in zip(props, names):
+        if prop._isdiscrete and name in codenames and name in codevalues:
+            prop._codes = dict(zip(codevalues[name], codenames[name]))
+        else:
+            prop._codes = {0: "undef"}
+        prop._ncodes = len(prop._codes)
+
+
+def _roff_values(raw, kwtype, ncol, nrow, nlay, grid=None):
+    """Convert raw ROFF data to a masked XTGeo values array (a copy).
+
+    If grid is given, inactive cells are masked with the active mask of the grid,
+    which is shared unless there are undefined values in active cells.
+    """
+
+    # ROFF runs K fastest and from base, XTGeo has K from top (C order)
+    raw3d = raw.reshape(ncol, nrow, nlay)[:, :, ::-1]
+    undefmask = raw3d == _ROFFUNDEF[kwtype]
+
+    isdiscrete = kwtype in ("int", "byte", "bool")
+    dtype = np.int32 if isdiscrete else np.float64
+    values = np.empty((ncol, nrow, nlay), dtype=dtype)
+    np.copyto(values, raw3d, casting="unsafe")
+    values[undefmask] = xtgeo.UNDEF_INT if isdiscrete else xtgeo.UNDEF
+
+    if grid is not None:
+        limit = xtgeo.UNDEF_INT_LIMIT if isdiscrete else xtgeo.UNDEF_LIMIT
+        return grid.get_active_mask().masked(values, limit)
+    return np.ma.array(values, mask=undefmask)
+
+
+def load_roff_values(self, source):
+    """Read values for a property from a recorded ROFF source (deferred import)."""
+
+    ntot = self._ncol * self._nrow * self._nlay
+    rawtype = np.dtype(source["dtype"])
+    pfile = xtgeo._XTGeoFile(source["file"])
+
+    if pfile.memstream:
+        raw = np.frombuffer(
+            pfile.file.getbuffer(), dtype=rawtype, count=ntot, offset=source["bytepos"]
+        )
+    else:
+        with open(pfile.name, "rb") as fhandle:
+            fhandle.seek(source["bytepos"])
+            raw = np.fromfile(fhandle, dtype=rawtype, count=ntot)
+        if raw.size != ntot:
+            raise EOFError("Unexpected end of ROFF file when reading " + self.name)
+
+    kwtype = source["kwtype"]
+    self._values = _roff_values(
+        raw, kwtype, self._ncol, self._nrow, self._nlay, source.get("grid")
+    )
+
+
+def _read_roff_strings(fhandle, nitems, chunksize=1024):
+    """Read nitems zero terminated strings from current position."""
+    buf = b""
+    while buf.count(b"\0") < nitems:
+        chunk = fhandle.read(chunksize)
+        if not chunk:
+            break
+        buf += chunk
+    return [item.decode() for item in buf.split(b"\0")[:nitems]]
@@ -3,12 +3,13 @@
 from __future__ import print_function, absolute_import
 
 import numpy as np
-import numpy.ma as ma
 
 import xtgeo
 import xtgeo.cxtgeo._cxtgeo as _cxtgeo
 from xtgeo.common import XTGeoDialog
 
+from . import _gridprop_compressed
+
 xtg = XTGeoDialog()
 
 logger = xtg.functionlogger(__name__)
@@ -85,17 +86,13 @@ def update_carray(self, undef=None, discrete=None, dtype=None, order="F"):
 
     logger.debug("Entering conversion from numpy to C array ...")
 
-    values = self._values.copy()
-
     if not dtype:
-        if dstatus:
-            values = values.astype(np.int32)
-        else:
-            values = values.astype(np.float64)
+        usedtype = np.int32 if dstatus else np.float64
     else:
-        values = values.astype(dtype)
+        usedtype = dtype
 
-    values = ma.filled(values, undef)
+    # compressed values (active cells only) are filled directly, without expanding
+    values = _gridprop_compressed.filled_values(self, undef, usedtype)
 
     if order == "F":
         values = np.asfortranarray(values)
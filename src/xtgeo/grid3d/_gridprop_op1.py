@@ -157,4 +157,5 @@ def operation_polygons(self, poly, value, opname="add", inside=True):
     tmp = tmp.astype(dtype)
 
     self.values[proxyv == proxytarget] = tmp[proxyv == proxytarget]
+    self._hash = None  # values are changed in place
     del tmp
@@ -8,6 +8,11 @@ import numpy as np
 from xtgeo.common import XTGeoDialog
 
 from ._grid3d import Grid3D
+from . import _grid_etc1
+from . import _gridprop_compressed
+
+# default number of cells in each batch of dataframe_batches()
+BATCHCELLS = 1000000
 
 xtg = XTGeoDialog()
 
@@ -79,12 +84,11 @@ def dataframe(
             if activeonly:
                 vector = prop.get_active_npvalues1d()
             else:
-                vector = prop.values1d.copy()
                 # mask values not supported in Pandas:
                 if prop.isdiscrete:
-                    vector = vector.filled(fill_value=0)
+                    vector = prop.get_npvalues1d(fill_value=0)
                 else:
-                    vector = vector.filled(fill_value=np.nan)
+                    vector = prop.get_npvalues1d(fill_value=np.nan)
 
             if doubleformat:
                 vector = vector.astype(np.float64)
@@ -101,3 +105,89 @@ def dataframe(
     logger.debug("Dataframe: \n%s", mydataframe)
 
     return mydataframe
+
+
+def dataframe_batches(
+    self,
+    activeonly=False,
+    ijk=False,
+    xyz=False,
+    doubleformat=False,
+    grid=None,
+    layers=None,
+):  # pylint: disable=too-many-locals
+    """Yield (k0, k1, columns) for ranges of layers, as for dataframe().
+
+    The columns is an ordered dict of 1D numpy arrays for the cells in layers k0 to
+    k1 (zero based, half open), in C order, with the same columns and values as
+    dataframe(). Only one layer range is in memory at a time, also for compressed
+    properties and XYZ coordinates.
+    """
+
+    if grid is not None:
+        dims = grid.dimensions
+    elif self.props:
+        dims = self.props[0].dimensions
+    else:
+        raise ValueError("No properties and no grid, nothing to export")
+
+    if xyz and grid is None:
+        raise ValueError("You ask for xyz but no Grid is present. Use grid=...")
+
+    for prop in self.props or []:
+        if prop.dimensions != dims:
+            raise ValueError("Property {} has wrong dimensions".format(prop.name))
+
+    ncol, nrow, nlay = dims
+    if layers is None:
+        layers = max(1, BATCHCELLS // (ncol * nrow))
+
+    amask = grid.get_active_mask() if grid is not None else None
+    dualact = None
+    if ijk and not activeonly and grid is not None and grid.dualporo:
+        dualact = grid.get_actnum(dual=True).values
+
+    for k0 in range(0, nlay, layers):
+        k1 = min(k0 + layers, nlay)
+        cache = {}
+
+        # active cells from the grid, or else the first property
+        if amask is not None:
+            active = ~amask.mask[:, :, k0:k1]
+        else:
+            first = _gridprop_compressed.layer_values(self.props[0], k0, k1, cache)
+            active = ~np.ma.getmaskarray(first)
+
+        def _select(values):
+            if activeonly:
+                return values[active]
+            return values.reshape(-1)
+
+        columns = OrderedDict()
+
+        if ijk:
+            if not activeonly:
+                if dualact is not None:
+                    columns["ACTNUM"] = _select(np.ma.getdata(dualact[:, :, k0:k1]))
+                else:
+                    columns["ACTNUM"] = _select(active.astype(np.int32))
+            icol, jrow, klay = np.indices((ncol, nrow, k1 - k0), dtype=np.int32)
+            columns["IX"] = _select(icol + 1)
+            columns["JY"] = _select(jrow + 1)
+            columns["KZ"] = _select(klay + k0 + 1)
+            del icol, jrow, klay
+
+        if xyz:
+            xyzv = _grid_etc1.get_xyz_layers(grid, k0, k1, asmasked=False)
+            for name, values in zip(("X_UTME", "Y_UTMN", "Z_TVDSS"), xyzv):
+                columns[name] = _select(values)
+            del xyzv
+
+        for prop in self.props or []:
+            values = _gridprop_compressed.layer_values(prop, k0, k1, cache)
+            # mask values not supported in Pandas:
+            values = np.ma.filled(values, fill_value=0 if prop.isdiscrete else np.nan)
+            dtype = np.float64 if doubleformat else np.float32
+            columns[prop.name] = _select(values).astype(dtype)
+
+        yield k0, k1, columns
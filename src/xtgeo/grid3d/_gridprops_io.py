@@ -1,13 +1,22 @@
 # -*- coding: utf-8 -*-
 """Import/export of grid properties (cf GridProperties class)"""
 
-from copy import deepcopy
+import io
+from concurrent.futures import ThreadPoolExecutor
+
 import xtgeo
 
 from xtgeo.grid3d import _gridprop_import_eclrun
+from xtgeo.grid3d import _gridprop_import_grdecl
+from xtgeo.grid3d import _gridprop_import_roff
+from xtgeo.grid3d import _grid_eclbin_index
+from xtgeo.grid3d import _grid_grdecl_stream
+from xtgeo.grid3d import _grid_roff_stream
+from xtgeo.grid3d import _grid_xtgeo_file
 
 from .grid_property import GridProperty
 from . import _grid3d_utils as utils
+from . import _gridprops_etc
 
 xtg = xtgeo.XTGeoDialog()
 
@@ -27,8 +36,85 @@ logger = xtg.functionlogger(__name__)
 # Note that there are keyword and data checks also in _gridprop_import_eclrun
 
 
+def import_roff(self, pfile, names=None, strict=(True, False), values=True, grid=None):
+    """Import several ROFF parameters in one pass, sharing one keyword scan."""
+
+    strictkeys, _ = strict
+
+    kwords = utils.scan_keywords(pfile, fformat="roff")
+    validnames = _gridprop_import_roff.roff_parameter_names(kwords)
+
+    if not names:
+        raise ValueError("Name list cannot be empty (None)")
+
+    if names == "all":
+        usenames = validnames
+    else:
+        usenames = []
+        for name in names:
+            if name in validnames:
+                usenames.append(name)
+            elif strictkeys:
+                msg = f"Requested keyword {name} is not in ROFF file, "
+                msg += f"valid entries are {list(validnames)}"
+                logger.warning(msg)
+                raise xtgeo.KeywordNotFoundError(msg)
+            else:
+                msg = f"Requested keyword {name} is not in ROFF file, "
+                msg += "will skip trying to read due to keyword <strict> settings."
+                logger.warning(msg)
+
+    props = [GridProperty() for _ in usenames]
+    _gridprop_import_roff.import_roff_many(
+        props, pfile, usenames, kwords=kwords, values=values, grid=grid
+    )
+
+    self.append_props(props)
+
+
+def import_grdecl(self, pfile, names=None, grid=None, strict=(True, False)):
+    """Import several GRDECL ASCII properties in one pass over the file."""
+
+    strictkeys, _ = strict
+
+    if not names or names == "all":
+        raise ValueError("A list of names is required for GRDECL import")
+
+    records = _grid_grdecl_stream.read_grdecl_keywords(pfile, names)
+
+    usenames = []
+    for name in names:
+        if name in records:
+            usenames.append(name)
+        elif strictkeys:
+            msg = f"Requested keyword {name} is not in GRDECL file"
+            logger.warning(msg)
+            raise xtgeo.KeywordNotFoundError(msg)
+        else:
+            msg = f"Requested keyword {name} is not in GRDECL file, "
+            msg += "will skip trying to read due to keyword <strict> settings."
+            logger.warning(msg)
+
+    props = [GridProperty() for _ in usenames]
+    _gridprop_import_grdecl.import_grdecl_props(
+        props, pfile, usenames, grid=grid, records=records
+    )
+
+    self.append_props(props)
+
+
 def import_ecl_output(
-    self, pfile, names=None, dates=None, grid=None, namestyle=0, strict=(True, False)
+    self,
+    pfile,
+    names=None,
+    dates=None,
+    grid=None,
+    namestyle=0,
+    strict=(True, False),
+    workers=1,
+    values=True,
+    compressed=False,
+    sidecar=True,
 ):
 
     strictkeys, strictdates = strict
@@ -43,47 +129,69 @@ def import_ecl_output(
         raise ValueError("Name list cannot be empty (None)")
 
     if dates is None:
-        _import_ecl_output_v2_init(self, pfile, names, grid, strictkeys)
+        _import_ecl_output_v2_init(
+            self,
+            pfile,
+            names,
+            grid,
+            strictkeys,
+            workers=workers,
+            values=values,
+            compressed=compressed,
+            sidecar=sidecar,
+        )
 
     else:
         _import_ecl_output_v2_rsta(
-            self, pfile, names, dates, grid, strictkeys, strictdates, namestyle
+            self,
+            pfile,
+            names,
+            dates,
+            grid,
+            strictkeys,
+            strictdates,
+            namestyle,
+            workers=workers,
+            values=values,
+            compressed=compressed,
+            sidecar=sidecar,
         )
 
 
-def _import_ecl_output_v2_init(self, pfile, names, grid, strict):
+def _import_ecl_output_v2_init(
+    self,
+    pfile,
+    names,
+    grid,
+    strict,
+    workers=1,
+    values=True,
+    compressed=False,
+    sidecar=True,
+):
     """Import INIT parameters"""
 
-    # scan valid keywords
-    kwlist = utils.scan_keywords(
-        pfile, fformat="xecl", maxkeys=100000, dataframe=True, dates=True
-    )
-
-    validnames = list()
+    # scan valid keywords (reusing an existing keyword index if possible)
+    kwlist = _grid_eclbin_index.EclKeywordIndex.from_file(pfile, sidecar=sidecar)
 
-    nact = grid.nactive
-    ntot = grid.ntotal
+    validsizes = _valid_sizes(grid)
 
-    if grid.dualporo:
-        nact *= 2
-        ntot *= 2
-
-    # get a list of valid property names
-    for kw in list(kwlist.itertuples(index=False, name=None)):
-        kwname, _, nlen, _, _ = kw
-        if nlen in (nact, ntot) and kwname not in validnames:
-            validnames.append(kwname)
+    # get valid property names, as an ordered dict for O(1) lookups
+    validnames = dict.fromkeys(
+        kwname for kwname, _, nlen, _, _ in kwlist.records if nlen in validsizes
+    )
 
     if names == "all":
-        usenames = deepcopy(validnames)
+        usenames = list(validnames)
     else:
         usenames = list(names)
 
+    entries = []
     for name in usenames:
         if name not in validnames:
             if strict:
                 msg = f"Requested keyword {name} is not in INIT file, but will try,"
-                msg += f"valid entries are {validnames}"
+                msg += f"valid entries are {list(validnames)}"
                 logger.warning(msg)
                 raise ValueError(msg)
             else:
@@ -92,12 +200,13 @@ def _import_ecl_output_v2_init(self, pfile, names, grid, strict):
                 logger.warning(msg)
                 continue
 
-        prop = GridProperty()
-        # use a private GridProperty function, since filehandle
-        _gridprop_import_eclrun.import_eclbinary(
-            prop, pfile, name=name, grid=grid, etype=1, _kwlist=kwlist,
-        )
+        entries.append((name, None, name))
 
+    props = _import_entries(
+        pfile, entries, grid, kwlist, 1, workers, values, compressed
+    )
+
+    for (name, _, _), prop in zip(entries, props):
         self._names.append(name)
         self._props.append(prop)
 
@@ -107,7 +216,18 @@ def _import_ecl_output_v2_init(self, pfile, names, grid, strict):
 
 
 def _import_ecl_output_v2_rsta(
-    self, pfile, names, dates, grid, strictkeycomb, strictdate, namestyle
+    self,
+    pfile,
+    names,
+    dates,
+    grid,
+    strictkeycomb,
+    strictdate,
+    namestyle,
+    workers=1,
+    values=True,
+    compressed=False,
+    sidecar=True,
 ):
     """Import RESTART parameters"""
 
@@ -115,10 +235,8 @@ def _import_ecl_output_v2_rsta(
         # dates may come on form 2020-12-22 or 20201222; process all to latter fmt
         dates = [str(thedate).replace("-", "") for thedate in dates]
 
-    # scan valid keywords with dates
-    kwlist = utils.scan_keywords(
-        pfile, fformat="xecl", maxkeys=100000, dataframe=True, dates=True
-    )
+    # scan valid keywords with dates (reusing an existing keyword index if possible)
+    kwlist = _grid_eclbin_index.EclKeywordIndex.from_file(pfile, sidecar=sidecar)
 
     validnamedatepairs, validdates = _process_valid_namesdates(kwlist, grid)
 
@@ -128,14 +246,14 @@ def _import_ecl_output_v2_rsta(
 
     usenamedatepairs = list()
     if names == "all" and dates == "all":
-        usenamedatepairs = deepcopy(validnamedatepairs)
+        usenamedatepairs = list(validnamedatepairs)
         usedates = dates
     else:
         if names == "all" and dates != "all":
-            usenames = [namedate[0] for namedate in validnamedatepairs]
+            usenames = list(dict.fromkeys(name for name, _ in validnamedatepairs))
             usedates = dates
         elif names != "all" and dates == "all":
-            usedates = [namedate[1] for namedate in validnamedatepairs]
+            usedates = list(validdates)
             usenames = names
         else:
             usedates = dates
@@ -145,7 +263,8 @@ def _import_ecl_output_v2_rsta(
             for date in usedates:
                 usenamedatepairs.append((name, date))
 
-    # Do the actual import
+    # Collect what to import
+    entries = []
     for namedate in usenamedatepairs:
         name, date = namedate
         skipentry = False
@@ -154,12 +273,12 @@ def _import_ecl_output_v2_rsta(
             # saturation keywords are a mess in Eclipse and friends; check later
             if strictkeycomb:
                 msg = f"Keyword data combo {name} {date} is not in RESTART file."
-                msg += f"Possible entries are: {validnamedatepairs}"
+                msg += f"Possible entries are: {list(validnamedatepairs)}"
                 msg += "Will still try to import..."
                 logger.warning(msg)
             else:
                 msg = f"Keyword data combo {name} {date} is not in RESTART file."
-                msg += f"Possible entries are: {validnamedatepairs}"
+                msg += f"Possible entries are: {list(validnamedatepairs)}"
                 msg += "Will skip attempt to import and just continue..."
                 logger.warning(msg)
                 skipentry = True
@@ -167,18 +286,19 @@ def _import_ecl_output_v2_rsta(
         if skipentry:
             continue
 
-        prop = GridProperty()
-
         usename = name + "_" + str(date)
         if namestyle == 1:
             sdate = str(date)
             usename = name + "--" + sdate[0:4] + "_" + sdate[4:6] + "_" + sdate[6:8]
 
-        # use a private GridProperty function, since filehandle
-        _gridprop_import_eclrun.import_eclbinary(
-            prop, pfile, name=name, date=date, grid=grid, etype=5, _kwlist=kwlist,
-        )
+        entries.append((name, date, usename))
+
+    # Do the actual import
+    props = _import_entries(
+        pfile, entries, grid, kwlist, 5, workers, values, compressed
+    )
 
+    for (_, date, usename), prop in zip(entries, props):
         self._names.append(usename)
         self._props.append(prop)
 
@@ -189,11 +309,54 @@ def _import_ecl_output_v2_rsta(
     self._nlay = grid.nlay
 
 
-def _process_valid_namesdates(kwlist, grid):
-    """Return lists with valid pairs, dates scanned from RESTART"""
-    validnamedatepairs = list()
-    validdates = list()
+def _import_entries(
+    pfile, entries, grid, kwlist, etype, workers, values=True, compressed=False
+):
+    """Import a list of (name, date, usename) entries, possibly concurrently.
 
+    All entries are disjoint records of the same file, so with workers > 1 they are
+    read and decoded by a thread pool, where each thread use its own file instance.
+    The result is a list of GridProperty instances, in the same order as entries.
+    If values is False, only metadata are read, and values are read on demand.
+    If compressed is True, values are stored for active cells only.
+    """
+
+    props = [GridProperty() for _ in entries]
+
+    def _import_one(prop, name, date, tfile):
+        # use a private GridProperty function, since filehandle
+        _gridprop_import_eclrun.import_eclbinary(
+            prop,
+            tfile,
+            name=name,
+            date=date,
+            grid=grid,
+            etype=etype,
+            values=values,
+            compressed=compressed,
+            _kwlist=kwlist,
+        )
+
+    # a memory stream has one shared file position, so it is always read serially
+    if workers is None or workers <= 1 or len(entries) <= 1 or pfile.memstream:
+        for (name, date, _), prop in zip(entries, props):
+            _import_one(prop, name, date, pfile)
+        return props
+
+    logger.info("Import %s entries using %s threads", len(entries), workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_import_one, prop, name, date, xtgeo._XTGeoFile(pfile.file))
+            for (name, date, _), prop in zip(entries, props)
+        ]
+        for future in futures:
+            future.result()  # in order, and will raise any exception
+
+    return props
+
+
+def _valid_sizes(grid):
+    """Return the record lengths that are valid for properties in the grid."""
     nact = grid.nactive
     ntot = grid.ntotal
 
@@ -201,13 +364,23 @@ def _process_valid_namesdates(kwlist, grid):
         nact *= 2
         ntot *= 2
 
-    for kw in list(kwlist.itertuples(index=False, name=None)):
-        kwname, _, nlen, _, date = kw
-        date = str(date)
-        if nlen in (nact, ntot) and (kwname, date) not in validnamedatepairs:
-            validnamedatepairs.append((kwname, date))
-        if nlen in (nact, ntot) and date not in validdates:
-            validdates.append(date)
+    return {nact, ntot}
+
+
+def _process_valid_namesdates(kwlist, grid):
+    """Return valid pairs and dates scanned from RESTART.
+
+    Both are returned as dicts (with None values) which keep the file order while
+    giving O(1) membership tests; dates are str on form YYYYMMDD.
+    """
+    validsizes = _valid_sizes(grid)
+
+    validnamedatepairs = dict.fromkeys(
+        (kwname, str(date))
+        for kwname, _, nlen, _, date in kwlist.records
+        if nlen in validsizes
+    )
+    validdates = dict.fromkeys(date for _, date in validnamedatepairs)
 
     return validnamedatepairs, validdates
 
@@ -223,7 +396,7 @@ def _process_sloppydates(dates, validdates):
         else:
             usedates.append(date)
     if not usedates:
-        msg = f"No valid dates given (dates: {dates} vs {validdates})"
+        msg = f"No valid dates given (dates: {dates} vs {list(validdates)})"
         xtg.error(msg)
         raise ValueError(msg)
 
@@ -232,3 +405,104 @@ def _process_sloppydates(dates, validdates):
         xtg.warn(msg)
 
     return usedates
+
+
+def export_roff(self, pfile, grid=None, append=False):
+    """Export all properties, optionally with the grid, to one ROFF binary file."""
+
+    pfile = xtgeo._XTGeoFile(pfile, mode="rb" if append else "wb")
+
+    # as for other formats, a new file (or stream) is made if none to append to
+    if pfile.memstream:
+        if append and pfile.file.seek(0, io.SEEK_END) == 0:
+            append = False
+    else:
+        pfile.check_folder(raiseerror=OSError)
+        if append and not pfile.exists():
+            append = False
+
+    _grid_roff_stream.export_roff(pfile, grid=grid, props=self.props, append=append)
+
+
+def import_xtgeo(self, pfile, names=None, dates=None, values=True):
+    """Import properties from a native xtgeo file."""
+
+    xfile = _grid_xtgeo_file.XTGeoGridFile(pfile.file)
+
+    wanted = xfile.select(names=names, dates=dates)
+    if names not in (None, "all"):
+        found = set(name for name, _ in wanted)
+        missing = [name for name in names if name not in found]
+        if missing:
+            raise xtgeo.KeywordNotFoundError(
+                "Cannot find properties {} in {}".format(missing, pfile.name)
+            )
+
+    props = []
+    for name, date in wanted:
+        prop = GridProperty()
+        xfile.load_property(prop, name, date=date, values=values)
+        props.append(prop)
+
+    self.append_props(props)
+
+
+def export_xtgeo(self, pfile, grid=None, compression=None):
+    """Export all properties, optionally with the grid, to a native xtgeo file."""
+
+    pfile = xtgeo._XTGeoFile(pfile, mode="wb")
+    if not pfile.memstream:
+        pfile.check_folder(raiseerror=OSError)
+
+    _grid_xtgeo_file.export_xtgeo(
+        pfile, grid=grid, props=self.props, compression=compression
+    )
+
+
+def _import_pyarrow():
+    """Return the pyarrow and pyarrow.parquet modules, which are optional."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError(
+            "The pyarrow package is required for Arrow and Parquet export"
+        )
+    return pyarrow, pyarrow.parquet
+
+
+def to_arrow_batches(self, **kwargs):
+    """Yield pyarrow RecordBatch for ranges of layers, see dataframe_batches().
+
+    The numpy columns are wrapped without copying.
+    """
+    pyarrow, _ = _import_pyarrow()
+
+    for k0, k1, columns in _gridprops_etc.dataframe_batches(self, **kwargs):
+        logger.info("Record batch for layers %s to %s", k0 + 1, k1)
+        arrays = [pyarrow.array(vector) for vector in columns.values()]
+        yield pyarrow.RecordBatch.from_arrays(arrays, names=list(columns))
+
+
+def to_parquet(self, pfile, compression="snappy", **kwargs):
+    """Export to a Parquet file, with one row group per range of layers."""
+    pyarrow, parquet = _import_pyarrow()
+
+    pfile = xtgeo._XTGeoFile(pfile, mode="wb")
+    if not pfile.memstream:
+        pfile.check_folder(raiseerror=OSError)
+
+    writer = None
+    try:
+        for batch in to_arrow_batches(self, **kwargs):
+            if writer is None:
+                writer = parquet.ParquetWriter(
+                    pfile.name, batch.schema, compression=compression
+                )
+            if batch.num_rows > 0:
+                writer.write_table(
+                    pyarrow.Table.from_batches([batch]), row_group_size=batch.num_rows,
+                )
+    finally:
+        if writer is not None:
+            writer.close()
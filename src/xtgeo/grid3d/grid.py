@@ -6,7 +6,6 @@ from __future__ import print_function, absolute_import
 import sys
 import json
 import warnings
-import hashlib
 from collections import OrderedDict
 
 import numpy as np
@@ -22,6 +21,10 @@ from . import _grid_import
 from . import _grid_export
 from . import _grid_refine
 from . import _grid_etc1
+from . import _grid_chunked
+from . import _grid_geomcache
+from . import _grid_cell_locator
+from . import _grid_active_mask
 from . import _grid_wellzone
 from . import _grid3d_fence
 from . import _grid_roxapi
@@ -48,7 +51,12 @@ logger = xtg.functionlogger(__name__)
 
 
 def grid_from_file(
-    gfile, fformat=None, initprops=None, restartprops=None, restartdates=None
+    gfile,
+    fformat=None,
+    initprops=None,
+    restartprops=None,
+    restartdates=None,
+    workers=1,
 ):
     """Read a grid (cornerpoint) from file and an returns a Grid() instance.
 
@@ -63,7 +71,14 @@ def grid_from_file(
 
     obj = Grid()
 
-    obj.from_file(gfile, fformat=fformat)
+    obj.from_file(
+        gfile,
+        fformat=fformat,
+        initprops=initprops,
+        restartprops=restartprops,
+        restartdates=restartdates,
+        workers=workers,
+    )
 
     return obj
 
@@ -190,21 +205,37 @@ class Grid(Grid3D):
         self._roxindexer = None
 
         # For storage of more private stuff in order to speed up certain functions
-        # See _grid3d_fence for instance; note! reset this if any kind of grid change!
+        # See _grid_cell_locator for instance; note! reset this if any grid change!
         self._tmp = {}
 
+        # Chunked (out-of-core) geometry; None or a dict, see set_chunked_geometry()
+        self._geomchunks = None
+
+        # Opt-in cache for geometry derived properties, see set_geometry_cache()
+        self._geomcache = None
+
+        # Counters for conversions between xtgformat 1 and 2, see xtgformat_stats
+        self._xtgformat_stats = {
+            "to_xtgformat1": 0,
+            "to_xtgformat2": 0,
+            "cache_hits": 0,
+            "seconds": 0.0,
+        }
+
         if len(args) == 1:
             # make an instance directly through import of a file
             fformat = kwargs.get("fformat", "guess")
             initprops = kwargs.get("initprops", None)
             restartprops = kwargs.get("restartprops", None)
             restartdates = kwargs.get("restartdates", None)
+            workers = kwargs.get("workers", 1)
             self.from_file(
                 args[0],
                 fformat=fformat,
                 initprops=initprops,
                 restartprops=restartprops,
                 restartdates=restartdates,
+                workers=workers,
             )
         else:
             # make a simple empty box grid (from version 2.13)
@@ -368,7 +399,7 @@ class Grid(Grid3D):
     @property
     def nactive(self):
         """int: Returns the number of active cells (read only)."""
-        return len(self.actnum_indices)
+        return self.get_active_mask().nactive
 
     @property
     def actnum_array(self):
@@ -400,6 +431,46 @@ class Grid(Grid3D):
         """Returns the total number of cells (read only)."""
         return self._ncol * self._nrow * self._nlay
 
+    @property
+    def chunklayers(self):
+        """Number of layers per chunk for chunked geometry, or None (read only).
+
+        See :meth:`set_chunked_geometry`.
+        """
+        if self._geomchunks is None:
+            return None
+        return self._geomchunks["layers"]
+
+    @property
+    def geometry_cache_stats(self):
+        """Statistics for the geometry cache as dict, or None (read only).
+
+        The keys are ``hits``, ``misses``, ``evictions`` (entries removed to
+        keep the memory budget), ``invalidations`` (times the cache was emptied
+        because the grid was changed), ``entries``, ``nbytes`` (memory in use)
+        and ``maxbytes`` (the budget). See :meth:`set_geometry_cache`.
+        """
+        if self._geomcache is None:
+            return None
+        return self._geomcache.stats
+
+    @property
+    def xtgformat_stats(self):
+        """Statistics on internal geometry format conversions, as dict (read only).
+
+        The geometry is stored internally in one of two formats, and
+        operations may need to convert between them. The other format is kept
+        as a cache until the geometry is changed, so repeated conversions are
+        avoided, except for chunked geometry (see :meth:`set_chunked_geometry`)
+        and very large grids. The dictionary has the keys ``to_xtgformat1`` and
+        ``to_xtgformat2`` (number of actual conversions), ``cache_hits``
+        (conversions avoided by the cache) and ``seconds`` (total time spent
+        in actual conversions).
+
+        .. versionadded:: 2.14
+        """
+        return dict(self._xtgformat_stats)
+
     @property
     def dualporo(self):
         """Boolean flag for dual porosity scheme (read only)."""
@@ -493,25 +564,18 @@ class Grid(Grid3D):
         return self._roxindexer
 
     def generate_hash(self):
-        """str: Return a unique hash ID for current grid; can e.g. be used to compare
-        two grid instances with same source.
+        """str: Return a unique hash ID for current grid geometry.
+
+        The hash is a fingerprint (blake2b) of the dimensions and the full
+        geometry, i.e. coordinates, z corners and active cells. Grids with equal
+        geometry get the same hash, regardless of file source. The hash is
+        computed once and reused until the grid is changed, so it can be used
+        as key for result caches or to detect duplicates.
 
         .. versionadded:: 2.10
+        .. versionchanged:: 2.14 The hash is made from the full geometry content.
         """
-
-        mhash = hashlib.sha256()
-        gid = "{}{}{}{}{}{}{}".format(
-            self._filesrc,
-            self._ncol,
-            self._nrow,
-            self._nlay,
-            self._coordsv.mean(),
-            self._zcornsv.mean(),
-            self._actnumsv.mean(),
-        )
-
-        mhash.update(gid.encode())
-        return mhash.hexdigest()
+        return _grid_etc1.generate_hash(self)
 
     # ==================================================================================
     # Create/import/export
@@ -555,7 +619,13 @@ class Grid(Grid3D):
         self._tmp = {}
 
     def from_file(
-        self, gfile, fformat=None, initprops=None, restartprops=None, restartdates=None
+        self,
+        gfile,
+        fformat=None,
+        initprops=None,
+        restartprops=None,
+        restartdates=None,
+        workers=1,
     ):
         """Import grid geometry from file, and makes an instance of this class.
 
@@ -573,6 +643,8 @@ class Grid(Grid3D):
                 special value "all" can be get all properties found in the INIT file
             restartprops (str list): Optional, see initprops
             restartdates (int list): Optional, required if restartprops
+            workers (int): Number of threads used when reading the INIT and UNRST
+                properties for "eclipserun"; default is 1 (serial)
 
         Example::
 
@@ -590,6 +662,8 @@ class Grid(Grid3D):
 
         Raises:
             OSError: if file is not found etc
+
+        .. versionadded:: 2.14 Added workers key
         """
 
         gfile = xtgeo._XTGeoFile(gfile, mode="rb")
@@ -601,6 +675,7 @@ class Grid(Grid3D):
             initprops=initprops,
             restartprops=restartprops,
             restartdates=restartdates,
+            workers=workers,
         )
         self._tmp = {}
 
@@ -612,7 +687,9 @@ class Grid(Grid3D):
         Args:
             gfile (str): Name of output file
             fformat (str): File format; roff/roff_binary/roff_ascii/
-                grdecl/bgrdecl/egrid.
+                grdecl/bgrdecl/egrid/xtgeo. The native xtgeo format includes
+                the grid properties attached to the grid (:attr:`gridprops`), see
+                :class:`XTGeoGridFile`.
 
         Raises:
             OSError: Directory does not exist
@@ -636,7 +713,6 @@ class Grid(Grid3D):
         elif fformat == "egrid":
             _grid_export.export_egrid(self, gfile.name)
         elif fformat == "xtgeo":
-            # experimental
             _grid_export.export_xtgeo(self, gfile.name)
         else:
             raise SystemExit("Invalid file format")
@@ -702,6 +778,70 @@ class Grid(Grid3D):
             stacklevel=2,
         )
 
+    def set_chunked_geometry(self, layers=64, folder=None, memmap=True):
+        """Use chunked, optionally memory mapped (out-of-core), grid geometry.
+
+        For very large grids the corner point geometry may not fit in memory.
+        In chunked mode the ZCORN and ACTNUM arrays are partitioned in ranges of
+        layers, and stored in memory mapped files (unless memmap is False). The
+        methods :meth:`get_dz`, :meth:`get_xyz`, :meth:`get_bulk_volume` and
+        :meth:`get_layer_slice` then process one range of layers at a time,
+        so only the geometry for one chunk is read into memory.
+
+        Other operations work as before, but may load the full geometry into
+        memory temporarily. The geometry is stored in memory mapped files again
+        on next chunked computation.
+
+        Args:
+            layers (int): Number of layers in each chunk. Use None to turn off
+                chunked mode and load the geometry into memory.
+            folder (str or Path): Folder for the memory mapped files. Default is
+                a temporary folder, which is removed when the grid instance is
+                deleted. Files in a given folder are not removed.
+            memmap (bool): If False, keep the geometry in memory but still do
+                computations in chunks, which limits the temporary memory use.
+
+        Example::
+
+            grd = xtgeo.Grid("hugegrid.EGRID")
+            grd.set_chunked_geometry(layers=20)
+            dz = grd.get_dz()
+
+        .. versionadded:: 2.14
+        """
+        _grid_chunked.set_chunked(self, layers, folder=folder, memmap=memmap)
+
+    def set_geometry_cache(self, maxbytes=_grid_geomcache.DEFAULT_MAXBYTES):
+        """Keep results of geometry computations for reuse (opt-in).
+
+        With the cache, repeated calls to :meth:`get_dz`, :meth:`get_dxdy`,
+        :meth:`get_xyz`, :meth:`get_bulk_volume`, :meth:`get_geometrics` and
+        :meth:`get_gridquality_properties` with the same arguments return a copy
+        of the first result instead of computing again. The cache is emptied
+        when the grid is changed, e.g. by :meth:`crop`, :meth:`make_zconsistent`,
+        :meth:`translate_coordinates` or :meth:`set_actnum`. Note that changing
+        the internal arrays directly is not detected.
+
+        Args:
+            maxbytes (int): Memory budget in bytes, default 1 GB. The least
+                recently used results are removed when the budget is exceeded.
+                Use None to turn off the cache.
+
+        Example::
+
+            grd = xtgeo.Grid("reek.roff")
+            grd.set_geometry_cache(maxbytes=500e6)
+            dz = grd.get_dz()
+            dz = grd.get_dz()  # from cache
+            print(grd.geometry_cache_stats["hits"])
+
+        .. versionadded:: 2.14
+        """
+        if maxbytes is None:
+            self._geomcache = None
+        else:
+            self._geomcache = _grid_geomcache.GeometryCache(maxbytes)
+
     def copy(self):
         """Copy from one existing Grid instance to a new unique instance.
 
@@ -1005,6 +1145,8 @@ class Grid(Grid3D):
         """Returns the 1D ndarray which holds the indices for active cells
         given in 1D, C or F order.
         """
+        if order == "C":
+            return np.array(self.get_active_mask().indices)
 
         actnumv = self.get_actnum().values.copy(order=order)
         actnumv = np.ravel(actnumv, order="K")
@@ -1108,6 +1250,26 @@ class Grid(Grid3D):
         # return the object
         return act
 
+    def get_active_mask(self):
+        """Return the mask of inactive cells, shared by the grid properties.
+
+        The mask is made once and kept until ACTNUM or the grid is changed. Grid
+        properties imported or made for this grid (e.g. Eclipse INIT/UNRST and
+        GRDECL import) use this mask, instead of each having its own copy.
+
+        Returns:
+            An ActiveMask instance (immutable)
+
+        Example::
+
+            grd = xtgeo.Grid("REEK.EGRID")
+            amask = grd.get_active_mask()
+            print(amask.nactive, amask.mask.shape)
+
+        .. versionadded:: 2.14
+        """
+        return _grid_active_mask.get_active_mask(self)
+
     def set_actnum(self, actnum):
         """Modify the existing active cell index, ACTNUM.
 
@@ -1128,8 +1290,9 @@ class Grid(Grid3D):
             self._actnumsv = _gridprop_lowlevel.c2f_order(self, val1d)
         else:
             self._actnumsv = np.ma.filled(actnum.values, fill_value=0).astype(np.int32)
+        self._tmp = {}
 
-    def get_dz(self, name="dZ", flip=True, asmasked=True, mask=None):
+    def get_dz(self, name="dZ", flip=True, asmasked=True, mask=None, nthreads=None):
         """
         Return the dZ as GridProperty object.
 
@@ -1142,18 +1305,29 @@ class Grid(Grid3D):
                 (experimental)
             asmasked (bool): True if only for active cells, False for all cells
             mask (bool): Deprecated, use asmasked instead!
+            nthreads (int): Number of threads for this call; default is the
+                setting from :func:`xtgeo.set_num_threads`.
 
         Returns:
             A XTGeo GridProperty object dZ
+
+        .. versionchanged:: 2.14 Added nthreads
         """
         if mask is not None:
             asmasked = self._evaluate_mask(mask)
 
-        deltaz = _grid_etc1.get_dz(self, name=name, flip=flip, asmasked=asmasked)
+        deltaz = _grid_geomcache.cached(
+            self,
+            _grid_etc1.get_dz,
+            name=name,
+            flip=flip,
+            asmasked=asmasked,
+            nthreads=nthreads,
+        )
 
         return deltaz
 
-    def get_dxdy(self, names=("dX", "dY"), asmasked=False):
+    def get_dxdy(self, names=("dX", "dY"), asmasked=False, nthreads=None):
         """
         Return the dX and dY as GridProperty object.
 
@@ -1163,12 +1337,18 @@ class Grid(Grid3D):
             name (tuple): names of properties
             asmasked (bool). If True, make a np.ma array where inactive cells
                 are masked.
+            nthreads (int): Number of threads for this call; default is the
+                setting from :func:`xtgeo.set_num_threads`.
 
         Returns:
             Two XTGeo GridProperty objects (dx, dy)
+
+        .. versionchanged:: 2.14 Added nthreads
         """
 
-        deltax, deltay = _grid_etc1.get_dxdy(self, names=names, asmasked=asmasked)
+        deltax, deltay = _grid_geomcache.cached(
+            self, _grid_etc1.get_dxdy, names=names, asmasked=asmasked, nthreads=nthreads
+        )
 
         # return the property objects
         return deltax, deltay
@@ -1217,7 +1397,9 @@ class Grid(Grid3D):
 
         return vol
 
-    def get_bulk_volume(self, name="bulkvol", asmasked=True, precision=2):
+    def get_bulk_volume(
+        self, name="bulkvol", asmasked=True, precision=2, nthreads=None
+    ):
         """
         Return the geometric cell volume for all cells as a GridProperty object.
 
@@ -1238,16 +1420,24 @@ class Grid(Grid3D):
             precision (int): An number indication precision level, where
                 a higher number means increased precision but also increased computing
                 time. Currently 1, 2 (default), 4 are supported.
+            nthreads (int): Number of threads for this call; default is the
+                setting from :func:`xtgeo.set_num_threads`.
 
         Returns:
             XTGeo GridProperty object
 
         .. versionadded:: 2.13.0 (as experimental)
+        .. versionchanged:: 2.14 Added nthreads
 
         """
 
-        return _grid_etc1.get_bulk_volume(
-            self, name=name, asmasked=asmasked, precision=precision
+        return _grid_geomcache.cached(
+            self,
+            _grid_etc1.get_bulk_volume,
+            name=name,
+            asmasked=asmasked,
+            precision=precision,
+            nthreads=nthreads,
         )
 
     def get_indices(self, names=("I", "J", "K")):
@@ -1293,6 +1483,27 @@ class Grid(Grid3D):
         # return the objects
         return ixc, jyc, kzc
 
+    def get_cell_locator(self):
+        """Return a cell locator, for fast lookup of cells from XYZ points.
+
+        Making the locator has a cost, so it is kept and reused until the grid
+        geometry or ACTNUM is changed. The locator is used by
+        :meth:`get_ijk_from_points`, :meth:`get_randomline` and
+        :meth:`Well.make_ijk_from_grid`.
+
+        Returns:
+            A GridCellLocator instance
+
+        Example::
+
+            grd = xtgeo.Grid("REEK.EGRID")
+            locator = grd.get_cell_locator()
+            iarr, jarr, karr = locator.get_ijk(xarr, yarr, zarr)
+
+        .. versionadded:: 2.14
+        """
+        return _grid_cell_locator.get_locator(self)
+
     def get_ijk_from_points(
         self,
         points,
@@ -1339,7 +1550,13 @@ class Grid(Grid3D):
         # return the dataframe or list of tuples
         return ijklist
 
-    def get_xyz(self, names=("X_UTME", "Y_UTMN", "Z_TVDSS"), asmasked=True, mask=None):
+    def get_xyz(
+        self,
+        names=("X_UTME", "Y_UTMN", "Z_TVDSS"),
+        asmasked=True,
+        mask=None,
+        nthreads=None,
+    ):
         """Returns 3 xtgeo.grid3d.GridProperty objects: x coordinate,
         ycoordinate, zcoordinate.
 
@@ -1353,13 +1570,17 @@ class Grid(Grid3D):
             Y_UTMN, Z_TVDSS).
             asmasked: If True, then inactive cells is masked (numpy.ma).
             mask (bool): Deprecated, use asmasked instead!
+            nthreads (int): Number of threads for this call; default is the
+                setting from :func:`xtgeo.set_num_threads`.
+
+        .. versionchanged:: 2.14 Added nthreads
         """
 
         if mask is not None:
             asmasked = self._evaluate_mask(mask)
 
-        xcoord, ycoord, zcoord = _grid_etc1.get_xyz(
-            self, names=names, asmasked=asmasked
+        xcoord, ycoord, zcoord = _grid_geomcache.cached(
+            self, _grid_etc1.get_xyz, names=names, asmasked=asmasked, nthreads=nthreads
         )
 
         # return the objects
@@ -1449,6 +1670,87 @@ class Grid(Grid3D):
         # return the 24 objects in a long tuple (x1, y1, z1, ... x8, y8, z8)
         return grid_props
 
+    def get_cell_corners(self, indices=None, activeonly=False, nthreads=None):
+        """Return X Y Z corners for many cells as a numpy array.
+
+        This is much faster than calling :meth:`get_xyz_cell_corners` per cell,
+        as all cells are computed in one pass. The corner numbering is as in
+        :meth:`get_xyz_cell_corners`.
+
+        Args:
+            indices: Cells to use; None (default) for all cells, a boolean array
+                with one entry per cell (e.g. shape (ncol, nrow, nlay)), or an
+                array of cell numbers in C order, starting from 0.
+            activeonly (bool): If True, inactive cells are skipped.
+            nthreads (int): Number of threads for this call; default is the
+                setting from :func:`xtgeo.set_num_threads`.
+
+        Returns:
+            A numpy array with shape (ncells, 8, 3), with X Y Z for the 8
+            corners of each cell.
+
+        Example::
+
+            >>> grid = Grid()
+            >>> grid.from_file("gullfaks2.roff")
+            >>> poro = GridProperty("gullfaks2_poro.roff", grid=grid, name="PORO")
+            >>> corners = grid.get_cell_corners(indices=poro.values > 0.3)
+
+        .. versionadded:: 2.14
+        """
+
+        return _grid_etc1.get_cell_corners(
+            self, indices=indices, activeonly=activeonly, nthreads=nthreads
+        )
+
+    def get_cell_volumes(
+        self,
+        indices=None,
+        activeonly=False,
+        precision=2,
+        centroids=False,
+        nthreads=None,
+    ):
+        """Return bulk volume, and optionally centroid, for many cells.
+
+        This is much faster than calling :meth:`get_cell_volume` per cell, as all
+        cells are computed in one pass. Cells are selected as in
+        :meth:`get_cell_corners`.
+
+        Args:
+            indices: Cells to use; None (default) for all cells, a boolean array
+                with one entry per cell (e.g. shape (ncol, nrow, nlay)), or an
+                array of cell numbers in C order, starting from 0.
+            activeonly (bool): If True, inactive cells are skipped.
+            precision (int): Precision level for the volume, as in
+                :meth:`get_bulk_volume`. Currently 1, 2 (default), 4 are supported.
+            centroids (bool): If True, also return the cell centroids, as the
+                average of the 8 corners.
+            nthreads (int): Number of threads for this call; default is the
+                setting from :func:`xtgeo.set_num_threads`.
+
+        Returns:
+            A numpy array with the volume of each cell, and if centroids is True,
+            also a numpy array with shape (ncells, 3) with the centroids.
+
+        Example::
+
+            >>> grid = Grid()
+            >>> grid.from_file("gullfaks2.roff")
+            >>> vols, centers = grid.get_cell_volumes(activeonly=True, centroids=True)
+
+        .. versionadded:: 2.14
+        """
+
+        return _grid_etc1.get_cell_volumes(
+            self,
+            indices=indices,
+            activeonly=activeonly,
+            precision=precision,
+            centroids=centroids,
+            nthreads=nthreads,
+        )
+
     def get_layer_slice(self, layer, top=True, activeonly=True):
         """Get numpy arrays for cell coordinates e.g. for plotting.
 
@@ -1514,8 +1816,9 @@ class Grid(Grid3D):
 
         """
 
-        gresult = _grid_etc1.get_geometrics(
+        gresult = _grid_geomcache.cached(
             self,
+            _grid_etc1.get_geometrics,
             allcells=allcells,
             cellcenter=cellcenter,
             return_dict=return_dict,
@@ -1574,7 +1877,7 @@ class Grid(Grid3D):
 
         """
 
-        gprops = _grid_etc1.get_gridquality_properties(self)
+        gprops = _grid_geomcache.cached(self, _grid_etc1.get_gridquality_properties)
 
         return gprops
 
@@ -5,7 +5,6 @@ from __future__ import division, absolute_import
 from __future__ import print_function
 
 import warnings
-import hashlib
 
 import xtgeo
 from xtgeo.common import XTGeoDialog
@@ -15,6 +14,7 @@ from ._grid3d import Grid3D
 from .grid_property import GridProperty
 
 from . import _gridprops_io
+from . import _gridprop_compressed
 from . import _grid3d_utils as utils
 from . import _gridprops_etc
 from . import _grid_etc1
@@ -225,25 +225,15 @@ class GridProperties(Grid3D):
     def generate_hash(self):
         """str: Return a unique hash ID for current gridproperties instance.
 
+        The hash is made from the name and the content hash of each property,
+        cf. :meth:`GridProperty.generate_hash`.
+
         .. versionadded:: 2.10
+        .. versionchanged:: 2.14 The hash is made from the full values content.
         """
-
-        mhash = hashlib.sha256()
-
-        hashinput = ""
-        for prop in self._props:
-            gid = "{}{}{}{}{}{}".format(
-                prop.ncol,
-                prop.nrow,
-                prop.nlay,
-                prop.values.mean(),
-                prop.values.min(),
-                prop.values.max(),
-            )
-            hashinput += gid
-
-        mhash.update(hashinput.encode())
-        return mhash.hexdigest()
+        return utils.content_hash(
+            *[(prop.name, prop.generate_hash()) for prop in self._props]
+        )
 
     def get_prop_by_name(self, name, raiseserror=True):
         """Find and return a property object (GridProperty) by name.
@@ -350,20 +340,31 @@ class GridProperties(Grid3D):
         grid=None,
         namestyle=0,
         strict=(True, False),
+        workers=1,
+        values=True,
+        compressed=False,
+        sidecar=True,
     ):
         """Import grid properties from file in one go.
 
-        This class is particulary useful for Eclipse INIT and RESTART files.
+        This class is particulary useful for Eclipse INIT and RESTART files,
+        and for ROFF files with many parameters, where the file is scanned once
+        and all requested properties are read in a single pass.
 
         In case of names='all' then all vectors which have a valid length
         (number of total or active cells in the grid) will be read
 
+        For Eclipse INIT and UNRST files, the keyword and date scan is stored as
+        an :class:`EclKeywordIndex` in a small sidecar file (``.<filename>.xtgidx``)
+        which is reused as long as the file is unchanged, see the sidecar key.
+
         Args:
             pfile (str or Path): Name of file with properties
-            fformat (str): roff/init/unrst
+            fformat (str): roff/init/unrst/grdecl/xtgeo
             names: list of property names, e.g. ['PORO', 'PERMX'] or 'all'
             dates: list of dates on YYYYMMDD format, for restart files, or 'all'
-            grid (obj): The grid geometry object (optional if ROFF)
+            grid (obj): The grid geometry object (optional if ROFF). For ROFF
+                the values will then share the active mask of the grid.
             namestyle (int): 0 (default) for style SWAT_20110223,
                 1 for SWAT--2011_02_23 (applies to restart only)
             strict (tuple of (bool, bool)): If (True, False) (default) then an
@@ -374,6 +375,20 @@ class GridProperties(Grid3D):
                 means that that only valid entries are imported, more or less silently.
                 Saturations keywords SWAT/SOIL/SGAS are not evaluated as they may be
                 derived.
+            workers (int): Number of threads for reading Eclipse INIT/UNRST
+                records concurrently; default is 1 (serial). The result is the same
+                as for serial reading, in the same order.
+            values (bool): If True (default), the values are read. If False, only
+                metadata (names, dates, codes, dimensions) are read, and values
+                for each property are read on first access. See
+                :meth:`GridProperty.load_values` and :meth:`GridProperty.unload`.
+            compressed (bool): If True, values are stored for active cells only,
+                which saves much memory for e.g. many restart steps in grids
+                with many inactive cells. See :meth:`GridProperty.compress`.
+            sidecar (bool): If True (default), the keyword index for Eclipse INIT
+                and UNRST files is read from, or written to, a sidecar file next
+                to the file. Use False for e.g. read only or shared folders; the
+                index is then kept in memory only.
 
         Example::
             >>> props = GridProperties()
@@ -387,6 +402,13 @@ class GridProperties(Grid3D):
             KeywordFoundDateNotFoundError: The keyword but not date found
 
         .. versionadded:: 2.13.0 Added strict key
+        .. versionchanged:: 2.14.0 ROFF import of several properties is done in one
+           pass, and names="all" is supported for ROFF
+        .. versionadded:: 2.14.0 Added workers and values keys
+        .. versionadded:: 2.14.0 Added compressed key
+        .. versionadded:: 2.14.0 Added sidecar key
+        .. versionadded:: 2.14.0 Several properties from a GRDECL file, in one pass
+        .. versionadded:: 2.14.0 Native xtgeo format, see :class:`XTGeoGridFile`
         """
 
         pfile = xtgeo._XTGeoFile(pfile, mode="rb")
@@ -412,10 +434,19 @@ class GridProperties(Grid3D):
         pfile.check_file(raiseerror=OSError)
 
         if fformat.lower() == "roff":
-            lst = list()
-            for name in names:
-                lst.append(GridProperty(pfile, fformat="roff", name=name))
-            self.append_props(lst)
+            _gridprops_io.import_roff(
+                self, pfile, names=names, strict=strict, values=values, grid=grid
+            )
+
+        elif fformat.lower() == "xtgeo":
+            _gridprops_io.import_xtgeo(
+                self, pfile, names=names, dates=dates, values=values
+            )
+
+        elif fformat.lower() == "grdecl":
+            _gridprops_io.import_grdecl(
+                self, pfile, names=names, grid=grid, strict=strict
+            )
 
         elif fformat.lower() in ("init", "unrst"):
             _gridprops_io.import_ecl_output(
@@ -426,19 +457,57 @@ class GridProperties(Grid3D):
                 names=names,
                 namestyle=namestyle,
                 strict=strict,
+                workers=workers,
+                values=values,
+                compressed=compressed,
+                sidecar=sidecar,
             )
         else:
             raise OSError("Invalid file format")
 
-    def to_file(self, pfile, fformat="roff"):
-        """Export grid property to file. NB not working!
+        if compressed:
+            # Eclipse records are read as compressed directly, other are done here,
+            # or when values are loaded if values are not read
+            for prop in self._props:
+                _gridprop_compressed.compress_when_loaded(prop, grid)
+
+    def to_file(self, pfile, fformat="roff", grid=None, append=False, compression=None):
+        """Export all grid properties, optionally with the grid, to one file.
+
+        The file is written in one pass through one open file, where the arrays
+        are converted and written for a range of grid columns (roff) or layers
+        (xtgeo) at a time.
 
         Args:
-            pfile (str): file name
-            fformat (str): file format to be used (roff is the only supported)
-            mode (int): 0 for binary ROFF, 1 for ASCII
+            pfile (str or Path or BytesIO): Output file.
+            fformat (str): File format, roff (binary) or xtgeo. The native xtgeo
+                format can be read in part (e.g. one property or a range of
+                layers), see :class:`XTGeoGridFile`.
+            grid (Grid): If given, the grid geometry is written first, and the
+                properties follow in the same file.
+            append (bool): If True, the properties are appended to an existing
+                ROFF binary file with the same dimensions. Only the header and
+                the end of the file are read, the file is not scanned. Not valid
+                for the xtgeo format.
+            compression (str): For the xtgeo format, None (default) or "zlib".
+
+        Example::
+
+            grd = xtgeo.Grid("reek.roff")
+            props = xtgeo.GridProperties()
+            props.from_file("reek.roff", names=["PORO", "PERMX"], grid=grd)
+            props.to_file("reek_all.roff", grid=grd)
+
+        .. versionchanged:: 2.14 Implemented for binary ROFF and xtgeo formats
         """
-        raise NotImplementedError("Not implented yet!")
+        if fformat in ("roff", "roff_binary", "roff_bin", "roffbin"):
+            _gridprops_io.export_roff(self, pfile, grid=grid, append=append)
+        elif fformat == "xtgeo":
+            if append:
+                raise ValueError("Cannot append to a file in xtgeo format")
+            _gridprops_io.export_xtgeo(self, pfile, grid=grid, compression=compression)
+        else:
+            raise ValueError("Cannot export, invalid fformat: {}".format(fformat))
 
     def get_dataframe(
         self, activeonly=False, ijk=False, xyz=False, doubleformat=False, grid=None
@@ -484,6 +553,99 @@ class GridProperties(Grid3D):
 
     dataframe = get_dataframe  # for compatibility, but deprecated
 
+    def to_arrow_batches(
+        self,
+        activeonly=False,
+        ijk=False,
+        xyz=False,
+        doubleformat=False,
+        grid=None,
+        layers=None,
+    ):
+        """Yield pyarrow RecordBatch objects for ranges of layers.
+
+        The columns are the same as for :meth:`get_dataframe`, but only one range
+        of layers is made at a time, so the memory use is bounded also for large
+        grids. The rows are in C order within each batch, and the batches follow
+        the layers. The numpy arrays are handed over to Arrow without copying.
+
+        Requires the (optional) pyarrow package.
+
+        Args:
+            activeonly (bool): If True, return only active cells.
+            ijk (bool): If True, include cell indices, IX JY KZ columns
+            xyz (bool): If True, include cell center coordinates (needs grid).
+            doubleformat (bool): If True, floats are 64 bit, otherwise 32 bit.
+            grid (Grid): The grid geometry object. This is required for the
+                xyz option.
+            layers (int): Number of layers per batch. Default is a number of
+                layers giving about one million cells per batch.
+
+        Example::
+
+            for batch in props.to_arrow_batches(xyz=True, grid=grd):
+                print(batch.num_rows)
+
+        .. versionadded:: 2.14
+        """
+        return _gridprops_io.to_arrow_batches(
+            self,
+            activeonly=activeonly,
+            ijk=ijk,
+            xyz=xyz,
+            doubleformat=doubleformat,
+            grid=grid,
+            layers=layers,
+        )
+
+    def to_parquet(
+        self,
+        pfile,
+        activeonly=False,
+        ijk=False,
+        xyz=False,
+        doubleformat=False,
+        grid=None,
+        layers=None,
+        compression="snappy",
+    ):
+        """Export the properties to a Parquet file, one row group per layer range.
+
+        The file is written batch by batch, see :meth:`to_arrow_batches`, and
+        can be read by Arrow based tools (pyarrow, pandas, polars, duckdb, ...).
+
+        Requires the (optional) pyarrow package.
+
+        Args:
+            pfile (str or Path or BytesIO): Output file.
+            activeonly (bool): If True, export only active cells.
+            ijk (bool): If True, include cell indices, IX JY KZ columns
+            xyz (bool): If True, include cell center coordinates (needs grid).
+            doubleformat (bool): If True, floats are 64 bit, otherwise 32 bit.
+            grid (Grid): The grid geometry object. This is required for the
+                xyz option.
+            layers (int): Number of layers per row group, see
+                :meth:`to_arrow_batches`.
+            compression (str): Parquet compression, default is "snappy".
+
+        Example::
+
+            props.to_parquet("reek.parquet", activeonly=True, xyz=True, grid=grd)
+
+        .. versionadded:: 2.14
+        """
+        _gridprops_io.to_parquet(
+            self,
+            pfile,
+            compression=compression,
+            activeonly=activeonly,
+            ijk=ijk,
+            xyz=xyz,
+            doubleformat=doubleformat,
+            grid=grid,
+            layers=layers,
+        )
+
     # Static methods (scans etc)
     # Don't make a GridProperties instance inside other XTGeo classes
     # as it make cyclic imports. I.e. use only these functions in clients
@@ -525,6 +687,10 @@ class GridProperties(Grid3D):
             >>> props = GridProperties()
             >>> dlist = props.scan_keywords('ECL.UNRST')
 
+        Note:
+            For repeated lookups in Eclipse files, the :class:`EclKeywordIndex`
+            (``xtgeo.grid3d.EclKeywordIndex.from_file(...)``) is faster, as it is
+            made once and then reused, also across processes via a sidecar file.
         """
 
         pfile = xtgeo._XTGeoFile(pfile)
@@ -5,7 +5,6 @@ from __future__ import print_function, absolute_import
 
 import copy
 import numbers
-import hashlib
 from types import FunctionType
 
 import numpy as np
@@ -19,6 +18,9 @@ from . import _gridprop_import
 from . import _gridprop_roxapi
 from . import _gridprop_export
 from . import _gridprop_lowlevel
+from . import _gridprop_compressed
+from . import _grid_active_mask
+from . import _grid3d_utils
 
 xtg = xtgeo.common.XTGeoDialog()
 logger = xtg.functionlogger(__name__)
@@ -53,6 +55,7 @@ def gridproperty_from_file(
     gridlink=True,
     date=None,
     fracture=False,
+    values=True,
 ):
     """Make a GridProperty instance directly from file import.
 
@@ -77,6 +80,7 @@ def gridproperty_from_file(
         gridlink=gridlink,
         date=date,
         fracture=fracture,
+        values=values,
     )
 
     return obj
@@ -212,6 +216,16 @@ class GridProperty(Grid3D):
         self._roxorigin = False  # true if the object comes from the ROXAPI
         self._roxar_dtype = kwargs.get("roxar_dtype", np.float32)
 
+        # values may be loaded on demand; the source has file, byte position etc.
+        self._isloaded = True
+        self._valuesource = None
+        self._dtype = None  # dtype of values not loaded, recorded at import
+        self._hash = None  # content hash, see generate_hash()
+
+        # values for active cells only, see compress()
+        self._activev = None
+        self._activeindex = None
+
         self._values = kwargs.get("values", None)
 
         if len(args) == 1:
@@ -289,9 +303,13 @@ class GridProperty(Grid3D):
         given in 1D, C order (read only).
 
         """
-        actnumv = self.get_actnum()
-        actnumv = np.ravel(actnumv.values)
-        self._actnum_indices = np.flatnonzero(actnumv)
+        self.load_values()
+        if self._activev is not None:
+            self._actnum_indices = np.array(self._activeindex)
+        else:
+            actnumv = self.get_actnum()
+            actnumv = np.ravel(actnumv.values)
+            self._actnum_indices = np.flatnonzero(actnumv)
 
         return self._actnum_indices
 
@@ -335,6 +353,10 @@ class GridProperty(Grid3D):
 
 
         """
+        if not self._isloaded:
+            return np.dtype(self._dtype)  # as recorded at import
+        if self._activev is not None:
+            return self._activev.dtype
         return self._values.dtype
 
     @dtype.setter
@@ -345,7 +367,7 @@ class GridProperty(Grid3D):
         okv = True
         if self.isdiscrete:
             if dtype in allowedint:
-                self.values = self.values.astype(dtype)
+                _gridprop_compressed.astype(self, dtype)
             else:
                 okv = False
                 msg = "{}: Wrong input for dtype. Use one of {}!".format(
@@ -353,7 +375,7 @@ class GridProperty(Grid3D):
                 )
         else:
             if dtype in allowedfloat:
-                self.values = self.values.astype(dtype)
+                _gridprop_compressed.astype(self, dtype)
             else:
                 okv = False
                 msg = "{}: Wrong input for dtype. Use one of {}!".format(
@@ -401,6 +423,9 @@ class GridProperty(Grid3D):
     @property
     def codes(self):
         """The property codes as a dictionary."""
+        if self._codes is None:
+            # codes for Eclipse discrete properties are made from the values
+            self.load_values()
         return self._codes
 
     @codes.setter
@@ -410,12 +435,35 @@ class GridProperty(Grid3D):
     @property
     def ncodes(self):
         """Number of codes if discrete grid property (read only)."""
-        return len(self._codes)
+        return len(self.codes)
+
+    @property
+    def _values(self):
+        # values not loaded (cf. from_file with values=False) are read on first access
+        if not self._isloaded:
+            self.load_values()
+        # compressed values (active cells only) are expanded on first access
+        if self._activev is not None:
+            self._values = _gridprop_compressed.expand(self)
+        return self._valuesv
+
+    @_values.setter
+    def _values(self, values):
+        self._valuesv = values
+        self._activev = None
+        self._activeindex = None
+        self._hash = None
 
     @property
     def values(self):
-        """ Return or set the grid property as a masked 3D numpy array"""
-        return self._values
+        """Return or set the grid property as a masked 3D numpy array
+
+        .. versionchanged:: 2.14 The mask may be shared with the grid (see
+           :meth:`Grid.get_active_mask`) until the values are accessed here.
+        """
+        values = self._values
+        _grid_active_mask.unshare(values)  # values and mask may be changed in place
+        return values
 
     @values.setter
     def values(self, values):
@@ -424,6 +472,52 @@ class GridProperty(Grid3D):
 
         self._values = values
 
+    @property
+    def iscompressed(self):
+        """bool: True if values are stored for active cells only (read only).
+
+        See :meth:`compress`.
+
+        .. versionadded:: 2.14
+        """
+        if not self._isloaded:
+            # values not loaded are compressed when loaded, if requested at import
+            return self._valuesource.get("compressed", False)
+        return self._activev is not None
+
+    @property
+    def active_values(self):
+        """Return or set the values of the active cells, as 1D numpy array (C order).
+
+        For a compressed property (see :meth:`compress`) this is the stored array,
+        so changes in place are kept. Otherwise a copy is returned. Setting will
+        update the active cells, and keep a compressed property compressed, hence
+        this is the way to do arithmetic on compressed properties::
+
+            poro.active_values *= 0.95
+            poro.active_values = np.clip(poro.active_values, 0.0, 0.4)
+
+        .. versionadded:: 2.14
+        """
+        self.load_values()
+        if self._activev is not None:
+            return self._activev
+        return self._values.compressed()
+
+    @active_values.setter
+    def active_values(self, values):
+        self.load_values()
+        if self._activev is not None:
+            if values is not self._activev:
+                self._activev = np.array(
+                    np.broadcast_to(values, self._activev.shape),
+                    dtype=self._activev.dtype,
+                )
+        else:
+            allvalues = self.values
+            allvalues[~np.ma.getmaskarray(allvalues)] = values
+        self._hash = None
+
     @property
     def ntotal(self):
         """Returns total number of cells ncol*nrow*nlay (read only)"""
@@ -444,7 +538,7 @@ class GridProperty(Grid3D):
     @property
     def values3d(self):
         """For backward compatibility (use values instead)"""
-        return self._values
+        return self.values
 
     @values3d.setter
     def values3d(self, values):
@@ -454,7 +548,7 @@ class GridProperty(Grid3D):
     @property
     def values1d(self):
         """Returns a 1D view of values (masked numpy) (read only)."""
-        return self._values.reshape(-1)
+        return self.values.reshape(-1)
 
     @property
     def undef(self):
@@ -489,25 +583,29 @@ class GridProperty(Grid3D):
     # ==================================================================================
 
     def generate_hash(self):
-        """str: Return a unique hash ID for current grid; can e.g. be used to compare
-        two gridproperty instances with same source.
+        """str: Return a unique hash ID for current grid property values.
 
-        .. versionadded:: 2.10
-        """
+        The hash is a fingerprint (blake2b) of the dimensions and the values,
+        including the mask. Properties with equal values get the same hash,
+        regardless of name or file source.
 
-        mhash = hashlib.sha256()
-        gid = "{}{}{}{}{}{}{}".format(
-            self._filesrc,
-            self._ncol,
-            self._nrow,
-            self._nlay,
-            self._values.mean(),
-            self._values.min(),
-            self._values.max(),
-        )
+        The hash is reused until the values are set (also by e.g.
+        ``prop.values += 1``) or changed by methods of the property. Changes in
+        place through the values array, e.g. ``prop.values[0, 0, 0] = 1``, are
+        not detected; set the values after such changes, e.g.
+        ``prop.values = prop.values``.
 
-        mhash.update(gid.encode())
-        return mhash.hexdigest()
+        .. versionadded:: 2.10
+        .. versionchanged:: 2.14 The hash is made from the full values content.
+        """
+        if self._hash is None:
+            self._hash = _grid3d_utils.content_hash(
+                self._ncol,
+                self._nrow,
+                self._nlay,
+                _gridprop_compressed.masked_values(self),
+            )
+        return self._hash
 
     @classmethod
     def methods(cls):
@@ -592,6 +690,8 @@ class GridProperty(Grid3D):
         gridlink=True,
         date=None,
         fracture=False,
+        values=True,
+        compressed=False,
         _roffapiv=1,
     ):  # _roffapiv for devel.
         """
@@ -603,14 +703,15 @@ class GridProperty(Grid3D):
 
         Args:
             pfile (str): name of file to be imported
-            fformat (str): file format to be used roff/init/unrst/grdecl
+            fformat (str): file format to be used roff/init/unrst/grdecl/xtgeo
                 (None is default, which means "guess" from file extension).
             name (str): name of property to import
             date (int or str): For restart files, date on YYYYMMDD format. Also
                 the YYYY-MM-DD form is allowed (string), and for Eclipse,
                 mnemonics like 'first', 'last' is also allowed.
             grid (Grid object): Grid Object for checks (optional for ROFF,
-                required for Eclipse).
+                required for Eclipse). For ROFF the values will then share the
+                active mask of the grid, see :meth:`Grid.get_active_mask`.
             gridlink (bool): If True, and grid is not None, a link from the grid
                 instance to the property is made. If False, no such link is made.
                 Avoiding gridlink is recommended when running statistics of multiple
@@ -618,6 +719,18 @@ class GridProperty(Grid3D):
             fracture (bool): Only applicable for DUAL POROSITY systems, if True
                 then the fracture property is read; if False then the matrix
                 property is read. Names will be appended with "M" or "F"
+            values (bool): If True (default), then the values are read. If False,
+                only metadata (name, date, dimensions, ...) are read, while the file,
+                byte position and data type are recorded so the values are read on
+                first access, see :meth:`load_values`. Valid for ROFF, xtgeo and
+                Eclipse INIT/UNRST (not dual porosity or derived saturations); other
+                formats are read in full. Note that codes for discrete Eclipse
+                properties are derived from the values, and will trigger a load.
+            compressed (bool): If True, values are stored for active cells only,
+                see :meth:`compress`. For Eclipse INIT/UNRST the active cell
+                records are read directly into compressed storage (also when
+                values are read on demand), while other formats are compressed
+                after import.
 
         Examples::
 
@@ -633,6 +746,9 @@ class GridProperty(Grid3D):
            True if success, otherwise False
 
         .. versionchanged:: 2.8.0 Added gridlink option, default is True
+        .. versionadded:: 2.14.0 Added values option
+        .. versionadded:: 2.14.0 Added compressed option
+        .. versionadded:: 2.14.0 Native xtgeo format, see :class:`XTGeoGridFile`
         """
 
         pfile = xtgeo._XTGeoFile(pfile, mode="rb")
@@ -645,6 +761,8 @@ class GridProperty(Grid3D):
             grid=grid,
             date=date,
             fracture=fracture,
+            values=values,
+            compressed=compressed,
             _roffapiv=_roffapiv,
         )
 
@@ -653,6 +771,88 @@ class GridProperty(Grid3D):
 
         return obj
 
+    def load_values(self):
+        """Read values in cases where only metadata are loaded.
+
+        This is done automatically on first access of the values, but can be
+        called explicitly. See :meth:`from_file` in cases where values key is
+        set to False, and :meth:`unload`.
+
+        Example::
+
+            props = []
+            for real in range(100):
+                prop = GridProperty()
+                prop.from_file(f"poro_{real}.roff", name="PORO", values=False)
+                props.append(prop)
+
+            # read values in number 88:
+            props[88].load_values()
+
+        .. versionadded:: 2.14
+        """
+        if not self._isloaded:
+            if self._valuesource is None:
+                raise RuntimeError("Values for {} have no source".format(self.name))
+            _gridprop_import.load_values(self, self._valuesource)
+            self._isloaded = True
+            if self._valuesource.get("compressed") and self._activev is None:
+                _gridprop_compressed.compress(self, self._valuesource.get("grid"))
+
+    def unload(self):
+        """Release the values from memory, keeping metadata.
+
+        The values will be read again from file on next access. Any change made to
+        the values since they were loaded is then lost. This is possible for
+        properties read from ROFF with ``values=False`` or through
+        :class:`GridProperties`, and for properties read from Eclipse INIT/UNRST.
+
+        Raises:
+            ValueError: if the values cannot be read again from file.
+
+        .. versionadded:: 2.14
+        """
+        if self._valuesource is None:
+            raise ValueError(
+                "Cannot unload values for {}, no file source is known".format(self.name)
+            )
+        self._valuesv = None
+        self._activev = None
+        self._activeindex = None
+        self._isloaded = False
+
+    def compress(self, grid=None):
+        """Store values for active cells only, to reduce memory usage.
+
+        The values are kept as a 1D array for active (unmasked) cells, and the
+        index of active cells is shared with the grid (and other properties of
+        that grid) if the property has the same active cells as the grid. This
+        is typically the case for Eclipse INIT and UNRST properties, see the
+        ``compressed`` option in :meth:`from_file`.
+
+        Export, :meth:`get_npvalues1d`, dataframes and :attr:`active_values`
+        use the compressed values directly, while the full 3D array is made
+        (and the property is no longer compressed) on first access of
+        :attr:`values`.
+
+        Args:
+            grid (Grid): Grid for sharing the active cell index; default is the
+                linked geometry, if any.
+
+        Example::
+
+            grd = xtgeo.Grid("ECL.EGRID")
+            pres = xtgeo.GridProperty(
+                "ECL.UNRST", name="PRESSURE", date="last", grid=grd
+            )
+            pres.compress()
+            pres.active_values -= 10.0
+            pres.to_file("pressure.roff")
+
+        .. versionadded:: 2.14
+        """
+        _gridprop_compressed.compress(self, grid)
+
     def to_file(
         self, pfile, fformat="roff", name=None, append=False, dtype=None, fmt=None
     ):
@@ -664,7 +864,8 @@ class GridProperty(Grid3D):
                 roff binary , else roff_ascii/grdecl/bgrdecl
             name (str): If provided, will explicitly give property name;
                 else the existing name of the instance will used.
-            append (bool): Append to existing file, only for (b)grdecl formats.
+            append (bool): Append to existing file, for (b)grdecl and binary roff
+                formats. For roff, the file must have the same dimensions.
             dtype (str): Data type; this is valid only for grdecl or bgrdecl
                 formats, where default is None which means 'float32' for
                 floating point number and 'int32' for discrete properties.
@@ -686,6 +887,8 @@ class GridProperty(Grid3D):
         .. versionadded:: 2.13  Key `fmt` was added and default format for float output
             to grdecl is now "%e" if `fmt=None`
 
+        .. versionchanged:: 2.14 Key `append` is also valid for binary roff
+
         """
 
         _gridprop_export.to_file(
@@ -778,20 +981,22 @@ class GridProperty(Grid3D):
         dsc.txt("Date", self.date)
         dsc.txt("File source", self._filesrc)
         dsc.txt("Discrete status", self._isdiscrete)
-        dsc.txt("Codes", self._codes)
+        dsc.txt("Codes", self.codes)
         dsc.txt("Shape: NCOL, NROW, NLAY", self.ncol, self.nrow, self.nlay)
+        values = _gridprop_compressed.masked_values(self)
         np.set_printoptions(threshold=16)
-        dsc.txt("Values", self._values.reshape(-1), self._values.dtype)
+        dsc.txt("Values", values.reshape(-1), values.dtype)
         np.set_printoptions(threshold=1000)
         dsc.txt(
             "Values, mean, stdev, minimum, maximum",
-            self.values.mean(),
-            self.values.std(),
-            self.values.min(),
-            self.values.max(),
+            values.mean(),
+            values.std(),
+            values.min(),
+            values.max(),
         )
-        itemsize = self.values.itemsize
-        msize = float(self.values.size * itemsize) / (1024 * 1024 * 1024)
+        dsc.txt("Compressed (active cells only)", self.iscompressed)
+        itemsize = values.itemsize
+        msize = float(values.size * itemsize) / (1024 * 1024 * 1024)
         dsc.txt("Roxar datatype", self.roxar_dtype)
         dsc.txt("Minimum memory usage of array (GB)", msize)
 
@@ -828,11 +1033,7 @@ class GridProperty(Grid3D):
             fvalue = fill_value
             dtype = np.float64
 
-        val = self.values.copy().astype(dtype)
-        npv3d = np.ma.filled(val, fill_value=fvalue)
-        del val
-
-        return npv3d
+        return _gridprop_compressed.filled_values(self, fvalue, dtype)
 
     def get_actnum(self, name="ACTNUM", asmasked=False, mask=None):
         """Return an ACTNUM GridProperty object.
@@ -860,8 +1061,8 @@ class GridProperty(Grid3D):
             ncol=self._ncol, nrow=self._nrow, nlay=self._nlay, name=name, discrete=True
         )
 
-        orig = self.values
-        vact = np.ones(self.values.shape)
+        orig = _gridprop_compressed.masked_values(self)
+        vact = np.ones(orig.shape)
         vact[orig.mask] = 0
 
         if asmasked:
@@ -892,7 +1093,11 @@ class GridProperty(Grid3D):
         .. versionadded:: 2.3.0
         .. versionchanged:: 2.8.0 Added `fill_value` and `order`
         """
-        vact = self.values1d.copy()
+        self.load_values()
+        if self._activev is not None and activeonly and order == "C":
+            return self._activev.copy()
+
+        vact = _gridprop_compressed.masked_values(self).reshape(-1).copy()
 
         if order == "F":
             vact = _gridprop_lowlevel.c2f_order(self, vact)
@@ -913,16 +1118,19 @@ class GridProperty(Grid3D):
         if newname is None:
             newname = self.name
 
+        self.load_values()
+        compressed = self._activev is not None
+
         xprop = GridProperty(
             ncol=self._ncol,
             nrow=self._nrow,
             nlay=self._nlay,
-            values=self._values.copy(),
+            values=None if compressed else _grid_active_mask.copy_values(self._values),
             name=newname,
         )
 
         xprop.geometry = self._geometry
-        xprop.codes = copy.deepcopy(self._codes)
+        xprop.codes = copy.deepcopy(self.codes)
         xprop.isdiscrete = self._isdiscrete
         xprop.date = self._date
         xprop.roxorigin = self._roxorigin
@@ -930,6 +1138,12 @@ class GridProperty(Grid3D):
 
         xprop.filesrc = self._filesrc
 
+        if compressed:
+            _gridprop_compressed.set_compressed(
+                xprop, self._activev.copy(), self._activeindex
+            )
+            xprop.codes = copy.deepcopy(self.codes)
+
         return xprop
 
     def mask_undef(self):
@@ -5,3 +5,4 @@ from __future__ import division, absolute_import
 from __future__ import print_function
 
 from xtgeo.surface.regular_surface import RegularSurface
+from xtgeo.surface._regsurf_gridder import PointsGridder
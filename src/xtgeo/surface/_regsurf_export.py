@@ -11,6 +11,7 @@ import xtgeo
 from xtgeo.common.constants import UNDEF_MAP_IRAPB, UNDEF_MAP_IRAPA
 import xtgeo.cxtgeo._cxtgeo as _cxtgeo  # pylint: disable=import-error
 from xtgeo.common import XTGeoDialog
+from . import _regsurf_tiled
 
 xtg = XTGeoDialog()
 
@@ -117,6 +118,10 @@ def export_irap_binary(self, mfile, engine="cxtgeo"):
     Note that mfile can also a be a BytesIO instance
     """
 
+    if self._tiles is not None:
+        _regsurf_tiled.export_irap_binary(self, mfile)
+        return
+
     if mfile.memstream or engine == "python":
         _export_irap_binary_python(self, mfile)
     elif engine == "cxtgeotest":
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+"""Gridding of scattered points to regular surfaces, with reusable indices."""
+
+from __future__ import division, absolute_import
+from __future__ import print_function
+
+import numpy as np
+import numpy.ma as ma
+import scipy.interpolate
+import scipy.spatial
+
+import xtgeo
+from xtgeo.common import threads
+from . import _regsurf_tiled
+
+xtg = xtgeo.common.XTGeoDialog()
+logger = xtg.functionlogger(__name__)
+
+TILENODES = 256 * 1024  # approximate number of map nodes per tile
+
+METHODS = ("linear", "nearest", "cubic", "idw")
+
+
+class PointsGridder(object):
+    """Gridding of scattered points to regular surfaces, by tiles of the map.
+
+    The gridder holds the points, and makes the search structures when first
+    needed: a Delaunay triangulation for the ``linear`` and ``cubic`` methods,
+    and a KD-tree for the ``nearest`` and ``idw`` (inverse distance weighting of
+    the nearest points) methods. These are the costly parts, so a gridder should
+    be made once for a set of points and reused, e.g. for several maps or
+    methods.
+
+    The map is evaluated for a range of columns (a tile) at a time, where the
+    node coordinates are made for the tile only, and tiles are evaluated in
+    several threads (see :func:`xtgeo.set_num_threads`). For very large point
+    sets, the ``nearest`` and ``idw`` methods are much faster than making a
+    triangulation.
+
+    Example::
+
+        gridder = xtgeo.surface.PointsGridder(mypoints)
+        top = xtgeo.RegularSurface(ncol=5000, nrow=5000, xinc=10, yinc=10)
+        top.gridding(gridder, method="idw", neighbours=12)
+
+        base = top.copy()
+        base.gridding(gridder, method="linear")  # makes the triangulation
+        top.gridding(gridder, method="cubic")  # reuses the triangulation
+
+    .. versionadded:: 2.14
+    """
+
+    def __init__(self, points, coarsen=1):
+        """Make a gridder for points.
+
+        Args:
+            points (Points): XTGeo Points instance.
+            coarsen (int): Use every n'th point only, to speed up gridding.
+        """
+        dfr = points.dataframe
+        xyz = [
+            np.asarray(dfr[name].values, dtype=np.float64)[::coarsen]
+            for name in (points.xname, points.yname, points.zname)
+        ]
+        self._xy = np.column_stack((xyz[0], xyz[1]))
+        self._zvalues = xyz[2]
+
+        self._triangulation = None
+        self._interpolators = {}
+        self._kdtree = None
+
+    def __repr__(self):
+        return "{} (id={}) npoints={}".format(
+            self.__class__.__name__, id(self), self.npoints
+        )
+
+    @property
+    def npoints(self):
+        """Number of points used for gridding (read only)."""
+        return self._zvalues.size
+
+    @property
+    def triangulation(self):
+        """The Delaunay triangulation of the points, made when first needed."""
+        if self._triangulation is None:
+            logger.info("Make triangulation of %s points", self.npoints)
+            tri = scipy.spatial.Delaunay(self._xy)
+            tri.transform  # pylint: disable=pointless-statement
+            self._triangulation = tri
+        return self._triangulation
+
+    @property
+    def kdtree(self):
+        """The KD-tree of the points, made when first needed."""
+        if self._kdtree is None:
+            logger.info("Make KD-tree of %s points", self.npoints)
+            self._kdtree = scipy.spatial.cKDTree(self._xy)
+        return self._kdtree
+
+    def grid(
+        self, surf, method="linear", neighbours=8, power=2.0, radius=None, nthreads=None
+    ):
+        """Grid the points to a surface, updating the surface values in-place.
+
+        Map nodes where no value can be found (outside the triangulation for the
+        linear and cubic methods, or without points within radius) will be
+        undefined.
+
+        Args:
+            surf (RegularSurface): The surface to update.
+            method (str): Gridding method: linear / cubic / nearest / idw.
+            neighbours (int): Number of nearest points used by the idw method.
+            power (float): Power of the inverse distance for the idw method.
+            radius (float): If given, only points within radius are used by the
+                nearest and idw methods.
+            nthreads (int): Number of threads, default is from
+                :func:`xtgeo.set_num_threads`.
+
+        Raises:
+            ValueError: If invalid input.
+            RuntimeError: If not possible to grid for some reason.
+        """
+        if method not in METHODS:
+            raise ValueError(
+                "Invalid method for gridding: {}, valid "
+                "options are {}".format(method, list(METHODS))
+            )
+        if self.npoints == 0:
+            raise RuntimeError("Could not do gridding: no points")
+
+        try:
+            evaluate = self._evaluator(method, neighbours, power, radius)
+        except (ValueError, RuntimeError) as err:
+            raise RuntimeError("Could not do gridding: {}".format(err))
+
+        if surf._tiles is not None:
+            _regsurf_tiled.prepare(surf)
+            step = surf.tilecolumns
+            data = ma.getdata(surf._values)
+            mask = ma.getmaskarray(surf._values)
+        else:
+            step = max(1, TILENODES // max(1, surf.nrow))
+            data = np.empty(surf.dimensions, dtype=np.float64)
+            mask = None
+
+        tiles = [(i0, min(i0 + step, surf.ncol)) for i0 in range(0, surf.ncol, step)]
+
+        def _grid_tiles(start, stop):
+            for i0, i1 in tiles[start:stop]:
+                iind, jind = np.meshgrid(
+                    np.arange(i0, i1, dtype=np.float64),
+                    np.arange(surf.nrow, dtype=np.float64),
+                    indexing="ij",
+                )
+                xcoord, ycoord = _regsurf_tiled.node_xy(surf, iind, jind)
+                del iind, jind
+                xyv = np.column_stack((xcoord.ravel(), ycoord.ravel()))
+                del xcoord, ycoord
+                zvalues = evaluate(xyv).reshape(i1 - i0, surf.nrow)
+                if mask is None:
+                    data[i0:i1] = zvalues
+                else:
+                    undef = np.isnan(zvalues)
+                    zvalues[undef] = xtgeo.UNDEF
+                    data[i0:i1] = zvalues
+                    mask[i0:i1] = undef
+
+        logger.info("Gridding %s points by %s tiles", self.npoints, len(tiles))
+        threads.run_blocks(_grid_tiles, len(tiles), nthreads)
+
+        if mask is None:
+            surf._ensure_correct_values(data)
+        logger.info("Gridding points ... DONE")
+
+    def _evaluator(self, method, neighbours, power, radius):
+        """Return a function giving values (NaN if undefined) for xy points."""
+
+        if method in ("linear", "cubic"):
+            if method not in self._interpolators:
+                if method == "linear":
+                    interp = scipy.interpolate.LinearNDInterpolator(
+                        self.triangulation, self._zvalues, fill_value=np.nan
+                    )
+                else:
+                    interp = scipy.interpolate.CloughTocher2DInterpolator(
+                        self.triangulation, self._zvalues, fill_value=np.nan
+                    )
+                self._interpolators[method] = interp
+            return self._interpolators[method]
+
+        tree = self.kdtree
+        bound = np.inf if radius is None else float(radius)
+        if method == "nearest":
+            neighbours = 1
+        neighbours = int(min(neighbours, self.npoints))
+        if neighbours < 1:
+            raise ValueError("Number of neighbours must be at least 1")
+
+        # missing neighbours (outside radius) have index npoints
+        zvalues = np.append(self._zvalues, np.nan)
+
+        def _query(xyv):
+            dist, ind = tree.query(xyv, k=neighbours, distance_upper_bound=bound)
+            if neighbours == 1:
+                return zvalues[ind]
+            return _inverse_distance(zvalues, dist, ind, power)
+
+        return _query
+
+
+def _inverse_distance(zvalues, dist, ind, power):
+    """Inverse distance weighted values of the nearest points for each node.
+
+    Missing neighbours (outside radius) have infinite distance, and index to the
+    NaN value last in zvalues. A node at a point gets the value of that point.
+    """
+    found = np.isfinite(dist)
+    zpoints = np.where(found, zvalues[ind], 0.0)
+
+    with np.errstate(divide="ignore"):
+        weights = np.where(found, 1.0 / dist ** power, 0.0)
+
+    # nodes at a point; use that point only
+    atpoint = found & (dist == 0.0)
+    exact = atpoint.any(axis=1)
+    weights[exact] = atpoint[exact].astype(np.float64)
+
+    wsum = weights.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = (weights * zpoints).sum(axis=1) / wsum
+    result[wsum == 0.0] = np.nan
+    return result
@@ -12,6 +12,8 @@ import scipy.interpolate
 import scipy.ndimage
 
 import xtgeo
+from . import _regsurf_gridder
+from . import _regsurf_tiled
 
 xtg = xtgeo.common.XTGeoDialog()
 
@@ -21,40 +23,22 @@ logger = xtg.functionlogger(__name__)
 # pylint: disable=too-many-branches, too-many-statements, too-many-locals
 
 
-def points_gridding(self, points, method="linear", coarsen=1):
-    """Do gridding from a points data set."""
+def points_gridding(self, points, method="linear", coarsen=1, **kwargs):
+    """Do gridding from a points data set, or a PointsGridder made for points.
 
-    xiv, yiv = self.get_xy_values()
-
-    dfra = points.dataframe
-
-    xcv = dfra[points.xname].values
-    ycv = dfra[points.yname].values
-    zcv = dfra[points.zname].values
+    The PointsGridder keeps the triangulation or KD-tree for the points, and
+    evaluates the map tile by tile, see _regsurf_gridder.
+    """
 
-    if coarsen > 1:
-        xcv = xcv[::coarsen]
-        ycv = ycv[::coarsen]
-        zcv = zcv[::coarsen]
-
-    validmethods = ["linear", "nearest", "cubic"]
-    if method not in set(validmethods):
-        raise ValueError(
-            "Invalid method for gridding: {}, valid "
-            "options are {}".format(method, validmethods)
-        )
+    if isinstance(points, _regsurf_gridder.PointsGridder):
+        gridder = points
+    else:
+        gridder = _regsurf_gridder.PointsGridder(points, coarsen=coarsen)
 
-    try:
-        znew = scipy.interpolate.griddata(
-            (xcv, ycv), zcv, (xiv, yiv), method=method, fill_value=np.nan
-        )
-    except ValueError as verr:
-        raise RuntimeError("Could not do gridding: {}".format(verr))
+    gridder.grid(self, method=method, **kwargs)
 
     logger.info("Gridding point ... DONE")
 
-    self._ensure_correct_values(znew)
-
 
 def avgsum_from_3dprops_gridding(
     self,
@@ -314,6 +298,10 @@ def surf_fill(self, fill_value=None):
     """
     logger.info("Do fill...")
 
+    if self._tiles is not None:
+        _regsurf_tiled.fill(self, fill_value=fill_value)
+        return
+
     if fill_value is not None:
         if np.isscalar(fill_value) and not isinstance(fill_value, str):
             self.values = ma.filled(self.values, fill_value=float(fill_value))
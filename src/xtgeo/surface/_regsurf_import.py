@@ -28,27 +28,25 @@ def import_irap_binary(self, mfile, values=True, engine="cxtgeo"):
     """
 
     if mfile.memstream is True or engine == "python":
-        _import_irap_binary_purepy(self, mfile)
+        _import_irap_binary_purepy(self, mfile, values=values)
     else:
         _import_irap_binary(self, mfile, values=values)
 
 
 def _import_irap_binary_purepy(self, mfile, values=True):
-    """Using pure python, better for memorymapping/threading"""
+    """Using numpy only, better for memorymapping/threading.
 
-    # Borrowed some code from https://github.com/equinor/grequi/../fmt_irapbin.py
+    The file (or memory stream) is viewed as numpy arrays without reading it into
+    a bytes object, and the big endian values are converted to the final array in
+    one copy, also dropping the Fortran record markers.
+    """
 
     logger.info("Enter function %s", __name__)
 
-    if mfile.memstream:
-        mfile.file.seek(0)
-        buf = mfile.file.read()
-    else:
-        with open(mfile.file, "rb") as fhandle:
-            buf = fhandle.read()
+    buf = _irap_binary_buffer(mfile)
 
     # unpack header with big-endian format string
-    hed = unpack(">3i6f3i3f10i", buf[:100])
+    hed = unpack(">3i6f3i3f10i", buf[:100].tobytes())
 
     self._nrow = hed[2]
     self._xori = hed[3]
@@ -68,36 +66,121 @@ def _import_irap_binary_purepy(self, mfile, values=True):
         self._values = None
         return
 
-    # Values: traverse through data blocks
-    stv = 100  # Starting byte
-    datav = []
-
-    while True:
-        # start block integer - number of bytes of floats in following block
-        blockv = unpack(">i", buf[stv : stv + 4])[0]
-        stv += 4
-        # floats
-        datav.append(
-            np.array(unpack(">" + str(int(blockv / 4)) + "f", buf[stv : blockv + stv]))
-        )
-        stv += blockv
-        # end block integer not needed really
-        _ = unpack(">i", buf[stv : stv + 4])[0]
-        stv += 4
-        if stv == len(buf):
-            break
+    # the values are stored in Fortran order; as rows (ncol, nrow) in C order
+    vals = np.empty((self._ncol, self._nrow), dtype=np.float64)
+    _irap_binary_values(buf[100:], vals.T)
+    del buf
 
-    values = np.hstack(datav)
-    values = np.reshape(values, (self._ncol, self._nrow), order="F")
-    values = np.array(values, order="C")
-    values = np.ma.masked_greater_equal(values, UNDEF_MAP_IRAPB)
-    self._values = np.ma.masked_invalid(values)
+    # masks both undefined and NaN values in one pass
+    self._values = np.ma.array(vals, mask=~(vals < UNDEF_MAP_IRAPB))
+    self._isloaded = True
 
     self._ilines = np.array(range(1, self.ncol + 1), dtype=np.int32)
     self._xlines = np.array(range(1, self.nrow + 1), dtype=np.int32)
 
+
+def load_irap_binary_values(mfile, out, rows=None):
+    """Read the values of an Irap binary file into out, with NaN if undefined.
+
+    This is for filling a preallocated array, e.g. one surface in a stack of
+    surfaces, without making a RegularSurface. With rows, only the map rows
+    j0 to j1 are read, which for the usual record layout are a contiguous part
+    of the file.
+
+    Args:
+        mfile (_XTGeoFile): Instance of xtgeo file class
+        out (ndarray): A float32 or float64 array, shape (ncol, nrow), or
+            shape (ncol, j1 - j0) if rows is given
+        rows (tuple): Optional (j0, j1) range of rows (zero based, half open)
+
+    Raises:
+        ValueError: If the map dimensions differ from the shape of out
+    """
+    buf = _irap_binary_buffer(mfile)
+
+    hed = unpack(">3i6f3i3f10i", buf[:100].tobytes())
+    ncol, nrow = hed[11], hed[2]
+    j0, j1 = rows if rows is not None else (0, nrow)
+    if not 0 <= j0 <= j1 <= nrow or out.shape != (ncol, j1 - j0):
+        raise ValueError(
+            "Map dimensions {} differ from {}".format((ncol, nrow), out.shape)
+        )
+
+    _irap_binary_values(buf[100:], out.T, start=j0, nrow=nrow)
     del buf
 
+    out[~(out < UNDEF_MAP_IRAPB)] = np.nan
+
+
+def _irap_binary_buffer(mfile):
+    """Return the file (or memory stream) as a numpy uint8 array, not a copy."""
+    if mfile.memstream:
+        buf = np.frombuffer(mfile.file.getbuffer(), dtype=np.uint8)
+    else:
+        buf = np.memmap(mfile.file, dtype=np.uint8, mode="r")
+
+    if buf.size < 100:
+        raise RuntimeError("Error in reading Irap binary file, too short")
+    return buf
+
+
+def _irap_binary_values(buf, rows, start=0, nrow=None):
+    """Copy the values in the Fortran records in buf into rows (nrow, ncol).
+
+    The usual layout, where all records but the last have the same length, is
+    handled as a 2D view with the record markers as first and last column.
+    Other layouts are handled record by record.
+
+    To read a part of the map only, rows may have fewer rows than the map (nrow),
+    starting at row start. With one record per map row, only those records (and
+    their markers) are read.
+    """
+
+    nrow = rows.shape[0] if nrow is None else nrow
+    stop = start + rows.shape[0]
+    nval = nrow * rows.shape[1]
+    if buf.size < 4:
+        raise RuntimeError("Error in reading Irap binary file, no values")
+
+    reclen = int(buf[:4].view(">i4")[0])  # bytes in first record
+    nfull, rest = divmod(4 * nval, reclen) if reclen > 0 else (0, 0)
+    expected = nfull * (reclen + 8) + (rest + 8 if rest else 0)
+
+    if reclen > 0 and reclen % 4 == 0 and buf.size == expected:
+        words = buf[: nfull * (reclen + 8)].view(">f4").reshape(nfull, -1)
+        if rest == 0 and words.shape[1] - 2 == rows.shape[1]:
+            # standard layout; a record per row
+            words = words[start:stop]
+        markers = words[:, [0, -1]].view(">i4")
+        if (markers == reclen).all():
+            data = words[:, 1:-1]
+            if data.shape == rows.shape:
+                np.copyto(rows, data)
+                return
+            flat = np.empty(nval, dtype=np.float32)
+            flat[: data.size].reshape(data.shape)[...] = data
+            if rest:
+                flat[data.size :] = buf[-4 - rest : -4].view(">f4")
+            np.copyto(rows, flat.reshape(nrow, -1)[start:stop])
+            return
+
+    # records of varying length
+    flat = np.empty(nval, dtype=np.float32)
+    pos = 0
+    ival = 0
+    while pos < buf.size and ival < nval:
+        reclen = int(buf[pos : pos + 4].view(">i4")[0])
+        nrec = reclen // 4
+        if reclen <= 0 or ival + nrec > nval or pos + reclen + 8 > buf.size:
+            raise RuntimeError("Error in reading Irap binary file, bad record")
+        flat[ival : ival + nrec] = buf[pos + 4 : pos + 4 + reclen].view(">f4")
+        ival += nrec
+        pos += reclen + 8
+
+    if ival != nval:
+        raise RuntimeError("Error in reading Irap binary file, too few values")
+    np.copyto(rows, flat.reshape(nrow, -1)[start:stop])
+
 
 def _import_irap_binary(self, mfile, values=True):
 
@@ -10,6 +10,7 @@ import xtgeo
 from xtgeo.xyz import Polygons
 import xtgeo.cxtgeo._cxtgeo as _cxtgeo
 from xtgeo.common import XTGeoDialog
+from . import _regsurf_tiled
 
 xtg = XTGeoDialog()
 
@@ -22,6 +23,16 @@ logger = xtg.functionlogger(__name__)
 def operations_two(self, other, oper="add"):
     """General operations between two maps"""
 
+    if self._tiles is not None and oper in _regsurf_tiled.OPERATIONS:
+        if not isinstance(other, numbers.Number) and not self.compare_topology(
+            other, strict=False
+        ):
+            useother = self.copy()
+            useother.resample(other)
+            other = useother
+        _regsurf_tiled.operations_two(self, other, oper)
+        return
+
     other = _check_other(self, other)
 
     okstatus = self.compare_topology(other)
@@ -87,6 +98,10 @@ def resample(self, other, mask=True):
 
     logger.info("Resampling...")
 
+    if self._tiles is not None:
+        _regsurf_tiled.resample(self, other, mask=mask)
+        return
+
     # a special case occur of the maps have same topology, but
     # different masks
     if self.compare_topology(other, strict=False):
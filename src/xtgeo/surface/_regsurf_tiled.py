@@ -0,0 +1,415 @@
+"""Tiled (out-of-core) storage and operations for RegularSurface.
+
+In tiled mode the map values and mask are kept in memory mapped files (unless
+memmap is False), and the values attribute is a masked array that is a view of
+these files. Arithmetic, resampling, filling and Irap binary import/export are
+then done for a range of map columns (a tile) at a time, so only a few tiles need
+to be in memory, also for the temporary arrays.
+
+A tile is a range of columns, which is contiguous in the C ordered values. Irap
+binary files store the values row by row, so these are read and written for a
+range of rows (a band) with about the same number of nodes as a tile.
+"""
+
+from __future__ import print_function, absolute_import
+
+import numbers
+import os
+import shutil
+import tempfile
+import weakref
+
+import numpy as np
+import numpy.ma as ma
+import scipy.ndimage
+
+import xtgeo
+from xtgeo.common.constants import UNDEF_MAP_IRAPB
+from . import _regsurf_import
+
+xtg = xtgeo.common.XTGeoDialog()
+
+logger = xtg.functionlogger(__name__)
+
+# Note: 'self' is an instance of RegularSurface
+# pylint: disable=protected-access
+
+FLOATEPS = 1.0e-6  # tolerance in nodes for points on the edge of a map
+
+IRAP_BINARY = ("irap_binary", "gri", "bin", "irapbin")
+
+OPERATIONS = {
+    "add": ma.add,
+    "iadd": ma.add,
+    "sub": ma.subtract,
+    "isub": ma.subtract,
+    "mul": ma.multiply,
+    "imul": ma.multiply,
+    "div": ma.divide,
+    "idiv": ma.divide,
+}
+
+
+def set_tiled(self, columns, folder=None, memmap=True):
+    """Turn on (or off with columns=None) tiled values for a surface."""
+
+    if columns is None:
+        if self._tiles is not None and self._values is not None:
+            logger.info("Load tiled values into memory")
+            self._values = ma.array(
+                np.array(ma.getdata(self._values)),
+                mask=np.array(ma.getmaskarray(self._values)),
+            )
+        self._tiles = None
+        return
+
+    columns = int(columns)
+    if columns < 1:
+        raise ValueError("Number of columns per tile must be at least 1")
+
+    _init_tiles(self, columns, folder, memmap)
+    prepare(self)
+
+
+def _init_tiles(self, columns, folder, memmap):
+    cleanup = None
+    if memmap and folder is None:
+        folder = tempfile.mkdtemp(prefix="xtgeo_surf_")
+        cleanup = weakref.finalize(self, shutil.rmtree, folder, ignore_errors=True)
+
+    self._tiles = {
+        "columns": columns,
+        "folder": str(folder) if memmap else None,
+        "cleanup": cleanup,
+        "files": (),
+    }
+
+
+def tile_ranges(self):
+    """Yield (i0, i1) as zero based, half open column ranges for each tile."""
+    step = self._tiles["columns"]
+    for i0 in range(0, self._ncol, step):
+        yield i0, min(i0 + step, self._ncol)
+
+
+def band_ranges(self):
+    """Yield (j0, j1) row ranges with about the number of nodes of a tile."""
+    step = max(1, self._tiles["columns"] * self._nrow // max(1, self._ncol))
+    for j0 in range(0, self._nrow, step):
+        yield j0, min(j0 + step, self._nrow)
+
+
+def prepare(self):
+    """Ensure that the values are stored in the memory mapped files, if any.
+
+    The values are (re)stored if they have been replaced, e.g. by setting the
+    values attribute, or if only metadata are loaded, in which case an Irap
+    binary file is read band by band.
+    """
+
+    if self._values is not None and _is_stored(self):
+        return
+
+    if self._values is None and self._fformat not in IRAP_BINARY:
+        self.load_values()
+
+    if self._values is None:
+        logger.info("Read values from %s, by bands", self._filesrc)
+        mfile = xtgeo._XTGeoFile(self._filesrc)
+        data, mask = _new_arrays(self)
+        for j0, j1 in band_ranges(self):
+            band = np.empty((self._ncol, j1 - j0), dtype=np.float64)
+            _regsurf_import.load_irap_binary_values(mfile, band, rows=(j0, j1))
+            mask[:, j0:j1] = np.isnan(band)
+            band[mask[:, j0:j1]] = xtgeo.UNDEF
+            data[:, j0:j1] = band
+        self._isloaded = True
+        self._ilines = np.array(range(1, self._ncol + 1), dtype=np.int32)
+        self._xlines = np.array(range(1, self._nrow + 1), dtype=np.int32)
+
+    elif self._tiles["folder"] is None:
+        return
+
+    else:
+        values = self._values
+        data, mask = _new_arrays(self)
+        for i0, i1 in tile_ranges(self):
+            data[i0:i1] = ma.getdata(values[i0:i1])
+            mask[i0:i1] = ma.getmaskarray(values[i0:i1])
+        del values
+
+    _set_arrays(self, data, mask)
+
+
+def _is_stored(self):
+    """Return True if the values are views of the current memory mapped files."""
+    files = self._tiles["files"]
+    if self._tiles["folder"] is None:
+        return True
+    if not files:
+        return False
+    data, mask = self._tiles["arrays"]
+    samedata = np.may_share_memory(ma.getdata(self._values), data)
+    samemask = np.may_share_memory(ma.getmaskarray(self._values), mask)
+    return samedata and samemask
+
+
+def _new_arrays(self):
+    """Return new (memory mapped) data and mask arrays of the map shape."""
+    folder = self._tiles["folder"]
+    shape = (self._ncol, self._nrow)
+    if folder is None:
+        return np.empty(shape, dtype=np.float64), np.empty(shape, dtype=np.bool_)
+
+    arrays = []
+    for name, dtype in (("values", np.float64), ("mask", np.bool_)):
+        fdesc, fname = tempfile.mkstemp(prefix=name + "_", suffix=".dat", dir=folder)
+        os.close(fdesc)
+        logger.info("Store %s in memory mapped file %s", name, fname)
+        arrays.append(np.memmap(fname, dtype=dtype, mode="w+", shape=shape))
+    return tuple(arrays)
+
+
+def _set_arrays(self, data, mask):
+    """Let the values be a view of data and mask; remove files replaced."""
+    self._values = ma.MaskedArray(data, mask=mask, copy=False)
+
+    oldfiles = self._tiles["files"]
+    if isinstance(data, np.memmap):
+        self._tiles["files"] = (data.filename, mask.filename)
+        self._tiles["arrays"] = (data, mask)
+    if self._tiles["cleanup"] is not None:
+        for fname in oldfiles:
+            if fname not in self._tiles["files"]:
+                try:
+                    os.remove(fname)
+                except OSError:
+                    pass  # e.g. still mapped on Windows; removed with the folder
+
+
+def copy(self, other):
+    """Copy tiled values from self to other (a copy of self without values)."""
+
+    prepare(self)
+    tiles = self._tiles
+    folder = None if tiles["cleanup"] is not None else tiles["folder"]
+    _init_tiles(other, tiles["columns"], folder, tiles["folder"] is not None)
+
+    data, mask = _new_arrays(other)
+    for i0, i1 in tile_ranges(self):
+        data[i0:i1] = ma.getdata(self._values[i0:i1])
+        mask[i0:i1] = ma.getmaskarray(self._values[i0:i1])
+    _set_arrays(other, data, mask)
+
+
+def operations_two(self, other, oper):
+    """Arithmetic with another surface of the same topology or a scalar."""
+
+    prepare(self)
+    func = OPERATIONS[oper]
+    for i0, i1 in tile_ranges(self):
+        if isinstance(other, numbers.Number):
+            result = func(self._values[i0:i1], other)
+        else:
+            result = func(self._values[i0:i1], other.values[i0:i1])
+        self._values[i0:i1] = result
+    self._filesrc = "Calculated"
+
+
+def operation(self, func, value):
+    """Eliminate values by func, e.g. ma.masked_less(values, value)."""
+
+    prepare(self)
+    for i0, i1 in tile_ranges(self):
+        self._values[i0:i1] = func(self._values[i0:i1], value)
+
+
+def resample(self, other, mask=True):
+    """Resample from other surface to this, with bilinear interpolation.
+
+    This gives the same as the C based resampling, where a node gets undefined if
+    outside other, or if any of the 4 nodes in other around it are undefined.
+    Here, a tile of this surface is resampled from the part of other around it.
+    """
+
+    prepare(self)
+
+    if self.compare_topology(other, strict=False):
+        for i0, i1 in tile_ranges(self):
+            self._values[i0:i1] = other.values[i0:i1]
+        return
+
+    for i0, i1 in tile_ranges(self):
+        iind, jind = np.meshgrid(
+            np.arange(i0, i1, dtype=np.float64),
+            np.arange(self._nrow, dtype=np.float64),
+            indexing="ij",
+        )
+        xcoord, ycoord = node_xy(self, iind, jind)
+        del iind, jind
+        fi, fj = node_ij(other, xcoord, ycoord)
+        del xcoord, ycoord
+
+        zvals = _bilinear(other, fi, fj)
+        if mask:
+            self._values[i0:i1] = ma.masked_invalid(zvals)
+        else:
+            tile = self._values[i0:i1]
+            self._values[i0:i1] = ma.where(np.isnan(zvals), tile, zvals)
+
+    self._filesrc = "Resampled"
+
+
+def node_xy(self, iind, jind):
+    """Return x, y coordinates of nodes given as zero based (float) indices."""
+    angle = np.radians(self._rotation)
+    xdist = iind * self._xinc
+    ydist = jind * (self._yinc * self._yflip)
+    xcoord = self._xori + xdist * np.cos(angle) - ydist * np.sin(angle)
+    ycoord = self._yori + xdist * np.sin(angle) + ydist * np.cos(angle)
+    return xcoord, ycoord
+
+
+def node_ij(self, xcoord, ycoord):
+    """Return zero based (float) node indices of x, y coordinates."""
+    angle = np.radians(self._rotation)
+    xrel = xcoord - self._xori
+    yrel = ycoord - self._yori
+    fi = (xrel * np.cos(angle) + yrel * np.sin(angle)) / self._xinc
+    fj = (-xrel * np.sin(angle) + yrel * np.cos(angle)) / (self._yinc * self._yflip)
+    return fi, fj
+
+
+def _bilinear(self, fi, fj):
+    """Bilinear interpolation in self at node indices fi, fj; NaN if undefined."""
+
+    ncol, nrow = self._ncol, self._nrow
+    zvals = np.full(fi.shape, np.nan)
+
+    inside = (
+        (fi >= -FLOATEPS)
+        & (fi <= ncol - 1 + FLOATEPS)
+        & (fj >= -FLOATEPS)
+        & (fj <= nrow - 1 + FLOATEPS)
+    )
+    if not inside.any():
+        return zvals
+
+    fi = np.clip(fi[inside], 0, ncol - 1)
+    fj = np.clip(fj[inside], 0, nrow - 1)
+    ilow = np.minimum(fi.astype(np.int64), max(ncol - 2, 0))
+    jlow = np.minimum(fj.astype(np.int64), max(nrow - 2, 0))
+    iupp = np.minimum(ilow + 1, ncol - 1)
+    jupp = np.minimum(jlow + 1, nrow - 1)
+    afrac = fi - ilow
+    bfrac = fj - jlow
+
+    # only the part of self that is needed, as this may be tiled too
+    imin, imax = ilow.min(), iupp.max() + 1
+    jmin, jmax = jlow.min(), jupp.max() + 1
+    part = ma.filled(self.values[imin:imax, jmin:jmax].astype(np.float64), np.nan)
+    ilow, iupp, jlow, jupp = ilow - imin, iupp - imin, jlow - jmin, jupp - jmin
+
+    z00 = part[ilow, jlow]
+    z10 = part[iupp, jlow]
+    z01 = part[ilow, jupp]
+    z11 = part[iupp, jupp]
+    zvals[inside] = (
+        z00
+        + afrac * (z10 - z00)
+        + bfrac * (z01 - z00)
+        + afrac * bfrac * (z11 + z00 - z01 - z10)
+    )
+    return zvals
+
+
+def fill(self, fill_value=None):
+    """Fill undefined values with a constant, or the value of the nearest node.
+
+    The nearest node is found for each tile by a distance transform on the tile
+    and a halo of columns on each side, where the halo is increased until the
+    nearest nodes found are closer than the halo width, i.e. the result is the
+    same as for the map as a whole.
+    """
+
+    prepare(self)
+
+    if fill_value is not None:
+        if not np.isscalar(fill_value) or isinstance(fill_value, str):
+            raise ValueError("Keyword fill_value must be int or float")
+        for i0, i1 in tile_ranges(self):
+            self._values[i0:i1] = ma.filled(self._values[i0:i1], float(fill_value))
+        return
+
+    allmask = ma.getmaskarray(self._values)
+    if not allmask.any() or allmask.all():
+        return
+
+    data, mask = _new_arrays(self)
+    for i0, i1 in tile_ranges(self):
+        data[i0:i1] = _fill_tile(self, allmask, i0, i1)
+        mask[i0:i1] = False
+
+    del allmask
+    _set_arrays(self, data, mask)
+
+
+def _fill_tile(self, allmask, i0, i1):
+    """Return filled values for tile i0 to i1 (the map has defined values)."""
+    if not allmask[i0:i1].any():
+        return ma.getdata(self._values[i0:i1])
+
+    halo = i1 - i0
+    while True:
+        lo, hi = max(0, i0 - halo), min(self._ncol, i1 + halo)
+        invalid = np.array(allmask[lo:hi])
+        whole = lo == 0 and hi == self._ncol
+        if not invalid.all():
+            dist, ind = scipy.ndimage.distance_transform_edt(
+                invalid, return_distances=True, return_indices=True
+            )
+            sub = slice(i0 - lo, i1 - lo)
+            if whole or dist[sub].max() <= halo:
+                data = ma.getdata(self._values[lo:hi])
+                return data[ind[0][sub], ind[1][sub]]
+        halo *= 2
+
+
+def export_irap_binary(self, mfile):
+    """Export to Irap binary, band by band; as the C based export."""
+
+    prepare(self)
+
+    if mfile.memstream:
+        _write_irap_binary(self, mfile.file)
+    else:
+        with open(mfile.name, "wb") as fout:
+            _write_irap_binary(self, fout)
+
+
+def _write_irap_binary(self, fout):
+    yinc = self.yinc * self.yflip
+    header = np.array(
+        [32, -996, self.nrow, 0, 0, 0, 0, 0, 0, 32, 16, self.ncol, 0, 0, 0, 16, 28]
+        + [0] * 7
+        + [28],
+        dtype=">i4",
+    )
+    floats = header.view(">f4")
+    floats[3:9] = (
+        self.xori,
+        self.xori + self.xinc * (self.ncol - 1),
+        self.yori,
+        self.yori + yinc * (self.nrow - 1),
+        self.xinc,
+        yinc,
+    )
+    floats[12:15] = (self.rotation, self.xori, self.yori)
+    fout.write(header.tobytes())
+
+    # one record (with length markers) per map row
+    for j0, j1 in band_ranges(self):
+        words = np.empty((j1 - j0, self.ncol + 2), dtype=">f4")
+        words.view(">i4")[:, [0, -1]] = 4 * self.ncol
+        words[:, 1:-1] = ma.filled(self._values[:, j0:j1], UNDEF_MAP_IRAPB).T
+        fout.write(words.tobytes())
@@ -1,13 +1,20 @@
 """Import multiple surfaces"""
 # pylint: disable=protected-access
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
 import xtgeo
 from xtgeo.common import XTGeoDialog
+from . import _regsurf_import
 
 xtg = XTGeoDialog()
 
 logger = xtg.functionlogger(__name__)
 
+IRAP_BINARY = ("irap_binary", "gri", "bin", "irapbin")
+
 
 def from_grid3d(self, grid, subgrids, rfactor):
     """Get surfaces from 3D grid, including subgrids"""
@@ -46,3 +53,82 @@ def from_grid3d(self, grid, subgrids, rfactor):
     self._order = "stratigraphic"
 
     logger.info("Extracting surface from 3D grid... DONE")
+
+
+def from_files(self, files, workers, dtype, fformat, values):
+    """Read many surfaces with the same topology into one stacked 3D array.
+
+    The headers are read first (only metadata for Irap binary), and the topology
+    is checked before one (nsurf, ncol, nrow) array is made. Each file is then
+    read directly into its slice of the array, concurrently with workers > 1.
+    The surfaces in the list have metadata only, see RegularSurface.load_values().
+    If values is False, no array is made.
+    """
+
+    files = list(files)
+    if not files:
+        raise ValueError("No files given")
+
+    def _header(fname):
+        surf = xtgeo.surface_from_file(
+            fname, fformat=fformat, values=False, engine="python"
+        )
+        # other formats than Irap binary are read in full; values are not kept
+        surf._values = None
+        surf._isloaded = False
+        return surf
+
+    nthreads = 1 if workers is None else max(1, min(workers, len(files)))
+    logger.info("Read %s surfaces using %s threads", len(files), nthreads)
+
+    with ThreadPoolExecutor(max_workers=nthreads) as executor:
+        surfs = list(executor.map(_header, files))
+
+        first = surfs[0]
+        for fname, surf in zip(files, surfs):
+            if not same_topology(first, surf):
+                raise ValueError(
+                    "Surface in {} differ in topology from {}".format(fname, files[0])
+                )
+
+        stack = None
+        if values:
+            stack = np.empty((len(surfs), first.ncol, first.nrow), dtype=dtype)
+            futures = [
+                executor.submit(values_into, surf, stack[inum])
+                for inum, surf in enumerate(surfs)
+            ]
+            for future in futures:
+                future.result()  # will raise any exception
+
+    self._surfaces = surfs
+    self._stack = stack
+    self._subtype = None
+    self._order = "same"
+
+
+def values_into(surf, out, rows=None):
+    """Copy the values of a surface into out, with NaN for undefined values.
+
+    Only the rows j0 to j1 (zero based, half open) are copied if rows is given,
+    then out has shape (ncol, j1 - j0). A surface with metadata only is read from
+    file (Irap binary for these rows only), and is not loaded.
+    """
+    j0, j1 = rows if rows is not None else (0, surf.nrow)
+
+    if surf._values is not None:
+        out[...] = np.ma.filled(surf._values[:, j0:j1], fill_value=np.nan)
+
+    elif surf._fformat in IRAP_BINARY:
+        mfile = xtgeo._XTGeoFile(surf._filesrc)
+        _regsurf_import.load_irap_binary_values(mfile, out, rows=(j0, j1))
+
+    else:
+        tmp = xtgeo.surface_from_file(surf._filesrc, fformat=surf._fformat)
+        out[...] = np.ma.filled(tmp.values[:, j0:j1], fill_value=np.nan)
+
+
+def same_topology(self, other):
+    """As RegularSurface.compare_topology(), not comparing masks nor values."""
+    keys = ("ncol", "nrow", "xori", "yori", "xinc", "yinc", "rotation", "yflip")
+    return all(getattr(self, key) == getattr(other, key) for key in keys)
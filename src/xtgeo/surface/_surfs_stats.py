@@ -0,0 +1,180 @@
+"""Statistics for Surfaces, made in one pass over the surfaces, tile by tile.
+
+The map is split in tiles of map rows, sized to keep memory within a limit. For
+each tile, the surfaces are read one at a time (from the stacked array, the
+loaded values or, for surfaces with metadata only, from file) and the mean, std,
+min and max are updated with Welford's method. If percentiles are asked for, the
+values for the tile are also kept for all surfaces, and exact percentiles are
+found by sorting them along the surface axis.
+
+Hence the memory use is about (nsurf + 6) values per map node in a tile, not
+for the whole ensemble, and surfaces with metadata only are not loaded. Irap
+binary files are read for the rows of a tile only, while files in other formats,
+which are read in full, are read once to a temporary memory mapped file first.
+"""
+# pylint: disable=protected-access
+
+import tempfile
+
+import numpy as np
+
+from xtgeo.common import XTGeoDialog
+from . import _surfs_import
+
+xtg = XTGeoDialog()
+
+logger = xtg.functionlogger(__name__)
+
+MAXMEMORY = 512  # default memory limit in MB for one tile
+
+
+def statistics(self, percentiles=None, maxmemory=MAXMEMORY):
+    """Return a dict with statistical surfaces, see Surfaces.statistics()."""
+
+    surfs = self.surfaces
+    first = surfs[0]
+    for surf in surfs:
+        if not _surfs_import.same_topology(first, surf):
+            raise ValueError("Cannot do statistics, surfaces differ in topology")
+
+    percentiles = [] if percentiles is None else list(percentiles)
+    for pct in percentiles:
+        if not 0 <= pct <= 100:
+            raise ValueError("Percentiles must be in range 0 to 100: {}".format(pct))
+
+    ncol, nrow, nsurf = first.ncol, first.nrow, len(surfs)
+    keys = ["mean", "std", "min", "max"] + [_pkey(pct) for pct in percentiles]
+    result = {key: np.empty((ncol, nrow), dtype=np.float64) for key in keys}
+
+    pernode = 8 * (6 + (nsurf if percentiles else 0))
+    nj = int(max(1, min(nrow, maxmemory * 1024 * 1024 // (pernode * ncol))))
+    logger.info("Statistics for %s surfaces, tiles of %s rows", nsurf, nj)
+
+    spooled = _spool_files(self)
+    for j0 in range(0, nrow, nj):
+        j1 = min(j0 + nj, nrow)
+        _tile_statistics(self, (j0, j1), percentiles, result, spooled)
+
+    stats = {}
+    for key in keys:
+        stats[key] = self._template()
+        stats[key].values = result.pop(key)
+    return stats
+
+
+def _pkey(pct):
+    """Return the key for a percentile, e.g. "p10" or "p2.5"."""
+    return "p{:g}".format(pct)
+
+
+def _spool_files(self):
+    """Read surfaces with metadata only, in formats that are read in full, once to
+    a temporary memory mapped array; return dict of surface number -> 2D array."""
+
+    stack = self._fromfiles_stack()
+    numbers = [
+        inum
+        for inum, surf in enumerate(self.surfaces)
+        if surf._values is None
+        and stack is None
+        and surf._fformat not in _surfs_import.IRAP_BINARY
+    ]
+    if not numbers:
+        return {}
+
+    logger.info("Read %s surfaces to a temporary file", len(numbers))
+    first = self.surfaces[0]
+    with tempfile.TemporaryFile(prefix="xtgeo_surfs_") as fhandle:
+        spool = np.memmap(
+            fhandle,
+            dtype=np.float64,
+            mode="w+",
+            shape=(len(numbers), first.ncol, first.nrow),
+        )
+    spooled = {}
+    for pos, inum in enumerate(numbers):
+        _surfs_import.values_into(self.surfaces[inum], spool[pos])
+        spooled[inum] = spool[pos]
+    return spooled
+
+
+def _tile_statistics(self, rows, percentiles, result, spooled):
+    """Update the results for the map rows j0 to j1."""
+    j0, j1 = rows
+    shape = (self.surfaces[0].ncol, j1 - j0)
+
+    count = np.zeros(shape, dtype=np.int64)
+    mean = np.zeros(shape, dtype=np.float64)
+    m2 = np.zeros(shape, dtype=np.float64)
+    vmin = np.full(shape, np.nan)
+    vmax = np.full(shape, np.nan)
+
+    vals = np.empty(shape, dtype=np.float64)
+    tile = None
+    if percentiles:
+        tile = np.empty(shape + (len(self.surfaces),), dtype=np.float64)
+
+    # surfaces loaded after from_files() are read from their own (maybe changed)
+    # values, not from the stacked array
+    stack = self._fromfiles_stack()
+    for inum, surf in enumerate(self.surfaces):
+        if stack is not None and surf._values is None:
+            vals[...] = stack[inum, :, j0:j1]
+        elif inum in spooled:
+            vals[...] = spooled[inum][:, j0:j1]
+        else:
+            _surfs_import.values_into(surf, vals, rows=rows)
+
+        _welford_update(vals, count, mean, m2)
+        np.fmin(vmin, vals, out=vmin)
+        np.fmax(vmax, vals, out=vmax)
+        if tile is not None:
+            tile[:, :, inum] = vals
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["mean"][:, j0:j1] = np.where(count > 0, mean, np.nan)
+        # degree of freedom ddof=1, similar to RMS
+        std = np.sqrt(m2 / (count - 1))
+        result["std"][:, j0:j1] = np.where(count > 1, std, np.nan)
+    result["min"][:, j0:j1] = vmin
+    result["max"][:, j0:j1] = vmax
+
+    if tile is not None:
+        pvalues = _nanpercentiles(tile, count, percentiles)
+        for pct, pval in zip(percentiles, pvalues):
+            result[_pkey(pct)][:, j0:j1] = pval
+
+
+def _welford_update(vals, count, mean, m2):
+    """Add one value per node to the running count, mean and sum of squared
+    differences from the mean (Welford); NaN values are skipped."""
+    valid = ~np.isnan(vals)
+    count += valid
+    delta = np.where(valid, vals - mean, 0.0)
+    mean += np.divide(delta, count, out=np.zeros_like(mean), where=valid)
+    m2 += delta * np.where(valid, vals - mean, 0.0)
+
+
+def _nanpercentiles(tile, count, percentiles):
+    """Return percentiles along the last axis of tile, ignoring NaN values.
+
+    This gives the same as np.nanpercentile (linear interpolation), but works on
+    all nodes at once; the tile is sorted in place (NaN values are sorted last),
+    and count is the number of values that are not NaN.
+    """
+    tile.sort(axis=-1)
+
+    result = []
+    last = np.maximum(count - 1, 0)
+    for pct in percentiles:
+        pos = last * float(pct) / 100.0
+        lower = np.floor(pos).astype(np.int64)
+        upper = np.minimum(lower + 1, last)
+        frac = pos - lower
+
+        vlow = np.take_along_axis(tile, lower[..., np.newaxis], axis=-1)[..., 0]
+        vupp = np.take_along_axis(tile, upper[..., np.newaxis], axis=-1)[..., 0]
+        pval = vlow + (vupp - vlow) * frac
+        pval[count == 0] = np.nan
+        result.append(pval)
+    return result
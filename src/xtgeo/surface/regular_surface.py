@@ -65,6 +65,7 @@ from . import _regsurf_roxapi
 from . import _regsurf_gridding
 from . import _regsurf_oper
 from . import _regsurf_utils
+from . import _regsurf_tiled
 
 xtg = xtgeo.common.XTGeoDialog()
 logger = xtg.functionlogger(__name__)
@@ -238,6 +239,9 @@ class RegularSurface(object):
         self._fformat = None  # current fileformat, useful for load()
         self._isloaded = True  # assume True unless explicitly set
 
+        # Tiled (out-of-core) values; None or a dict, see set_tiled()
+        self._tiles = None
+
         if args:
             # make instance from file import
             mfile = args[0]
@@ -497,6 +501,16 @@ class RegularSurface(object):
         warnings.warn("Deprecated; use nrow instead", DeprecationWarning)
         return self._nrow
 
+    @property
+    def tilecolumns(self):
+        """Number of map columns per tile for tiled values, or None (read only).
+
+        See :meth:`set_tiled`.
+        """
+        if self._tiles is None:
+            return None
+        return self._tiles["columns"]
+
     @property
     def nactive(self):
         """Number of active map nodes (read only)."""
@@ -870,8 +884,53 @@ class RegularSurface(object):
         """
 
         if not self._isloaded:
-            self.from_file(self._filesrc, fformat=self._fformat)
+            # set first, as formats read in full keep the values only if loaded
             self._isloaded = True
+            try:
+                self.from_file(self._filesrc, fformat=self._fformat)
+            except Exception:
+                self._isloaded = False
+                raise
+
+    def set_tiled(self, columns=1024, folder=None, memmap=True):
+        """Use tiled, optionally memory mapped (out-of-core), map values.
+
+        For very large maps the values, and in particular the temporary arrays
+        made by operations on them, may not fit in memory. In tiled mode the
+        values and mask are stored in memory mapped files (unless memmap is
+        False), and the :attr:`values` attribute is a view of these. Arithmetic
+        (e.g. ``surf1 + surf2`` or :meth:`add`), :meth:`operation`,
+        :meth:`resample`, :meth:`fill` and export to Irap binary are then done for
+        a range of map columns (a tile) at a time, so only a few tiles are read
+        into memory.
+
+        If only metadata are loaded from an Irap binary file (``values=False`` in
+        :meth:`from_file`), the values are read directly into the memory mapped
+        files, part by part.
+
+        Other operations work as before, but may make temporary arrays for the
+        full map. If the values are replaced (e.g. setting :attr:`values`), they
+        are stored in memory mapped files again on next tiled operation.
+
+        Args:
+            columns (int): Number of map columns in each tile. Use None to turn
+                off tiled mode and load the values into memory.
+            folder (str or Path): Folder for the memory mapped files. Default is
+                a temporary folder, which is removed when the instance is
+                deleted. Files in a given folder are not removed.
+            memmap (bool): If False, keep the values in memory but still do
+                operations by tiles, which limits the temporary memory use.
+
+        Example::
+
+            srf = xtgeo.surface_from_file("hugemap.gri", values=False)
+            srf.set_tiled(columns=2000)
+            srf.fill()
+            srf.to_file("hugemap_filled.gri")
+
+        .. versionadded:: 2.14
+        """
+        _regsurf_tiled.set_tiled(self, columns, folder=folder, memmap=memmap)
 
     def to_file(
         self, mfile, fformat="irap_binary", pmd_dataunits=(15, 10), engine="cxtgeo",
@@ -1162,10 +1221,19 @@ class RegularSurface(object):
             yflip=self.yflip,
         )
 
-        xsurf._values = self._values.copy()
+        if self._tiles is not None:
+            _regsurf_tiled.copy(self, xsurf)
+        elif self._values is None:
+            # metadata only, see load_values()
+            xsurf._values = None
+            xsurf._isloaded = self._isloaded
+            xsurf._fformat = self._fformat
+        else:
+            xsurf._values = self._values.copy()
 
-        xsurf.ilines = self._ilines.copy()
-        xsurf.xlines = self._xlines.copy()
+        if self._ilines is not None:
+            xsurf.ilines = self._ilines.copy()
+            xsurf.xlines = self._xlines.copy()
         xsurf.filesrc = self._filesrc
 
         return xsurf
@@ -1690,12 +1758,17 @@ class RegularSurface(object):
         """
 
         if opname in ("elilt", "eliminatelessthan"):
-            self._values = ma.masked_less(self._values, value)
+            func = ma.masked_less
         elif opname in ("elile", "eliminatelessequal"):
-            self._values = ma.masked_less_equal(self._values, value)
+            func = ma.masked_less_equal
         else:
             raise ValueError("Invalid operation name")
 
+        if self._tiles is not None:
+            _regsurf_tiled.operation(self, func, value)
+        else:
+            self._values = func(self._values, value)
+
     # ==================================================================================
     # Operations restricted to inside/outside polygons
     # ==================================================================================
@@ -1792,14 +1865,37 @@ class RegularSurface(object):
     # Interacion with points
     # ==================================================================================
 
-    def gridding(self, points, method="linear", coarsen=1):
+    def gridding(
+        self,
+        points,
+        method="linear",
+        coarsen=1,
+        neighbours=8,
+        power=2.0,
+        radius=None,
+        nthreads=None,
+    ):
         """Grid a surface from points.
 
+        The map is evaluated tile by tile, in several threads. The triangulation
+        (linear and cubic methods) or the KD-tree (nearest and idw methods) of
+        the points is made once per gridding; to reuse it for several surfaces
+        or methods, give a :class:`~xtgeo.surface.PointsGridder` instead of the
+        points. For very large point sets, the nearest and idw methods are the
+        fastest.
+
         Args:
-            points(Points): XTGeo Points instance.
-            method (str): Gridding method option: linear / cubic / nearest
+            points(Points): XTGeo Points instance, or a PointsGridder.
+            method (str): Gridding method option: linear / cubic / nearest / idw,
+                where idw is inverse distance weighting of the nearest points.
             coarsen (int): Coarsen factor, to speed up gridding, but will
-                give poorer result.
+                give poorer result. Not used for a PointsGridder.
+            neighbours (int): Number of nearest points for the idw method.
+            power (float): Power of the inverse distance for the idw method.
+            radius (float): If given, nearest and idw methods use points within
+                this distance only; other nodes will be undefined.
+            nthreads (int): Number of threads, default is from
+                :func:`xtgeo.set_num_threads`.
 
         Example::
 
@@ -1809,18 +1905,34 @@ class RegularSurface(object):
             # update the surface by gridding the points
             mysurf.gridding(mypoints)
 
+            # grid several surfaces from the same (many) points
+            gridder = xtgeo.surface.PointsGridder(mypoints)
+            mysurf.gridding(gridder, method="idw", neighbours=12)
+            other.gridding(gridder, method="nearest")
+
         Raises:
             RuntimeError: If not possible to grid for some reason
             ValueError: If invalid input
 
+        .. versionchanged:: 2.14 Added idw method, PointsGridder input, and
+           neighbours, power, radius and nthreads keys.
         """
 
-        if not isinstance(points, xtgeo.xyz.Points):
+        if not isinstance(points, (xtgeo.xyz.Points, xtgeo.surface.PointsGridder)):
             raise ValueError("Argument not a Points instance")
 
         logger.info("Do gridding...")
 
-        _regsurf_gridding.points_gridding(self, points, coarsen=coarsen, method=method)
+        _regsurf_gridding.points_gridding(
+            self,
+            points,
+            coarsen=coarsen,
+            method=method,
+            neighbours=neighbours,
+            power=power,
+            radius=radius,
+            nthreads=nthreads,
+        )
 
     # ==================================================================================
     # Interacion with other surface
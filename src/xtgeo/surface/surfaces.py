@@ -9,6 +9,7 @@ import numpy as np
 
 import xtgeo
 from . import _surfs_import
+from . import _surfs_stats
 
 xtg = xtgeo.common.XTGeoDialog()
 logger = xtg.functionlogger(__name__)
@@ -40,6 +41,7 @@ class Surfaces(object):
         self._surfaces = []  # list of RegularSurface objects
         self._subtype = None  # could be "tops", "isochores" or None
         self._order = None  # could be "same", "stratigraphic" or None
+        self._stack = None  # values as a 3D array, if read by from_files()
 
         if args:
             self.append(args[0])
@@ -61,10 +63,51 @@ class Surfaces(object):
                 raise ValueError("Element in list not a valid type of Surface")
 
         self._surfaces = slist
+        self._stack = None
+
+    @property
+    def stacked(self):
+        """(Read only) The surface values as a 3D numpy array, shape
+        (nsurf, ncol, nrow), where undefined values are NaN.
+
+        If the surfaces are read by :meth:`from_files`, this is the array that
+        was filled then (not a copy), where the values of surfaces that have been
+        loaded since (and maybe changed) are updated. Otherwise it is made from
+        the surfaces (where surfaces with metadata only are read from file, not
+        loaded).
+
+        Raises:
+            ValueError: If surfaces differ in topology.
+
+        .. versionadded:: 2.14
+        """
+        stack = self._fromfiles_stack()
+        if stack is not None:
+            for inum, surf in enumerate(self.surfaces):
+                if surf._values is not None:
+                    _surfs_import.values_into(surf, stack[inum])
+            return stack
+
+        first = self.surfaces[0]
+        stack = np.empty((len(self.surfaces), first.ncol, first.nrow))
+        for inum, surf in enumerate(self.surfaces):
+            if not _surfs_import.same_topology(first, surf):
+                raise ValueError("Cannot do statistics, surfaces differ in topology")
+            _surfs_import.values_into(surf, stack[inum])
+
+        return stack
+
+    def _fromfiles_stack(self):
+        """Return the array from :meth:`from_files`, or None if there is none or
+        the list of surfaces has changed length since."""
+        if self._stack is None or len(self._stack) != len(self.surfaces):
+            return None
+        return self._stack
 
     def append(self, slist):
         """Append surfaces from either a list of RegularSurface objects,
         a list of files, or a mix."""
+        self._stack = None
         for item in slist:
             if isinstance(item, xtgeo.RegularSurface):
                 self._surfaces.append(item)
@@ -102,6 +145,8 @@ class Surfaces(object):
 
         new._order = self._order
         new._subtype = self._subtype
+        if self._stack is not None:
+            new._stack = self._stack.copy()
 
         return new
 
@@ -116,8 +161,49 @@ class Surfaces(object):
 
     def from_grid3d(self, grid, subgrids=True, rfactor=1):
         """Derive surfaces from a 3D grid"""
+        self._stack = None
         _surfs_import.from_grid3d(self, grid, subgrids, rfactor)
 
+    def from_files(self, files, workers=1, dtype=np.float64, fformat=None, values=True):
+        """Read many surfaces with the same topology, e.g. realisations of a map.
+
+        The map headers are read and compared first, then the values of all files
+        are read directly into one 3D array, see :attr:`stacked`, which
+        :meth:`apply` and :meth:`statistics` will use as is. The surfaces in the
+        list will then have metadata only, so the values are held once. Hence
+        ``surfs.surfaces[i].values`` is None until
+        :meth:`RegularSurface.load_values` is called (which reads the file
+        again); use ``surfs.stacked[i]`` to get the values without loading.
+
+        Args:
+            files (list): File names (or memory streams).
+            workers (int): Number of threads for reading files concurrently;
+                default is 1 (serial).
+            dtype: The numpy dtype of the stacked array, np.float64 (default) or
+                np.float32 to save memory.
+            fformat (str): File format, default is to guess from the file
+                extension, see :meth:`RegularSurface.from_file`. Irap binary is
+                read directly into the array, other formats are read in full.
+            values (bool): If False, only the headers are read and checked, and
+                no array is made. Then :meth:`statistics` will read the files
+                one at a time, which use little memory for large ensembles.
+
+        Returns:
+            Object instance.
+
+        Raises:
+            ValueError: If surfaces differ in topology.
+
+        Example::
+
+            surfs = Surfaces().from_files(glob.glob("real*/top.gri"), workers=8)
+            stats = surfs.statistics()
+
+        .. versionadded:: 2.14
+        """
+        _surfs_import.from_files(self, files, workers, dtype, fformat, values)
+        return self
+
     def apply(self, func, *args, **kwargs):
         """Apply a function to the Surfaces array.
 
@@ -136,29 +222,56 @@ class Surfaces(object):
 
         """
 
-        template = self.surfaces[0].copy()
-        slist = []
-        for surf in self.surfaces:
-            status = template.compare_topology(surf, strict=False)
-            if not status:
-                raise ValueError("Cannot do statistics, surfaces differ in topology")
-            slist.append(np.ma.filled(surf.values, fill_value=np.nan))
-
-        xlist = np.array(slist)
+        template = self._template()
+        template.values = func(self.stacked, *args, **kwargs)
+        return template
 
-        template.values = func(xlist, *args, **kwargs)
+    def _template(self):
+        """Return a new surface with the topology of the first surface."""
+        first = self.surfaces[0]
+        template = xtgeo.RegularSurface(
+            ncol=first.ncol,
+            nrow=first.nrow,
+            xinc=first.xinc,
+            yinc=first.yinc,
+            xori=first.xori,
+            yori=first.yori,
+            rotation=first.rotation,
+            yflip=first.yflip,
+            values=0.0,
+        )
+        if first.ilines is not None:
+            template.ilines = first.ilines.copy()
+            template.xlines = first.xlines.copy()
         return template
 
-    def statistics(self):
+    def statistics(self, percentiles=None, maxmemory=_surfs_stats.MAXMEMORY):
         """Return statistical measures from the surfaces.
 
         The statistics returned is:
         * mean: the arithmetic mean surface
         * std: the standard deviation surface (where ddof = 1)
+        * min: the minimum surface
+        * max: the maximum surface
+        * pNN: the percentile surfaces, e.g. p10, p50 and p90 for percentiles
+          (10, 50, 90), as np.nanpercentile() with linear interpolation
+
+        The statistics are made in one pass over the surfaces, for a part (tile)
+        of the map at a time, reading one surface at a time, so the values of all
+        surfaces are never held unless percentiles are asked for; then the values
+        for one tile are held, sized by maxmemory. Surfaces with metadata only
+        (e.g. from :meth:`from_files` with ``values=False``) are read from file
+        when needed, and are not loaded; Irap binary for the rows of a tile only,
+        while other formats are read once to a temporary file first.
 
         Currently this function expects that the surfaces all have the same
         shape/topology.
 
+        Args:
+            percentiles (list): Percentiles (0 to 100) to compute, default is none.
+            maxmemory (int): Approximate memory limit in MB for the working arrays
+                of a tile (default 512).
+
         Returns:
             dict: A dictionary of statistical measures, see list above
 
@@ -171,39 +284,14 @@ class Surfaces(object):
             stats = surfs.statistics()
             # export the mean surface
             stats["mean"].to_file("mymean.gri")
-        """
-        result = {}
-
-        template = self.surfaces[0].copy()
-
-        slist = []
-        for surf in self.surfaces:
-            status = template.compare_topology(surf, strict=False)
-            if not status:
-                raise ValueError("Cannot do statistics, surfaces differ in topology")
-            slist.append(np.ma.filled(surf.values, fill_value=np.nan))
-
-        xlist = np.array(slist)
 
-        # mean
-        template.values = np.nanmean(xlist, axis=0)
-        result["mean"] = template.copy()
+            # P10/P50/P90 for a large ensemble, read file by file
+            surfs = Surfaces().from_files(manyfiles, values=False)
+            stats = surfs.statistics(percentiles=(10, 50, 90))
+            stats["p90"].to_file("p90.gri")
 
-        # std, run with degree of freedom ddof=1, similar to RMS
-        template.values = np.nanstd(xlist, axis=0, ddof=1)
-        result["std"] = template.copy()
-
-        # # median P50 (SLOW!)
-        # template.values = np.nanpercentile(xlist, 50, axis=0)
-        # result["median"] = template.copy()
-        # result["p50"] = result["median"]
-
-        # # P10
-        # template.values = np.nanpercentile(xlist, 10, axis=0)
-        # result["p10"] = template.copy()
-
-        # # P90
-        # template.values = np.nanpercentile(xlist, 90, axis=0)
-        # result["p90"] = template.copy()
-
-        return result
+        .. versionchanged:: 2.14
+           Added min and max, the percentiles and maxmemory keys, and one pass
+           streaming of the surfaces.
+        """
+        return _surfs_stats.statistics(self, percentiles, maxmemory)
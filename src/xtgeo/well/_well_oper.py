@@ -215,8 +215,8 @@ def _make_ijk_from_grid_v1(self, grid, grid_id=""):
     wjvec = _cxtgeo.new_intarray(nlen)
     wkvec = _cxtgeo.new_intarray(nlen)
 
-    onelayergrid = grid.copy()
-    onelayergrid.reduce_to_one_layer()
+    # the cell locator has a one layer version of the grid, reused across wells
+    onelayergrid = grid.get_cell_locator().onelayer_grid
 
     cstatus = _cxtgeo.grd3d_well_ijk(
         grid.ncol,
@@ -270,8 +270,6 @@ def _make_ijk_from_grid_v1(self, grid, grid_id=""):
     _cxtgeo.delete_doublearray(wyarr)
     _cxtgeo.delete_doublearray(wzarr)
 
-    del onelayergrid
-
 
 def _make_ijk_from_grid_v2(self, grid, grid_id="", activeonly=True):
     """
@@ -4,10 +4,13 @@
 from __future__ import print_function, absolute_import, division
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 import shapely.geometry as sg
 
+import xtgeo
 from xtgeo.common import XTGeoDialog
 from xtgeo.common import XTGShowProgress
 
@@ -149,3 +152,42 @@ def wellintersections(
 
     logger.info("All intersections found!")
     return dfr
+
+
+def make_ijk_from_grid(self, grid, grid_id="", activeonly=True, workers=1):
+    """Make I J K logs for all wells, with one cell lookup for all well points.
+
+    The result is the same as for Well.make_ijk_from_grid (algorithm 2) per well.
+    """
+
+    cna = ("ICELL" + grid_id, "JCELL" + grid_id, "KCELL" + grid_id)
+    if not self.wells:
+        return
+
+    xyz = np.concatenate(
+        [wll.dataframe[["X_UTME", "Y_UTMN", "Z_TVDSS"]].values for wll in self.wells]
+    )
+    logger.info("Get IJK for %s points in %s wells", len(xyz), len(self.wells))
+
+    locator = grid.get_cell_locator()
+
+    def _lookup(part):
+        ijk = locator.get_ijk(part[:, 0], part[:, 1], part[:, 2], activeonly=activeonly)
+        return np.column_stack(
+            [np.where(arr == xtgeo.UNDEF_INT, np.nan, arr) for arr in ijk]
+        )
+
+    parts = np.array_split(xyz, max(1, min(int(workers), len(xyz))))
+    if len(parts) > 1:
+        with ThreadPoolExecutor(max_workers=len(parts)) as executor:
+            result = np.concatenate(list(executor.map(_lookup, parts)))
+    else:
+        result = _lookup(xyz)
+
+    start = 0
+    for wll in self.wells:
+        stop = start + wll.nrow
+        for icol, name in enumerate(cna):
+            wll.dataframe[name] = result[start:stop, icol]
+        wll._ensure_consistency()
+        start = stop
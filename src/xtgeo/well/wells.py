@@ -264,6 +264,32 @@ class Wells(object):
         for well in self.wells:
             well.downsample(interval=interval, keeplast=keeplast)
 
+    def make_ijk_from_grid(self, grid, grid_id="", activeonly=True, workers=1):
+        """Look through a Grid and add grid I J K as discrete logs, for all wells.
+
+        This gives the same logs as :meth:`Well.make_ijk_from_grid`, but the
+        trajectories for all wells are combined, so the grid cells are found
+        in one operation, optionally split across threads.
+
+        Note that the the grid counting has base 1 (first row is 1 etc).
+
+        Args:
+            grid (Grid): A XTGeo Grid instance
+            grid_id (str): Add a tag (optional) to the current log name
+            activeonly (bool): If True, only active cells are applied
+            workers (int): Number of threads for the cell lookup
+
+        Example::
+
+            wells = xtgeo.Wells(["w1.w", "w2.w"])
+            wells.make_ijk_from_grid(grid, workers=4)
+
+        .. versionadded:: 2.14
+        """
+        _wells_utils.make_ijk_from_grid(
+            self, grid, grid_id=grid_id, activeonly=activeonly, workers=workers
+        )
+
     def wellintersections(self, wfilter=None, showprogress=False):
         """Get intersections between wells, return as dataframe table.
 
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import xtgeo
+from xtgeo.common import threads
+
+
+def test_num_threads(monkeypatch):
+    """Thread setting from argument, global setting and environment"""
+
+    monkeypatch.delenv("XTG_NUM_THREADS", raising=False)
+    xtgeo.set_num_threads(None)
+    assert xtgeo.get_num_threads() == 1
+
+    monkeypatch.setenv("XTG_NUM_THREADS", "3")
+    assert xtgeo.get_num_threads() == 3
+
+    xtgeo.set_num_threads(2)
+    assert xtgeo.get_num_threads() == 2
+    assert xtgeo.get_num_threads(5) == 5
+
+    xtgeo.set_num_threads(0)
+    assert xtgeo.get_num_threads() >= 1
+
+    with pytest.raises(ValueError):
+        xtgeo.set_num_threads(-1)
+
+    xtgeo.set_num_threads(None)
+
+
+def test_run_blocks():
+    """All items shall be covered once, in blocks"""
+
+    assert threads.split_range(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert threads.split_range(2, 8) == [(0, 1), (1, 2)]
+
+    seen = []
+    threads.run_blocks(lambda start, stop: seen.extend(range(start, stop)), 100, 4)
+    assert sorted(seen) == list(range(100))
@@ -2,6 +2,7 @@
 from __future__ import division, absolute_import
 from __future__ import print_function
 
+import io
 import os
 from os.path import join
 from collections import OrderedDict
@@ -55,6 +56,54 @@ DUALFIL3 = "../xtgeo-testdata/3dgrids/etc/TEST_DPDK.EGRID"
 # pylint: disable=redefined-outer-name
 
 
+def test_xtgeo_format_with_props():
+    """Grid with properties in native xtgeo format, full and partial reads"""
+
+    grd = xtgeo.Grid(REEKROOT, fformat="eclipserun", initprops=["PORO", "FIPNUM"])
+
+    fname = join(TMPDIR, "reek.xtgeo")
+    grd.to_file(fname, fformat="xtgeo")
+
+    grd2 = xtgeo.Grid(fname, fformat="xtgeo")
+    assert grd2.dimensions == grd.dimensions
+    assert grd2.nactive == grd.nactive
+    np.testing.assert_array_equal(grd2._zcornsv, grd._zcornsv)
+
+    xfile = xtgeo.grid3d.XTGeoGridFile(fname)
+    assert set(xfile.names) == {"PORO", "FIPNUM"}
+    xfile.verify()
+
+    poro = grd.get_prop_by_name("PORO")
+    poro2 = GridProperty(fname, fformat="xtgeo", name="PORO")
+    np.testing.assert_array_equal(poro2.values.filled(0), poro.values.filled(0))
+
+    # metadata changed before values are loaded are kept
+    fipnum = GridProperty()
+    fipnum.from_file(fname, fformat="xtgeo", name="FIPNUM", values=False)
+    fipnum.name = "REGIONS"
+    fipnum.codes = {1: "WEST"}
+    assert fipnum.values.count() == grd.nactive
+    assert fipnum.name == "REGIONS"
+    assert fipnum.codes == {1: "WEST"}
+
+    # a range of layers, also in compressed chunks
+    grd.gridprops.to_file(fname, fformat="xtgeo", grid=grd, compression="zlib")
+    xfile = xtgeo.grid3d.XTGeoGridFile(fname)
+    part = xfile.get_grid(layers=(3, 8))
+    assert part.dimensions == (grd.ncol, grd.nrow, 5)
+    fipnum = xfile.get_property("FIPNUM", layers=(3, 8))
+    assert fipnum.isdiscrete
+    fipnum_all = grd.get_prop_by_name("FIPNUM").values
+    np.testing.assert_array_equal(
+        fipnum.values.filled(0), fipnum_all[:, :, 3:8].filled(0)
+    )
+
+    stream = io.BytesIO()
+    grd.gridprops.to_file(stream, fformat="xtgeo", grid=grd)
+    stream.seek(0)
+    assert set(xtgeo.grid3d.XTGeoGridFile(stream).names) == {"PORO", "FIPNUM"}
+
+
 @pytest.fixture()
 def load_gfile1():
     """Fixture for loading EMEGFILE grid"""
@@ -777,6 +826,17 @@ def test_generate_hash():
 
     assert grd1.generate_hash() == grd2.generate_hash()
 
+    # the hash is for content; the internal storage format does not matter
+    grd2._xtgformat1()
+    assert grd1.generate_hash() == grd2.generate_hash()
+
+    grd2.translate_coordinates(translate=(0, 0, 0.01))
+    assert grd1.generate_hash() != grd2.generate_hash()
+
+    grd1.inactivate_by_dz(0.5)
+    grd3 = Grid(REEKFILE)
+    assert grd1.generate_hash() != grd3.generate_hash()
+
 
 def test_gridquality_properties():
     """Get grid quality props"""
@@ -814,6 +874,146 @@ def test_bulkvol():
     assert bulk.values.sum() == pytest.approx(cellvol_rms.values.sum(), rel=0.001)
 
 
+def test_cell_corners_volumes_many_cells():
+    """Corners, volumes and centroids for many cells at once"""
+
+    grd = Grid(EMEGFILE)
+
+    corners = grd.get_cell_corners()
+    assert corners.shape == (grd.ntotal, 8, 3)
+
+    cells = np.array([0, 17, grd.ntotal - 1])
+    sel = grd.get_cell_corners(indices=cells)
+    assert np.allclose(sel, corners[cells])
+    for cell, cellcorners in zip(cells, sel):
+        ijk = np.unravel_index(cell, grd.dimensions)
+        single = grd.get_xyz_cell_corners(ijk, activeonly=False, zerobased=True)
+        assert np.allclose(np.reshape(single, (8, 3)), cellcorners)
+
+    actnum = grd.get_actnum().values
+    active = grd.get_cell_corners(activeonly=True)
+    assert np.allclose(active, grd.get_cell_corners(indices=actnum > 0))
+
+    vols, centers = grd.get_cell_volumes(activeonly=True, centroids=True)
+    bulk = grd.get_bulk_volume()
+    assert np.allclose(vols, bulk.values.compressed())
+    assert np.allclose(centers, active.mean(axis=1))
+
+    xcoord, ycoord, zcoord = grd.get_xyz()
+    assert np.allclose(centers[:, 0], xcoord.values.compressed())
+    assert np.allclose(centers[:, 2], zcoord.values.compressed())
+
+    grd.set_chunked_geometry(layers=3)
+    assert np.allclose(grd.get_cell_corners(indices=cells), sel)
+    assert np.allclose(grd.get_cell_volumes(activeonly=True), vols)
+
+    with pytest.raises(ValueError):
+        grd.get_cell_corners(indices=[grd.ntotal])
+
+
+def test_geometry_threads():
+    """Geometry computed in several threads shall be as single threaded"""
+
+    grd = Grid(EMEGFILE)
+
+    for nthreads in (1, 4):
+        dz = grd.get_dz(nthreads=nthreads)
+        dx, dy = grd.get_dxdy(nthreads=nthreads)
+        xyz = grd.get_xyz(nthreads=nthreads)
+        bulk = grd.get_bulk_volume(nthreads=nthreads)
+        vols = grd.get_cell_volumes(nthreads=nthreads)
+        result = [prop.values for prop in (dz, dx, dy, bulk) + xyz] + [vols]
+        if nthreads == 1:
+            expected = result
+            continue
+
+        for values1, values2 in zip(expected, result):
+            assert np.ma.allequal(values1, values2)
+            assert np.array_equal(np.ma.getmask(values1), np.ma.getmask(values2))
+
+    xtgeo.set_num_threads(4)
+    assert np.ma.allequal(grd.get_bulk_volume().values, expected[3])
+    xtgeo.set_num_threads(None)
+
+
+def test_geometry_cache():
+    """Cached geometry properties, with invalidation when the grid is changed"""
+
+    grd = Grid(EMEGFILE)
+    assert grd.geometry_cache_stats is None
+
+    grd.set_geometry_cache()
+    dz1 = grd.get_dz()
+    dz2 = grd.get_dz()
+    assert grd.geometry_cache_stats["misses"] == 1
+    assert grd.geometry_cache_stats["hits"] == 1
+    assert np.ma.allequal(dz1.values, dz2.values)
+
+    # results are copies, so the cached values cannot be changed by the client
+    dz2.values += 1.0
+    assert np.ma.allequal(grd.get_dz().values, dz1.values)
+
+    # other arguments give another entry
+    grd.get_dz(asmasked=False)
+    assert grd.geometry_cache_stats["entries"] == 2
+
+    grd.translate_coordinates(translate=(0, 0, 10))
+    assert np.ma.allclose(grd.get_dz().values, dz1.values)
+    assert grd.geometry_cache_stats["invalidations"] == 1
+
+    xyz1 = grd.get_xyz()
+    act = grd.get_actnum()
+    act.values[:, :, 0] = 0
+    grd.set_actnum(act)
+    xyz2 = grd.get_xyz()
+    assert xyz2[0].values.count() < xyz1[0].values.count()
+    assert grd.geometry_cache_stats["invalidations"] == 2
+
+    # a small budget evicts the least recently used
+    grd.set_geometry_cache(maxbytes=dz1.values.nbytes * 2.5)
+    grd.get_dz()
+    grd.get_bulk_volume()
+    grd.get_dz()
+    grd.get_dxdy()
+    stats = grd.geometry_cache_stats
+    assert stats["evictions"] >= 1
+    assert stats["nbytes"] <= stats["maxbytes"]
+
+    grd.set_geometry_cache(None)
+    assert grd.geometry_cache_stats is None
+
+
+def test_active_mask_shared():
+    """Properties imported for a grid share the grid's active mask"""
+
+    grd = Grid(REEKFILE, fformat="egrid")
+    amask = grd.get_active_mask()
+    assert amask is grd.get_active_mask()
+    assert amask.nactive == grd.nactive
+    np.testing.assert_array_equal(amask.indices, grd.get_actnum_indices())
+
+    props = xtgeo.GridProperties()
+    props.from_file(
+        REEKROOT + ".INIT", fformat="init", names=["PORO", "PERMX"], grid=grd
+    )
+    poro, permx = props.props
+    assert amask.shares(poro._values)
+    assert amask.shares(permx._values)
+    assert amask.shares(poro.copy()._values)
+
+    # the mask is copied when diverging, i.e. on access through values
+    poro.values[0, 0, 0] = np.ma.masked
+    assert not amask.shares(poro._values)
+    assert amask.shares(permx._values)
+    assert amask.mask.sum() == grd.ntotal - grd.nactive
+
+    act = grd.get_actnum()
+    act.values[:, :, 0] = 0
+    grd.set_actnum(act)
+    assert grd.get_active_mask() is not amask
+    assert grd.get_active_mask().nactive < amask.nactive
+
+
 @tsetup.bigtest
 def test_bulkvol_speed():
     """Test cell bulk volume calculation speed"""
@@ -827,3 +1027,92 @@ def test_bulkvol_speed():
     _ = grd.get_bulk_volume()
     ncells = np.prod(dimens)
     print(xtg.timer(t0), ncells)
+
+
+def test_chunked_geometry(tmpdir):
+    """Chunked (memory mapped) geometry shall give same results as in memory"""
+
+    grd1 = Grid(EMEGFILE)
+    grd2 = Grid(EMEGFILE)
+    grd2.set_chunked_geometry(layers=4, folder=str(tmpdir))
+    assert grd2.chunklayers == 4
+    assert isinstance(grd2._zcornsv, np.memmap)
+
+    dz1 = grd1.get_dz()
+    dz2 = grd2.get_dz()
+    assert np.ma.allclose(dz1.values, dz2.values)
+    assert np.array_equal(dz1.values.mask, dz2.values.mask)
+
+    for prop1, prop2 in zip(grd1.get_xyz(), grd2.get_xyz()):
+        assert np.ma.allclose(prop1.values, prop2.values)
+
+    bulk1 = grd1.get_bulk_volume()
+    bulk2 = grd2.get_bulk_volume()
+    assert np.ma.allclose(bulk1.values, bulk2.values)
+
+    for layer, top in ((1, True), (5, False), (grd1.nlay, False)):
+        sarr1, icarr1 = grd1.get_layer_slice(layer, top=top)
+        sarr2, icarr2 = grd2.get_layer_slice(layer, top=top)
+        assert np.allclose(sarr1, sarr2)
+        assert np.array_equal(icarr1, icarr2)
+
+    # a conversion to xtgformat 2 loads into memory; next use memory maps again,
+    # where the files replaced are removed
+    for _ in range(3):
+        grd2._xtgformat2()
+        assert grd2.get_dz().values.mean() == pytest.approx(dz1.values.mean())
+        assert isinstance(grd2._zcornsv, np.memmap)
+    assert len(tmpdir.listdir()) == 2
+
+    grd2.set_chunked_geometry(layers=None)
+    assert grd2.chunklayers is None
+    assert not isinstance(grd2._zcornsv, np.memmap)
+    assert not tmpdir.listdir()
+
+
+def test_xtgformat_conversion_cache():
+    """Repeated conversions between xtgformat 1 and 2 shall use the cache"""
+
+    grd = Grid(EMEGFILE)
+    grd._xtgformat2()
+    zcorn2 = grd._zcornsv
+    dz1 = grd.get_dz()  # converts to xtgformat 1
+
+    stats = grd.xtgformat_stats
+    for _ in range(3):
+        grd._xtgformat2()
+        assert grd._zcornsv is zcorn2
+        grd._xtgformat1()
+
+    newstats = grd.xtgformat_stats
+    assert newstats["to_xtgformat1"] == stats["to_xtgformat1"]
+    assert newstats["to_xtgformat2"] == stats["to_xtgformat2"]
+    assert newstats["cache_hits"] == stats["cache_hits"] + 6
+
+    # a change of geometry shall invalidate the cache
+    grd.translate_coordinates(translate=(0, 0, 10))
+    grd._xtgformat2()
+    assert grd._zcornsv is not zcorn2
+    assert grd.xtgformat_stats["to_xtgformat2"] == stats["to_xtgformat2"] + 1
+    assert grd.get_dz().values.mean() == pytest.approx(dz1.values.mean())
+
+
+def test_xtgformat_conversion_cache_skipped():
+    """No cache of the other xtgformat for chunked geometry or if switched off"""
+
+    grd = Grid(EMEGFILE)
+    grd.set_chunked_geometry(layers=4)
+    grd._xtgformat2()
+    grd._xtgformat1()
+    assert "xtgformat_cache" not in grd._tmp
+
+    maxmb = xtgeo.grid3d._grid_etc1.XTGFORMAT_CACHE_MAXMB
+    try:
+        xtgeo.grid3d._grid_etc1.XTGFORMAT_CACHE_MAXMB = 0
+        grd = Grid(EMEGFILE)
+        grd._xtgformat1()
+        grd._xtgformat2()
+        assert "xtgformat_cache" not in grd._tmp
+        assert grd.xtgformat_stats["cache_hits"] == 0
+    finally:
+        xtgeo.grid3d._grid_etc1.XTGFORMAT_CACHE_MAXMB = maxmb
@@ -3,13 +3,21 @@
 from __future__ import division, absolute_import
 from __future__ import print_function
 
+import io
+import os
 import sys
+import shutil
+import types
 import warnings
 
+import numpy as np
 import pytest
 
 from xtgeo.grid3d import Grid
+from xtgeo.grid3d import GridProperty
 from xtgeo.grid3d import GridProperties
+from xtgeo.grid3d import EclKeywordIndex
+from xtgeo.grid3d import _gridprops_io
 from xtgeo.common import XTGeoDialog
 
 warnings.filterwarnings("ignore")
@@ -29,6 +37,8 @@ IFILE1 = "../xtgeo-testdata/3dgrids/reek/REEK.INIT"
 RFILE1 = "../xtgeo-testdata/3dgrids/reek/REEK.UNRST"
 
 XFILE2 = "../xtgeo-testdata/3dgrids/reek/reek_grd_w_props.roff"
+ZFILE1 = "../xtgeo-testdata/3dgrids/reek/reek_sim_zone.roff"
+DUALROFF = "../xtgeo-testdata/3dgrids/etc/dual_grid_w_props.roff"
 
 # pylint: disable=logging-format-interpolation
 # pylint: disable=invalid-name
@@ -138,6 +148,38 @@ def test_import_restart():
     assert pr.values.mean() == pytest.approx(304.897, abs=0.01), txt
 
 
+def test_import_restart_workers():
+    """Import Restart using several threads, shall equal serial import"""
+
+    g = Grid()
+    g.from_file(GFILE1, fformat="egrid")
+
+    names = ["PRESSURE", "SWAT", "SOIL"]
+    dates = [19991201, 20010101]
+
+    x1 = GridProperties()
+    x1.from_file(RFILE1, fformat="unrst", names=names, dates=dates, grid=g)
+
+    x4 = GridProperties()
+    x4.from_file(RFILE1, fformat="unrst", names=names, dates=dates, grid=g, workers=4)
+
+    assert x4.names == x1.names
+    assert x4.dates == x1.dates
+    for prop1, prop4 in zip(x1.props, x4.props):
+        assert prop4.name == prop1.name
+        np.testing.assert_array_equal(prop4.values, prop1.values)
+
+    grd = Grid(
+        GFILE1.replace(".EGRID", ""),
+        fformat="eclipserun",
+        initprops=["PORO"],
+        restartprops=names,
+        restartdates=dates,
+        workers=2,
+    )
+    assert grd.gridprops.names == ["PORO"] + x1.names
+
+
 def test_import_restart_gull():
     """Import Restart Reek"""
 
@@ -194,6 +236,246 @@ def test_import_soil():
     assert soil.values.mean() == pytest.approx(0.121977, abs=0.001), txt
 
 
+def test_import_roff_many():
+    """Import several ROFF properties in one pass, compare with single imports"""
+
+    x = GridProperties()
+    x.from_file(DUALROFF, fformat="roff", names="all")
+
+    assert len(x.names) > 1
+    for name in x.names:
+        single = GridProperty(DUALROFF, fformat="roff", name=name)
+        prop = x.get_prop_by_name(name)
+        assert prop.dimensions == single.dimensions
+        assert prop.isdiscrete == single.isdiscrete
+        assert np.ma.allclose(prop.values, single.values)
+        assert np.array_equal(prop.values.mask, single.values.mask)
+
+
+def test_import_roff_many_discrete():
+    """Import discrete ROFF properties with codes, in one pass"""
+
+    x = GridProperties()
+    x.from_file(ZFILE1, fformat="roff", names=["Zone"])
+
+    zone = x["Zone"]
+    assert zone.isdiscrete
+    assert zone.ncodes == 3
+    assert zone.codes[3] == "Below_Low_reek"
+
+    with pytest.raises(ValueError):
+        x.from_file(ZFILE1, fformat="roff", names=["Zone", "NOSUCHNAME"])
+
+    y = GridProperties()
+    y.from_file(
+        ZFILE1, fformat="roff", names=["Zone", "NOSUCHNAME"], strict=(False, False)
+    )
+    assert y.names == ["Zone"]
+
+
+def test_import_lazy():
+    """Import of ROFF and UNRST properties, with values read on demand"""
+
+    x = GridProperties()
+    x.from_file(XFILE2, fformat="roff", names="all", values=False)
+    assert all(prop._isloaded is False for prop in x.props)
+
+    y = GridProperties()
+    y.from_file(XFILE2, fformat="roff", names="all")
+    for prop, ref in zip(x.props, y.props):
+        assert prop.codes == ref.codes
+        np.testing.assert_array_equal(prop.values, ref.values)
+
+    g = Grid(GFILE1, fformat="egrid")
+    z = GridProperties()
+    z.from_file(
+        RFILE1, fformat="unrst", names=["PRESSURE"], dates="all", grid=g, values=False
+    )
+    assert z.props[0]._isloaded is False
+    assert z["PRESSURE_19991201"].values.mean() == pytest.approx(334.52327, abs=0.0001)
+
+
+def test_import_compressed():
+    """Import of UNRST properties with values for active cells only"""
+
+    g = Grid(GFILE1, fformat="egrid")
+    x = GridProperties()
+    x.from_file(RFILE1, fformat="unrst", names=["PRESSURE"], dates="all", grid=g)
+    y = GridProperties()
+    y.from_file(
+        RFILE1,
+        fformat="unrst",
+        names=["PRESSURE"],
+        dates="all",
+        grid=g,
+        compressed=True,
+    )
+    assert all(prop.iscompressed for prop in y.props)
+    assert x.generate_hash() == y.generate_hash()
+
+    dfx = x.get_dataframe(activeonly=True, grid=g)
+    dfy = y.get_dataframe(activeonly=True, grid=g)
+    assert dfx.equals(dfy)
+    assert all(prop.iscompressed for prop in y.props)
+
+
+def test_roff_export_with_grid():
+    """Export grid and properties to one ROFF file, then append a property"""
+
+    g = Grid(GFILE1, fformat="egrid")
+
+    x = GridProperties()
+    x.from_file(IFILE1, fformat="init", names=["PORO", "FIPNUM"], grid=g)
+
+    fname = os.path.join(TDIR, "reek_grid_w_props.roff")
+    x.to_file(fname, grid=g)
+
+    g2 = Grid(fname)
+    assert g2.dimensions == g.dimensions
+    assert g2.nactive == g.nactive
+    assert g2.get_dz().values.mean() == pytest.approx(
+        g.get_dz().values.mean(), abs=0.001
+    )
+
+    for prop in x.props:
+        prop2 = GridProperty(fname, name=prop.name, grid=g2)
+        assert prop2.isdiscrete == prop.isdiscrete
+        np.testing.assert_allclose(prop2.values, prop.values, rtol=1e-6)
+
+    rx = GridProperties()
+    rx.from_file(RFILE1, fformat="unrst", names=["PRESSURE"], dates=[19991201], grid=g)
+    rx.to_file(fname, append=True)
+
+    press = GridProperty(fname, name="PRESSURE_19991201", grid=g2)
+    assert press.values.mean() == pytest.approx(334.523, abs=0.005)
+
+    # memory streams, also appending to an empty and a non-empty stream
+    stream = io.BytesIO()
+    x.to_file(stream, grid=g, append=True)
+    assert stream.getvalue().startswith(b"roff-bin")
+    size = len(stream.getvalue())
+    rx.to_file(stream, append=True)
+    assert len(stream.getvalue()) > size
+
+    with pytest.raises(ValueError):
+        rx.to_file(fname, fformat="grdecl")
+
+
+def test_generate_hash():
+    """Hash of GridProperties from names and values"""
+
+    x = GridProperties()
+    x.from_file(XFILE2, fformat="roff", names="all")
+    y = GridProperties()
+    y.from_file(XFILE2, fformat="roff", names="all", values=False)
+    assert x.generate_hash() == y.generate_hash()
+
+    y.props[0].name = "SOMENAME"
+    assert x.generate_hash() != y.generate_hash()
+
+
+def test_keyword_index():
+    """Keyword index for UNRST is stored as a sidecar file and reused"""
+
+    rfile = os.path.join(TDIR, "REEK_INDEXTEST.UNRST")
+    shutil.copyfile(RFILE1, rfile)
+    sidecar = os.path.join(TDIR, ".REEK_INDEXTEST.UNRST.xtgidx")
+    if os.path.exists(sidecar):
+        os.remove(sidecar)
+
+    idx = EclKeywordIndex.from_file(rfile)
+    assert os.path.exists(sidecar)
+    assert idx.dates == GridProperties.scan_dates(rfile, datesonly=True)
+    assert "PRESSURE" in idx
+    assert idx.has("PRESSURE", 19991201)
+    assert not idx.has("PRESSURE", 19991212)
+
+    kwname, kwlen, kwtype, _ = idx.find("PRESSURE", 19991201)
+    assert kwname == "PRESSURE"
+    assert kwtype == "REAL"
+    assert idx.find("NOSUCHNAME", 19991201) is None
+
+    df = GridProperties.scan_keywords(rfile, dataframe=True, dates=True)
+    assert idx.dataframe.equals(df.astype(idx.dataframe.dtypes))
+
+    # from sidecar (i.e. another process), must give the same records
+    idx2 = EclKeywordIndex._from_sidecar(
+        idx.filesrc, os.stat(rfile).st_size, os.stat(rfile).st_mtime_ns
+    )
+    assert idx2.records == idx.records
+
+    # import using the index
+    g = Grid(GFILE1, fformat="egrid")
+    x = GridProperties()
+    x.from_file(rfile, fformat="unrst", names=["PRESSURE"], dates=[19991201], grid=g)
+    assert x["PRESSURE_19991201"].values.mean() == pytest.approx(334.52327, abs=0.0001)
+
+    # no sidecar file, e.g. for read only folders
+    rfile = os.path.join(TDIR, "REEK_NOINDEXTEST.UNRST")
+    shutil.copyfile(RFILE1, rfile)
+    sidecar = os.path.join(TDIR, ".REEK_NOINDEXTEST.UNRST.xtgidx")
+    if os.path.exists(sidecar):
+        os.remove(sidecar)
+
+    x = GridProperties()
+    x.from_file(
+        rfile,
+        fformat="unrst",
+        names=["PRESSURE"],
+        dates=[19991201],
+        grid=g,
+        sidecar=False,
+    )
+    assert x["PRESSURE_19991201"].values.mean() == pytest.approx(334.52327, abs=0.0001)
+    assert not os.path.exists(sidecar)
+
+
+def _synthetic_index(nkeys, nkw=60, nlen=1000):
+    """Make a keyword index as for a UNRST file with about nkeys keywords."""
+    records = []
+    bytepos = 0
+    for step in range(nkeys // (nkw + 2)):
+        date = 19000101 + step
+        for kwname, kwlen in [("SEQNUM", 1), ("INTEHEAD", 411)] + [
+            ("KW{:02d}".format(ikw), nlen) for ikw in range(nkw)
+        ]:
+            records.append((kwname, "REAL", kwlen, bytepos, date))
+            bytepos += 24 + 8 + 4 * kwlen
+    return EclKeywordIndex(records)
+
+
+class _CountingRecords(list):
+    """List of index records, which counts the records visited by iteration."""
+
+    nvisits = 0
+
+    def __iter__(self):
+        for record in super().__iter__():
+            self.nvisits += 1
+            yield record
+
+
+def test_restart_catalogue_scaling():
+    """Validation of names and dates in a restart catalogue shall scale linearly"""
+
+    grid = types.SimpleNamespace(nactive=1000, ntotal=1200, dualporo=False)
+
+    for nkeys in (10000, 100000):
+        idx = _synthetic_index(nkeys)
+        idx._records = _CountingRecords(idx.records)
+
+        pairs, dates = _gridprops_io._process_valid_namesdates(idx, grid)
+        nfound = sum(idx.has(name, date) for name, date in pairs)
+
+        # one pass over the records, and hashed (not list) lookups afterwards
+        assert idx.records.nvisits == len(idx.records)
+        assert isinstance(pairs, dict) and isinstance(dates, dict)
+
+        assert nfound == len(pairs) == 60 * len(dates)
+        assert ("KW00", str(idx.dates[-1])) in pairs
+        assert ("INTEHEAD", str(idx.dates[-1])) not in pairs
+
+
 def test_scan_dates():
     """A static method to scan dates in a RESTART file"""
     t1 = xtg.timer()
@@ -256,3 +538,45 @@ def test_get_dataframe():
 
 
 #    df = x.dataframe(activeonly=True, ijk=True, xyz=True)
+
+
+def test_to_parquet():
+    """Export to Parquet by layer ranges, and compare with the dataframe"""
+
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    g = Grid(GFILE1, fformat="egrid")
+
+    x = GridProperties()
+
+    names = ["SOIL", "SWAT", "PRESSURE"]
+    dates = [19991201]
+    x.from_file(
+        RFILE1, fformat="unrst", names=names, dates=dates, grid=g, compressed=True
+    )
+
+    for activeonly in (True, False):
+        fname = os.path.join(TDIR, "reek_props_{}.parquet".format(activeonly))
+        x.to_parquet(fname, activeonly=activeonly, ijk=True, xyz=True, grid=g, layers=3)
+
+        pqf = pq.ParquetFile(fname)
+        assert pqf.metadata.num_row_groups == (g.nlay + 2) // 3
+
+        df1 = pqf.read().to_pandas().sort_values(["IX", "JY", "KZ"])
+        df2 = x.get_dataframe(activeonly=activeonly, ijk=True, xyz=True, grid=g)
+        df2 = df2.sort_values(["IX", "JY", "KZ"])
+
+        assert list(df1.columns) == list(df2.columns)
+        assert len(df1) == len(df2)
+        for name in df2.columns:
+            np.testing.assert_allclose(
+                df1[name].values, df2[name].values, rtol=1e-6, equal_nan=True
+            )
+
+    batches = list(x.to_arrow_batches(activeonly=True, grid=g, layers=4))
+    assert sum(batch.num_rows for batch in batches) == g.nactive
+
+    stream = io.BytesIO()
+    x.to_parquet(stream, activeonly=True, grid=g)
+    stream.seek(0)
+    assert pq.read_table(stream).num_rows == g.nactive
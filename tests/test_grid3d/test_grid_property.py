@@ -3,6 +3,7 @@
 from __future__ import division, absolute_import
 from __future__ import print_function
 
+import io
 import os
 import pytest
 
@@ -236,6 +237,188 @@ def test_roffbin_import1():
     assert x.values.mean() == pytest.approx(0.1677, abs=0.001)
 
 
+def test_roffbin_import_lazy():
+    """Import of ROFF binary with values=False, loading values on demand"""
+
+    x = GridProperty()
+    x.from_file(TESTFILE8, fformat="roff", name="Zone", values=False)
+    assert x._isloaded is False
+    assert x.dimensions == (40, 64, 14)
+    assert x.isdiscrete
+    assert x.ncodes == 3
+    assert x.codes[3] == "Below_Low_reek"
+
+    y = GridProperty()
+    y.from_file(TESTFILE8, fformat="roff", name="Zone")
+    np.testing.assert_array_equal(x.values, y.values)  # loads on access
+    assert x._isloaded is True
+
+    x.unload()
+    assert x._isloaded is False
+    np.testing.assert_array_equal(x.values, y.values)  # loaded again
+
+    z = GridProperty(TESTFILE8, fformat="roff", name="Zone", values=False)
+    assert z._isloaded is False
+    np.testing.assert_array_equal(z.values, y.values)
+
+    # compressed when loaded
+    c = GridProperty(
+        TESTFILE8, fformat="roff", name="Zone", values=False, compressed=True
+    )
+    assert c.dtype == np.int32
+    assert c.iscompressed
+    assert c._isloaded is False
+    assert c.active_values.size == y.values.count()
+    assert c.iscompressed
+
+
+def test_roffbin_import_grid_shared_mask():
+    """ROFF import with a grid shall use the active mask of the grid"""
+
+    grd = Grid(TESTFILE8A)
+    amask = grd.get_active_mask()
+    ref = GridProperty(TESTFILE8, fformat="roff", name="Zone")
+
+    for values in (True, False):
+        zone = GridProperty(
+            TESTFILE8, fformat="roff", name="Zone", grid=grd, values=values
+        )
+        assert amask.shares(zone._values)
+        np.testing.assert_array_equal(zone.values.mask, ref.values.mask)
+        assert np.ma.allequal(zone.values, ref.values)
+
+    props = xtgeo.grid3d.GridProperties()
+    props.from_file(TESTFILE8, fformat="roff", names=["Zone"], grid=grd)
+    assert amask.shares(props["Zone"]._values)
+
+
+def test_generate_hash():
+    """Content hash of grid property values, cached until values are set"""
+
+    x = GridProperty(TESTFILE1, fformat="roff", name="PORO")
+    y = GridProperty(TESTFILE1, fformat="roff", name="PORO")
+    y.name = "OTHER"
+
+    hash1 = x.generate_hash()
+    assert x._hash == hash1
+    assert hash1 == y.generate_hash()
+
+    assert x.values.mean() == y.values.mean()  # access keeps the cached hash
+    assert x._hash == hash1
+
+    x.values += 0.01  # set, which resets the cached hash
+    assert x._hash is None
+    assert x.generate_hash() != hash1
+
+    x.values = y.values.copy()
+    assert x.generate_hash() == hash1
+
+    # values hidden by the mask are not part of the hash
+    x.values.data[np.ma.getmaskarray(x.values)] = -999.0
+    x.values = x.values
+    assert x._hash is None
+    assert x.generate_hash() == hash1
+
+
+def test_eclunrst_import_lazy():
+    """UNRST import with values=False, loading values on demand"""
+
+    gg = Grid(TESTFILE5, fformat="egrid")
+    press = GridProperty()
+    press.from_file(
+        TESTFILE7,
+        fformat="unrst",
+        name="PRESSURE",
+        date=19991201,
+        grid=gg,
+        values=False,
+    )
+    assert press.name == "PRESSURE_19991201"
+    assert press._isloaded is False
+    tsetup.assert_almostequal(press.values.mean(), 334.5232, 0.0001)
+
+    press.unload()
+    tsetup.assert_almostequal(press.values.mean(), 334.5232, 0.0001)
+
+    with pytest.raises(ValueError):
+        GridProperty().unload()
+
+
+def test_eclunrst_import_compressed():
+    """UNRST import with values for active cells only"""
+
+    gg = Grid(TESTFILE5, fformat="egrid")
+    press = GridProperty()
+    press.from_file(TESTFILE7, fformat="unrst", name="PRESSURE", date=19991201, grid=gg)
+    cpress = GridProperty()
+    cpress.from_file(
+        TESTFILE7,
+        fformat="unrst",
+        name="PRESSURE",
+        date=19991201,
+        grid=gg,
+        compressed=True,
+    )
+    assert cpress.iscompressed
+    assert cpress.active_values.size == gg.nactive
+    assert cpress.generate_hash() == press.generate_hash()
+    np.testing.assert_array_equal(
+        cpress.get_active_npvalues1d(), press.get_active_npvalues1d()
+    )
+
+    # arithmetic on the compressed values, and export, keeps it compressed
+    cpress.active_values += 10.0
+    cpress.to_file(os.path.join(TMPDIR, "press_compressed.roff"))
+    assert cpress.iscompressed
+
+    # full values are made on first access
+    tsetup.assert_almostequal(cpress.values.mean(), 344.5232, 0.0001)
+    assert not cpress.iscompressed
+
+    press.compress(gg)
+    assert press.iscompressed
+    press2 = GridProperty(
+        os.path.join(TMPDIR, "press_compressed.roff"), name="PRESSURE_19991201"
+    )
+    np.testing.assert_allclose(
+        press2.get_active_npvalues1d(), press.active_values + 10.0, rtol=1e-6
+    )
+
+
+def test_eclunrst_import_lazy_compressed():
+    """UNRST import with values=False and compressed=True stays compressed"""
+
+    gg = Grid(TESTFILE5, fformat="egrid")
+    press = GridProperty()
+    press.from_file(TESTFILE7, fformat="unrst", name="PRESSURE", date=19991201, grid=gg)
+    cpress = GridProperty()
+    cpress.from_file(
+        TESTFILE7,
+        fformat="unrst",
+        name="PRESSURE",
+        date=19991201,
+        grid=gg,
+        values=False,
+        compressed=True,
+    )
+    assert cpress._isloaded is False
+
+    assert cpress.dtype == press.dtype
+    assert cpress.iscompressed
+    assert cpress._isloaded is False  # dtype and iscompressed do not load
+    assert cpress.generate_hash() == press.generate_hash()
+    cpress.describe()
+    cpress.to_file(os.path.join(TMPDIR, "press_lazy_compressed.roff"))
+    assert cpress.iscompressed
+    assert cpress.active_values.size == gg.nactive
+
+    cpress.unload()
+    np.testing.assert_array_equal(
+        cpress.get_npvalues3d(fill_value=0.0), press.get_npvalues3d(fill_value=0.0)
+    )
+    assert cpress.iscompressed
+
+
 def test_roffbin_import1_roffapiv2():
     """Test of import of ROFF binary using new API"""
 
@@ -441,6 +624,56 @@ def test_grdecl_import_reek():
     tsetup.assert_almostequal(poro.values.mean(), porox.values.mean(), 0.001)
 
 
+def test_grdecl_import_repeats_comments():
+    """GRDECL import of several keywords with comments and repeat counts"""
+
+    grd = Grid()
+    grd.create_box(dimension=(2, 3, 4))
+    gfile = os.path.join(TMPDIR, "box_repeats.grdecl")
+    grd.to_file(gfile, fformat="grdecl")
+
+    grd2 = Grid(gfile, fformat="grdecl")
+    assert grd2.dimensions == (2, 3, 4)
+    np.testing.assert_allclose(grd2.get_xyz()[2].values, grd.get_xyz()[2].values)
+
+    pfile = os.path.join(TMPDIR, "box_repeats_props.grdecl")
+    with open(pfile, "w") as stream:
+        stream.write("-- Exported / for testing\n")
+        stream.write("PORO -- porosity\n  0.1 0.2 4*0.25 -- a comment / with slash\n")
+        stream.write("  16*0.3\n\n  2*0.4 /\n")
+        stream.write("FIPNUM\n  12*1 12*2 /\n")
+
+    poro = GridProperty(pfile, name="PORO", fformat="grdecl", grid=grd2)
+    assert poro.values[0, 0, 0] == pytest.approx(0.1)
+    assert poro.values[1, 0, 0] == pytest.approx(0.2)  # GRDECL runs I fastest
+    assert poro.values[1, 2, 3] == pytest.approx(0.4)
+    assert poro.values.mean() == pytest.approx((0.3 + 1.0 + 4.8 + 0.8) / 24)
+
+    props = xtgeo.grid3d.GridProperties()
+    props.from_file(pfile, fformat="grdecl", names=["FIPNUM", "PORO"], grid=grd2)
+    assert props.names == ["FIPNUM", "PORO"]
+    assert props["FIPNUM"].values[:, :, 3].mean() == 2.0
+    np.testing.assert_array_equal(props["PORO"].values, poro.values)
+
+
+def test_grdecl_keywords_data_on_keyword_line():
+    """GRDECL keywords with data on the same line as the keyword"""
+
+    from xtgeo.grid3d._grid_grdecl_stream import read_grdecl_keywords
+
+    stream = io.BytesIO(
+        b"-- PORO in a comment\nPORO 1 2 3 /\nPORO_X\n 9 /\n"
+        b"PERMX -- comment\n 2*4 /\nNTG/\n"
+    )
+    result = read_grdecl_keywords(
+        xtgeo._XTGeoFile(stream), ["PORO", "PERMX", "NTG", "PORO_X"]
+    )
+    np.testing.assert_array_equal(result["PORO"], [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(result["PORO_X"], [9.0])
+    np.testing.assert_array_equal(result["PERMX"], [4.0, 4.0])
+    assert result["NTG"].size == 0
+
+
 # def test_export_roff():
 #     """Property import from Eclipse. Then export to roff."""
 
@@ -559,6 +792,27 @@ def test_get_all_corners():
     assert z1.values3d[4, 4, 1] == pytest.approx(1728.57898, abs=0.1)
 
 
+def test_eclbin_record_mmap_vs_cxtgeo():
+    """The memory mapped Eclipse record reader shall match the C reader"""
+
+    # pylint: disable=protected-access
+    from xtgeo.grid3d import _grid_eclbin_record as eclrec
+    from xtgeo.grid3d import _grid3d_utils as utils
+
+    for ecfile in (TESTFILE6, TESTFILE7):
+        pfile = xtgeo._XTGeoFile(ecfile)
+        kwlist = utils.scan_keywords(pfile, maxkeys=100000)
+        for kwname, kwtype, kwlen, kwbyte in kwlist[:200]:
+            if kwtype not in ("INTE", "REAL", "DOUB", "LOGI"):
+                continue
+            mm = eclrec.eclbin_record(pfile, kwname, kwlen, kwtype, kwbyte)
+            cx = eclrec.eclbin_record(
+                pfile, kwname, kwlen, kwtype, kwbyte, engine="cxtgeo"
+            )
+            assert mm.dtype == cx.dtype
+            np.testing.assert_array_equal(mm, cx)
+
+
 def test_get_cell_corners():
     """Get X Y Z for one cell as tuple"""
 
@@ -165,6 +165,42 @@ def test_get_ijk_from_points():
     assert ijk["JY"][0] == 64
 
 
+def test_cell_locator_reuse():
+    """The cell locator shall be reused until the grid geometry is changed"""
+    g1 = xtgeo.grid3d.Grid(REEKGRID)
+
+    po = xtgeo.Points([(456620.790918, 5.935660e06, 1727.649124)])
+
+    locator = g1.get_cell_locator()
+    assert isinstance(locator, xtgeo.grid3d.GridCellLocator)
+
+    ijk1 = g1.get_ijk_from_points(po)
+    assert g1.get_cell_locator() is locator
+
+    iarr, jarr, karr = locator.get_ijk([456620.790918], [5.935660e06], [1727.649124])
+    assert (iarr[0], jarr[0], karr[0]) == (1, 1, 1)
+
+    # a change of format is not a change of geometry, and no hash is needed
+    g1._xtgformat2()
+    assert locator.is_valid_for(g1)
+    assert g1.get_cell_locator() is locator
+    assert "hash" not in g1._tmp
+
+    g1.translate_coordinates(translate=(100000, 0, 0))
+    assert not locator.is_valid_for(g1)
+    ijk2 = g1.get_ijk_from_points(po)
+    assert g1.get_cell_locator() is not locator
+    assert ijk1["IX"][0] == 1
+    assert ijk2["IX"][0] == -1
+
+    # a new ACTNUM also gives a new locator
+    locator = g1.get_cell_locator()
+    actnum = g1.get_actnum()
+    actnum.values[0, 0, 0] = 0
+    g1.set_actnum(actnum)
+    assert g1.get_cell_locator() is not locator
+
+
 def test_get_ijk_from_points_smallcase():
     """Testing getting IJK coordinates from points, for all cells in small case"""
 
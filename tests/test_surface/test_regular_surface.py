@@ -2,6 +2,7 @@
 from __future__ import division, absolute_import
 from __future__ import print_function
 
+import io
 import os
 import os.path
 from os.path import join
@@ -13,6 +14,7 @@ import numpy as np
 
 import xtgeo
 from xtgeo.common import XTGeoDialog
+from xtgeo.common.constants import UNDEF_MAP_IRAPB
 import test_common.test_xtg as tsetup
 from xtgeo.surface.regular_surface import RegularSurface
 
@@ -412,6 +414,34 @@ def test_irapbin_import1_engine_python():
     assert xsurf.values.mean() == xsurf2.values.mean()
 
 
+def test_irapbin_engine_python_record_layouts():
+    """Python read engine for Irap binary with other record lengths than ncol"""
+    import struct
+
+    xsurf = xtgeo.RegularSurface(TESTSET2, fformat="irap_binary")
+    xsurf.values[10:20, 10:20] = np.ma.masked
+    values = xsurf.get_values1d(fill_value=UNDEF_MAP_IRAPB, order="F")
+
+    stream = io.BytesIO()
+    xsurf.to_file(stream, fformat="irap_binary")
+    header = stream.getvalue()[:100]
+
+    for reclen in (8, 1000, xsurf.ncol + 1):
+        data = values.astype(">f4")
+        records = [header]
+        for start in range(0, data.size, reclen):
+            block = data[start : start + reclen].tobytes()
+            marker = struct.pack(">i", len(block))
+            records.extend([marker, block, marker])
+
+        xsurf2 = xtgeo.RegularSurface(
+            io.BytesIO(b"".join(records)), fformat="irap_binary", engine="python"
+        )
+        assert xsurf2.dimensions == xsurf.dimensions
+        assert np.array_equal(xsurf2.values.mask, xsurf.values.mask)
+        assert xsurf2.values.mean() == pytest.approx(xsurf.values.mean())
+
+
 def test_irapasc_io_engine_python():
     """Test IO using pure python read/write"""
     xsurf1 = xtgeo.RegularSurface()
@@ -2,7 +2,7 @@ import os
 import pytest
 import numpy as np
 
-from xtgeo.surface import RegularSurface
+from xtgeo.surface import RegularSurface, PointsGridder
 from xtgeo.common import XTGeoDialog
 from xtgeo.xyz import Points
 import test_common.test_xtg as tsetup
@@ -164,3 +164,32 @@ def test_points_gridding(reek_map):
     tsetup.assert_almostequal(xscopy.values.mean(), xs.values.mean() + 300, 2)
 
     xscopy.to_file(os.path.join(TMPD, "reek_points_to_map.gri"), fformat="irap_binary")
+
+
+def test_points_gridder_reuse(reek_map):
+    """Grid points with a PointsGridder, reused for several methods."""
+
+    xyz = Points(reek_map)
+    xyz.dataframe["Z_TVDSS"] = xyz.dataframe["Z_TVDSS"] + 300
+
+    gridder = PointsGridder(xyz, coarsen=3)
+    assert gridder.npoints == (len(xyz.dataframe) + 2) // 3
+
+    means = {}
+    for method in ("linear", "nearest", "idw"):
+        xscopy = reek_map.copy()
+        xscopy.gridding(gridder, method=method, neighbours=6, nthreads=2)
+        means[method] = xscopy.values.mean()
+        tsetup.assert_almostequal(means[method], reek_map.values.mean() + 300, 2)
+
+    # same result as gridding the points directly
+    xscopy = reek_map.copy()
+    xscopy.gridding(xyz, method="idw", coarsen=3, neighbours=6)
+    tsetup.assert_almostequal(xscopy.values.mean(), means["idw"], 1.0e-6)
+
+    # no points within the radius gives undefined nodes
+    xscopy.gridding(gridder, method="idw", radius=1.0)
+    assert xscopy.values.mask.sum() > reek_map.values.mask.sum()
+
+    with pytest.raises(ValueError):
+        xscopy.gridding(gridder, method="spline")
@@ -0,0 +1,143 @@
+import os
+from os.path import join
+
+import numpy as np
+import numpy.ma as ma
+
+from xtgeo.surface import RegularSurface
+from xtgeo.common import XTGeoDialog
+import test_common.test_xtg as tsetup
+
+xtg = XTGeoDialog()
+logger = xtg.basiclogger(__name__)
+
+if not xtg.testsetup():
+    raise SystemExit
+
+TMPD = xtg.tmpdir
+
+# =============================================================================
+# Do tests
+# =============================================================================
+FTOP1 = "../xtgeo-testdata/surfaces/reek/1/topreek_rota.gri"
+
+
+def test_tiled_operations():
+    """Arithmetic and elimination by tiles, compared with in-memory"""
+
+    srf = RegularSurface(FTOP1)
+    tiled = srf.copy()
+    tiled.set_tiled(columns=50)
+    assert tiled.tilecolumns == 50
+    assert isinstance(ma.getdata(tiled.values), np.memmap)
+
+    other = srf.copy()
+    other.values += 100.0
+
+    for result, expected in (
+        (tiled + other, srf + other),
+        (tiled - other, srf - other),
+        (tiled * 2.0, srf * 2.0),
+        (tiled / other, srf / other),
+    ):
+        assert result.tilecolumns == 50
+        assert np.array_equal(result.values.mask, expected.values.mask)
+        assert np.allclose(result.values.compressed(), expected.values.compressed())
+
+    tiled.operation("elilt", 1700.0)
+    srf.operation("elilt", 1700.0)
+    assert np.array_equal(tiled.values.mask, srf.values.mask)
+    tsetup.assert_almostequal(tiled.values.mean(), srf.values.mean(), 0.0001)
+
+
+def test_tiled_fill():
+    """Nearest node fill by tiles gives the same as for the whole map"""
+
+    srf = RegularSurface(FTOP1)
+    tiled = srf.copy()
+    tiled.set_tiled(columns=10, memmap=False)
+
+    srf.fill()
+    tiled.fill()
+    assert not tiled.values.mask.any()
+    assert np.allclose(tiled.values, srf.values)
+
+
+def test_tiled_resample_small():
+    """Resample by tiles, with yflip"""
+
+    xs2 = RegularSurface(
+        xori=0, yori=0, ncol=3, nrow=3, xinc=100, yinc=100, values=888.0, yflip=1,
+    )
+    xs3 = RegularSurface(
+        xori=0, yori=200, ncol=3, nrow=3, xinc=100, yinc=100, values=2888.0, yflip=-1,
+    )
+
+    xsx = xs3.copy()
+    xsx.set_tiled(columns=2)
+    xsx.resample(xs2)
+    assert xsx.values.mean() == 888.0
+
+    xsx = xs2.copy()
+    xsx.set_tiled(columns=1)
+    xsx.resample(xs3)
+    assert xsx.values.mean() == 2888.0
+
+
+def test_tiled_resample_linear():
+    """A plane is resampled exactly by bilinear interpolation, also rotated"""
+
+    src = RegularSurface(
+        ncol=80,
+        nrow=70,
+        xori=100.0,
+        yori=50.0,
+        xinc=8.0,
+        yinc=9.0,
+        rotation=30.0,
+        values=0.0,
+    )
+    xsrc, ysrc = src.get_xy_values()
+    src.values = 3.0 * xsrc - 2.0 * ysrc
+
+    dst = RegularSurface(
+        ncol=50,
+        nrow=45,
+        xori=200.0,
+        yori=100.0,
+        xinc=7.0,
+        yinc=6.0,
+        rotation=10.0,
+        values=0.0,
+    )
+    xdst, ydst = dst.get_xy_values()
+    dst.set_tiled(columns=7)
+    dst.resample(src)
+
+    defined = ~ma.getmaskarray(dst.values)
+    assert defined.sum() > 1000
+    expected = 3.0 * xdst - 2.0 * ydst
+    assert np.allclose(dst.values[defined], expected[defined])
+
+
+def test_tiled_irap_binary():
+    """Read lazy Irap binary into tiles, and export by tiles"""
+
+    srf = RegularSurface(FTOP1)
+
+    tiled = RegularSurface(FTOP1, values=False)
+    folder = join(TMPD, "tiled")
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    tiled.set_tiled(columns=30, folder=folder)
+    assert np.array_equal(tiled.values.mask, srf.values.mask)
+    assert np.allclose(tiled.values.compressed(), srf.values.compressed())
+
+    tiled.to_file(join(TMPD, "tiled.gri"))
+    back = RegularSurface(join(TMPD, "tiled.gri"))
+    assert back.compare_topology(srf)
+    assert np.allclose(back.values.compressed(), srf.values.compressed())
+
+    tiled.set_tiled(None)
+    assert tiled.tilecolumns is None
+    assert not isinstance(ma.getdata(tiled.values), np.memmap)
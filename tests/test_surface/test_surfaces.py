@@ -6,6 +6,7 @@ import math
 from os.path import join
 
 import numpy as np
+import pytest
 
 import test_common.test_xtg as tsetup
 import xtgeo
@@ -152,3 +153,114 @@ def test_get_surfaces_from_3dgrid():
 
     for srf in surfs.surfaces:
         srf.to_file(join(TMPD, srf.name + ".gri"))
+
+
+def test_surfaces_from_files():
+    """Read realisations into a stacked array, serially and with threads"""
+
+    base = xtgeo.RegularSurface(TESTSET1A)
+    flist = []
+    for inum in range(5):
+        tmp = base.copy()
+        tmp.values += float(inum)
+        fname = join(TMPD, "surf_real{}.gri".format(inum))
+        tmp.to_file(fname)
+        flist.append(fname)
+
+    so = xtgeo.Surfaces(flist)
+    expected = so.statistics()
+
+    for workers, dtype in ((1, np.float64), (3, np.float32)):
+        surfs = xtgeo.Surfaces().from_files(flist, workers=workers, dtype=dtype)
+        assert surfs.stacked.shape == (5, base.ncol, base.nrow)
+        assert surfs.stacked.dtype == dtype
+        assert np.isnan(surfs.stacked[0]).sum() == np.ma.count_masked(base.values)
+
+        res = surfs.statistics()
+        tsetup.assert_almostequal(
+            res["mean"].values.mean(), expected["mean"].values.mean(), 0.001
+        )
+        tsetup.assert_almostequal(
+            res["std"].values.mean(), expected["std"].values.mean(), 0.001
+        )
+
+    assert surfs.surfaces[2].values is None  # metadata only
+    surfs.surfaces[2].load_values()
+    assert surfs.surfaces[2].values.mean() == so.surfaces[2].values.mean()
+
+    # a loaded surface that is changed is used by stacked and statistics
+    surfs.surfaces[2].values += 100.0
+    tsetup.assert_almostequal(
+        np.nanmean(surfs.stacked[2]), base.values.mean() + 102.0, 0.1
+    )
+    res = surfs.statistics()
+    tsetup.assert_almostequal(res["max"].values.mean(), base.values.mean() + 102.0, 0.1)
+
+    tmp = base.copy()
+    tmp.xori += 10.0
+    tmp.to_file(join(TMPD, "surf_other.gri"))
+    with pytest.raises(ValueError):
+        xtgeo.Surfaces().from_files(flist + [join(TMPD, "surf_other.gri")])
+
+
+def test_surfaces_from_files_irap_ascii():
+    """Read realisations in other formats than Irap binary into a stack"""
+
+    base = xtgeo.RegularSurface(TESTSET1A)
+    flist = []
+    for inum in range(3):
+        tmp = base.copy()
+        tmp.values += float(inum)
+        fname = join(TMPD, "surf_real{}.fgr".format(inum))
+        tmp.to_file(fname, fformat="irap_ascii")
+        flist.append(fname)
+
+    surfs = xtgeo.Surfaces().from_files(flist, workers=2)
+    assert np.isnan(surfs.stacked[0]).sum() == np.ma.count_masked(base.values)
+    tsetup.assert_almostequal(
+        np.nanmean(surfs.stacked[2]), base.values.mean() + 2.0, 0.001
+    )
+
+    surfs.surfaces[1].load_values()
+    tsetup.assert_almostequal(
+        surfs.surfaces[1].values.mean(), base.values.mean() + 1.0, 0.001
+    )
+
+    # statistics by tiles, where each file is read once
+    expected = surfs.statistics(percentiles=[50])
+    lazy = xtgeo.Surfaces().from_files(flist, values=False)
+    res = lazy.statistics(percentiles=[50], maxmemory=1)
+    for key in ("mean", "std", "p50"):
+        assert np.ma.allclose(res[key].values, expected[key].values)
+
+
+def test_statistics_percentiles():
+    """Percentiles etc, with surfaces in memory and read file by file"""
+
+    base = xtgeo.RegularSurface(TESTSET1A)
+    base.values *= 0.0
+    bmean = base.values.mean()
+
+    surfs = [base]
+    flist = []
+    for inum in range(1, 101):
+        tmp = base.copy()
+        tmp.values += float(inum)
+        surfs.append(tmp)
+        if inum % 10 == 0:
+            fname = join(TMPD, "surf_pct{}.gri".format(inum))
+            tmp.to_file(fname)
+            flist.append(fname)
+
+    res = xtgeo.Surfaces(surfs).statistics(percentiles=(10, 50, 90), maxmemory=1)
+    for key, value in (("p10", 10.0), ("p50", 50.0), ("p90", 90.0), ("max", 100.0)):
+        tsetup.assert_almostequal(res[key].values.mean(), bmean + value, 0.0001)
+    tsetup.assert_almostequal(res["min"].values.mean(), bmean, 0.0001)
+
+    # 10, 20, ..., 100
+    so = xtgeo.Surfaces().from_files(flist, values=False)
+    res = so.statistics(percentiles=[50, 2.5])
+    assert so.surfaces[0].values is None
+    tsetup.assert_almostequal(res["mean"].values.mean(), bmean + 55.0, 0.0001)
+    tsetup.assert_almostequal(res["p50"].values.mean(), bmean + 55.0, 0.0001)
+    tsetup.assert_almostequal(res["p2.5"].values.mean(), bmean + 12.25, 0.0001)
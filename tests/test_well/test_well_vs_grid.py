@@ -4,10 +4,10 @@ from __future__ import print_function
 
 from os.path import join
 
+import numpy as np
 import pytest
 
-
-from xtgeo.well import Well
+from xtgeo.well import Well, Wells
 from xtgeo.grid3d import Grid, GridProperty
 from xtgeo.common import XTGeoDialog
 
@@ -78,6 +78,31 @@ def test_make_ijk_grid(loadwell1, loadgrid1):
     assert int(df.iloc[4775]["KCELL"]) == 1
 
 
+def test_make_ijk_grid_wells(loadgrid1):
+    """Make I J K logs for several wells in one go, compare with single wells"""
+
+    mygrid = loadgrid1
+    wlist = [Well(WFILE) for _ in range(3)]
+    wlist[1].downsample(interval=3)
+
+    mywells = Wells()
+    mywells.wells = wlist
+    mywells.make_ijk_from_grid(mygrid, grid_id="_B", workers=2)
+
+    for wll in wlist:
+        single = wll.copy()
+        single.make_ijk_from_grid(mygrid, grid_id="_B")
+        for name in ("ICELL_B", "JCELL_B", "KCELL_B"):
+            assert wll.get_logtype(name) == single.get_logtype(name)
+            np.testing.assert_array_equal(
+                wll.dataframe[name].values, single.dataframe[name].values
+            )
+
+    df = wlist[0].dataframe
+    assert int(df.iloc[4850]["ICELL_B"]) == 29
+    assert int(df.iloc[4850]["KCELL_B"]) == 13
+
+
 @tsetup.equinor
 @tsetup.bigtest
 def test_make_ijk_gf_geogrid():